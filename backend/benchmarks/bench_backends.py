@@ -0,0 +1,77 @@
+"""
+Benchmark forecast latency and memory of the keras and tflite backends.
+
+Each backend runs in a fresh interpreter that loads every model in
+MODEL_CONFIG, warms up, then times 24-hour indoor forecasts (predict_many,
+no forecast cache) for single windows and batches. Reported per backend:
+model load time, median forecast latency per batch size, peak RSS and
+whether TensorFlow ended up imported. Export the models first
+(python -m utils.model_export), then run from the backend directory:
+
+    python -m benchmarks.bench_backends --repeat 20
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+BACKENDS = ["keras", "tflite"]
+BATCH_SIZES = [1, 8]
+
+CHILD = """
+import json, resource, statistics, sys, time
+import numpy as np, pandas as pd
+started = time.perf_counter()
+from swagger_server.app import MODEL_CONFIG, TARGET_COLS
+from utils.forecast import predict_many
+from utils.model_registry import get_model, preload_models
+preload_models(MODEL_CONFIG, {backend!r})
+load_seconds = time.perf_counter() - started
+
+config = MODEL_CONFIG["indoor"]["no_ac"]
+_, scaler = get_model(config["model"], config["scaler"], {backend!r})
+cols = scaler.feature_names_in_.tolist()
+index = pd.date_range("2025-04-01", periods=12, freq="1h")
+rng = np.random.default_rng(0)
+latency = {{}}
+for batch in {batch_sizes!r}:
+    windows = {{i: pd.DataFrame(rng.uniform(20, 60, (12, len(cols))), columns=cols, index=index)
+               for i in range(batch)}}
+    predict_many(config["model"], config["scaler"], windows, TARGET_COLS["indoor"], 24, {backend!r})
+    runs = []
+    for _ in range({repeat}):
+        t = time.perf_counter()
+        predict_many(config["model"], config["scaler"], windows, TARGET_COLS["indoor"], 24, {backend!r})
+        runs.append(time.perf_counter() - t)
+    latency[batch] = statistics.median(runs) * 1000
+print(json.dumps({{
+    "load_seconds": load_seconds,
+    "latency_ms": latency,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow": "tensorflow" in sys.modules,
+}}))
+"""
+
+
+def run_backend(backend, repeat):
+    code = CHILD.format(backend=backend, batch_sizes=BATCH_SIZES, repeat=repeat)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    latency_headers = "".join(f"{f'batch {b} (ms)':>15}" for b in BATCH_SIZES)
+    print(f"{'backend':<10}{'load (s)':>10}{latency_headers}{'peak RSS (MB)':>16}{'tensorflow':>12}")
+    for backend in BACKENDS:
+        result = run_backend(backend, args.repeat)
+        latency = "".join(f"{result['latency_ms'][str(b)]:>15.1f}" for b in BATCH_SIZES)
+        print(f"{backend:<10}{result['load_seconds']:>10.2f}{latency}{result['rss_mb']:>16.0f}"
+              f"{str(result['tensorflow']):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark DATE(ts) filters against half-open ts range filters.
+
+Seeds a scratch copy of SensorData (bench_SensorData) with synthetic rows,
+then times each query shape with and without the ts / (room_id, ts)
+indexes from swagger_server.database.schema. Run from the backend
+directory against a development database:
+
+    python -m benchmarks.bench_date_queries --rows 1000000
+
+The scratch table is dropped afterwards unless --keep is given.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from swagger_server.database.connection import execute_query, get_connection, release_connection
+from swagger_server.database.schema import create_index
+from swagger_server.database.time_range import day_bounds, range_bounds
+
+TABLE = "bench_SensorData"
+SEED_BATCH = 10000
+
+QUERIES = {
+    "day (DATE)": ("SELECT * FROM {t} WHERE DATE(ts) = %s", lambda d: (d.isoformat(),)),
+    "day (range)": ("SELECT * FROM {t} WHERE ts >= %s AND ts < %s", lambda d: day_bounds(d)),
+    "week (DATE BETWEEN)": (
+        "SELECT * FROM {t} WHERE DATE(ts) BETWEEN %s AND %s",
+        lambda d: (d.isoformat(), (d + timedelta(days=6)).isoformat()),
+    ),
+    "week (range)": (
+        "SELECT * FROM {t} WHERE ts >= %s AND ts < %s",
+        lambda d: range_bounds(d, d + timedelta(days=6)),
+    ),
+    "room day (DATE)": (
+        "SELECT * FROM {t} WHERE room_id = 1 AND DATE(ts) = %s", lambda d: (d.isoformat(),),
+    ),
+    "room day (range)": (
+        "SELECT * FROM {t} WHERE room_id = 1 AND ts >= %s AND ts < %s", lambda d: day_bounds(d),
+    ),
+}
+
+
+def seed(rows, rooms=4):
+    execute_query(f"DROP TABLE IF EXISTS {TABLE}", fetch=False)
+    execute_query(f"CREATE TABLE {TABLE} LIKE SensorData", fetch=False)
+    # Drop any indexes copied from SensorData so the first pass is unindexed
+    copied = execute_query(f"SHOW INDEX FROM {TABLE} WHERE Key_name <> 'PRIMARY'")
+    for index_name in {row["Key_name"] for row in copied}:
+        execute_query(f"DROP INDEX {index_name} ON {TABLE}", fetch=False)
+
+    start = datetime(2024, 1, 1)
+    step = timedelta(seconds=60)
+    insert = (f"INSERT INTO {TABLE} (ts, temperature, humidity, pm25, pm10, latitude, longitude, room_id) "
+              "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)")
+    connection = get_connection()
+    cursor = connection.cursor()
+    try:
+        for offset in range(0, rows, SEED_BATCH):
+            batch = [
+                (start + step * (i // rooms), random.uniform(24, 34), random.uniform(40, 80),
+                 random.randint(5, 120), random.randint(10, 150), 13.7448, 100.5127, i % rooms + 1)
+                for i in range(offset, min(offset + SEED_BATCH, rows))
+            ]
+            cursor.executemany(insert, batch)
+            connection.commit()
+    finally:
+        cursor.close()
+        release_connection(connection)
+    return start, start + step * (rows // rooms)
+
+
+def time_query(sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        execute_query(sql, params)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def run(days, repeat):
+    results = {}
+    for name, (sql, params_for) in QUERIES.items():
+        sql = sql.format(t=TABLE)
+        results[name] = statistics.mean(time_query(sql, params_for(day), repeat) for day in days)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch table")
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rows:,} rows into {TABLE}...")
+    first, last = seed(args.rows)
+    span = (last - first).days
+    days = [(first + timedelta(days=random.randint(0, max(span - 7, 0)))).date() for _ in range(5)]
+
+    try:
+        unindexed = run(days, args.repeat)
+        create_index(TABLE, f"idx_{TABLE.lower()}_ts", "ts")
+        create_index(TABLE, f"idx_{TABLE.lower()}_room_ts", "room_id, ts")
+        execute_query(f"ANALYZE TABLE {TABLE}")
+        indexed = run(days, args.repeat)
+    finally:
+        if not args.keep:
+            execute_query(f"DROP TABLE IF EXISTS {TABLE}", fetch=False)
+
+    print(f"\n{'query':<22}{'no index (ms)':>16}{'indexed (ms)':>16}")
+    for name in QUERIES:
+        print(f"{name:<22}{unindexed[name] * 1000:>16.2f}{indexed[name] * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the forecast scaling stage against one model step.
+
+Compares, per batch of 12-hour indoor windows and a 24-hour horizon:
+
+- sklearn:  scaler.transform on each window's DataFrame and
+            inverse_transform on the full feature width (the old path)
+- vectors:  scaling_vectors() scale/offset applied to the raw arrays and
+            inverted on the target columns only (predict_many)
+- step:     a single forward pass of the model on the batch (tflite if
+            exported, else keras), for scale
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_scaling --repeat 200
+"""
+import argparse
+import os
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from swagger_server.app import MODEL_CONFIG, TARGET_COLS
+from utils.forecast import _inference_fn, _window_values, scaling_vectors
+from utils.model_registry import get_model, tflite_path
+
+HOURS = 24
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    config = MODEL_CONFIG["indoor"]["no_ac"]
+    backend = "tflite" if os.path.exists(tflite_path(config["model"])) else "keras"
+    model, scaler = get_model(config["model"], config["scaler"], backend)
+    call = _inference_fn(model)
+    cols, scale, offset = scaling_vectors(scaler)
+    target_idx = [cols.index(col) for col in TARGET_COLS["indoor"]]
+    index = pd.date_range("2025-04-01", periods=12, freq="1h")
+    rng = np.random.default_rng(0)
+
+    print(f"{'batch':>6}{'sklearn (us)':>15}{'vectors (us)':>15}{f'{backend} step (us)':>20}")
+    for batch in (1, 8, 64):
+        windows = [pd.DataFrame(rng.uniform(20, 60, (12, len(cols))), columns=cols, index=index)
+                   for _ in range(batch)]
+        forecast = rng.uniform(0, 1, (batch, HOURS, len(cols))).astype(np.float32)
+        scaled = np.stack([scaler.transform(df[cols]) for df in windows]).astype(np.float32)
+
+        def sklearn_path():
+            np.stack([scaler.transform(df[cols])[-12:] for df in windows])
+            inverse = scaler.inverse_transform(forecast.reshape(-1, len(cols)))
+            inverse[:, target_idx].reshape(batch, HOURS, len(target_idx))
+
+        def vector_path():
+            raw = np.stack([_window_values(df, cols, 12) for df in windows])
+            raw * scale + offset
+            (forecast[:, :, target_idx] - offset[target_idx]) / scale[target_idx]
+
+        def step():
+            np.asarray(call(scaled))
+
+        step()
+        timings = [min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1e6
+                   for fn in (sklearn_path, vector_path, step)]
+        print(f"{batch:>6}{timings[0]:>15.0f}{timings[1]:>15.0f}{timings[2]:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark per-row serialisation cost of the bulk read endpoints.
+
+Serves the same synthetic SensorData rows (shaped like aiomysql returns
+them, with DECIMAL coordinates) through two routes on a throwaway app:
+
+- models: one SensorData(**row) per row, re-validated by response_model
+- rows:   validate_rows() + rows_response(), as the list endpoints do now
+
+and reports microseconds per row for the full request. Run from the
+backend directory:
+
+    python -m benchmarks.bench_serialization --rows 100000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from swagger_server.models.rows import rows_response, validate_rows
+from swagger_server.models.sensor_data import SensorData
+
+
+def make_rows(n):
+    start = datetime(2025, 4, 1)
+    return [
+        {"id": i, "ts": start + timedelta(seconds=30 * i), "temperature": 30.0 + i % 7,
+         "humidity": 60.0, "pm25": 20 + i % 50, "pm10": 30 + i % 60,
+         "latitude": Decimal("13.744800"), "longitude": Decimal("100.512700"), "room_id": 1 + i % 4}
+        for i in range(n)
+    ]
+
+
+def build_app(rows):
+    bench = FastAPI()
+
+    @bench.get("/models", response_model=List[SensorData])
+    async def models():
+        return [SensorData(**row) for row in rows]
+
+    @bench.get("/rows", response_model=List[SensorData])
+    async def fast_rows():
+        return rows_response(SensorData, validate_rows(SensorData, rows))
+
+    return bench
+
+
+def time_route(client, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = client.get(path).content
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(make_rows(args.rows)))
+    results = {path: time_route(client, path, args.repeat) for path in ("/models", "/rows")}
+    print(f"{'path':<10}{'total (ms)':>14}{'per row (us)':>16}{'bytes':>14}")
+    for path, (seconds, body) in results.items():
+        print(f"{path:<10}{seconds * 1000:>14.1f}{seconds * 1e6 / args.rows:>16.2f}{len(body):>14,}")
+
+
+if __name__ == "__main__":
+    main()
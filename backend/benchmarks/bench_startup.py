@@ -0,0 +1,61 @@
+"""
+Benchmark API import time and memory with and without the forecasting stack.
+
+Each scenario runs in a fresh interpreter and reports wall time to import
+(and, for the forecast scenarios, to load every model) plus peak RSS:
+
+- app:           import swagger_server.app (what data-only workers pay)
+- app+tf:        ...then import TensorFlow
+- app+models:    ...then load every model in MODEL_CONFIG
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_startup --repeat 3
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "app": "import swagger_server.app",
+    "app+tf": "import swagger_server.app; import tensorflow",
+    "app+models": ("import swagger_server.app as a; from utils.model_registry import preload_models; "
+                   "preload_models(a.MODEL_CONFIG)"),
+}
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow": "tensorflow" in sys.modules,
+}}))
+"""
+
+
+def run_scenario(code):
+    out = subprocess.run([sys.executable, "-c", CHILD.format(code=code)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<14}{'import (s)':>12}{'peak RSS (MB)':>16}{'tensorflow':>12}")
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss = statistics.median(run["rss_mb"] for run in runs)
+        print(f"{name:<14}{seconds:>12.2f}{rss:>16.0f}{str(runs[0]['tensorflow']):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
 # backend/swagger_server/main.py
 
-from typing import List
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+import logging
+import os
+from datetime import date
+from typing import List, Optional
+from fastapi import FastAPI, Header, HTTPException, Path, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 import joblib
 import pandas as pd
 
-from .models.aqicn import AQICN
-from .models.sensor_data import SensorData
-from .models.weather import Weather
-from utils.data_loader import load_latest_features, predict
+from .models.aqicn import AQICN, AQICNCreate
+from .models.sensor_data import SensorData, SensorDataCreate
+from .models.weather import Weather, WeatherCreate
+from .models.page import Page
+from .models.rows import page_response, rows_response
+from .models.rollup import Rollup
+from .models.dashboard import Dashboard
+from .http_cache import body_etag, etag_matches, range_cache_headers, range_is_closed, request_etag
+from .database.async_connection import close_async_pool, get_async_pool_stats
+from .database.connection import get_cache_stats, get_pool_stats
+from .database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .database.time_range import day_bounds, range_bounds
+from .database.rollups import refresh_rollups
+from .database.ingest import (
+    INGEST_FLUSH_SECONDS, add_flush_listener, flush_due_buffers, get_buffer, get_ingest_stats
+)
+from utils.data_loader import load_latest_features, load_latest_room_features
+from utils.forecast_worker import forecast_service
+from utils.downsample import downsample_records
 
 
 
@@ -30,6 +51,10 @@ from .controller.sensor_controller import (
     get_monthly_sensor_data, 
     get_available_sensor_dates
 )
+from .controller.dashboard_controller import get_dashboard_snapshot
+from .controller.live_controller import live_feed
+from .controller.export_controller import EXPORT_TABLES, stream_export
+from .controller.rollup_controller import ROLLUP_SOURCES, get_rollups
 from .controller.weather_controller import (
     get_all_weather_data, 
     get_weather_data_by_id, 
@@ -39,6 +64,16 @@ from .controller.weather_controller import (
     get_available_weather_dates
 )
 
+logger = logging.getLogger(__name__)
+
+# Numeric fields plotted per source, used when downsampling chart data
+CHART_METRICS = {
+    "aqicn": ["pm25", "pm10", "aqi_score"],
+    "sensor": ["temperature", "humidity", "pm25", "pm10"],
+    "weather": ["temperature", "humidity", "wind_speed"],
+}
+MAX_CHART_POINTS = 10000
+
 app = FastAPI(title="Air Quality Monitoring API")
 
 app.add_middleware(
@@ -55,10 +90,45 @@ def read_root():
     return {"message": "Welcome to the Air Quality Monitoring API"}
 
 
-@app.get("/aqicn", response_model=List[AQICN])
-def read_aqicn_data():
+@app.get("/metrics/db-pool")
+def read_db_pool_metrics():
+    """
+    Retrieve database connection pool settings and usage counters.
+    """
+    return {**get_pool_stats(), "async_pool": get_async_pool_stats()}
+
+
+@app.get("/metrics/cache")
+def read_cache_metrics():
+    """
+    Retrieve query cache budgets and hit/miss/eviction counters.
+    """
+    return get_cache_stats()
+
+
+@app.get("/dashboard/latest", response_model=Dashboard)
+async def read_dashboard(response: Response, if_none_match: Optional[str] = Header(None)):
+    """
+    Latest AQICN, sensor and weather readings with their health summaries in
+    one request. Send the returned ETag back as If-None-Match to get a 304
+    while none of the three readings has changed.
+    """
+    try:
+        snapshot, etag = await get_dashboard_snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return snapshot
+
+
+@app.get("/aqicn", response_model=Page[AQICN])
+async def read_aqicn_data(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                          after: Optional[str] = None):
     try:
-        return get_all_aqicn_data()
+        return page_response(AQICN, await get_all_aqicn_data(limit, after))
     except HTTPException:
         # propagate 4xx from inside controller if you ever raise one
         raise
@@ -67,9 +137,9 @@ def read_aqicn_data():
 
 
 @app.get("/aqicn/latest", response_model=AQICN)
-def read_latest_aqicn_data():
+async def read_latest_aqicn_data():
     try:
-        latest_data = get_latest_aqicn_data()
+        latest_data = await get_latest_aqicn_data()
         if not latest_data:
             raise HTTPException(status_code=404, detail="Latest AQICN data not found")
         return latest_data
@@ -79,24 +149,24 @@ def read_latest_aqicn_data():
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/aqicn/monthly", response_model=List)
-def read_monthly_aqicn_data():
+async def read_monthly_aqicn_data(points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     try:
-        monthly_data = get_monthly_aqicn_data()
+        monthly_data = await get_monthly_aqicn_data()
         if not monthly_data:
             raise HTTPException(status_code=404, detail="Monthly AQICN data not found")
-        return monthly_data
+        return rows_response(AQICN, downsample_records(monthly_data, CHART_METRICS["aqicn"], points))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/aqicn/dates", response_model=List)
-def aqicn_dates():
+async def aqicn_dates():
     """
     Retrieve AQICN dates.
     """
     try:
-        aqicn_dates = get_available_aqicn_dates()
+        aqicn_dates = await get_available_aqicn_dates()
         if not aqicn_dates:
             raise HTTPException(status_code=404, detail="AQICN data not found")
         return aqicn_dates
@@ -105,9 +175,9 @@ def aqicn_dates():
 
 
 @app.get("/aqicn/{aqicn_id}", response_model=AQICN)
-def read_aqicn_data_by_id(aqicn_id: int):
+async def read_aqicn_data_by_id(aqicn_id: int):
     try:
-        aqicn_data = get_aqicn_data_by_id(aqicn_id)
+        aqicn_data = await get_aqicn_data_by_id(aqicn_id)
         if not aqicn_data:
             raise HTTPException(status_code=404, detail="AQICN data not found")
         return aqicn_data
@@ -117,10 +187,11 @@ def read_aqicn_data_by_id(aqicn_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/sensor", response_model=List[SensorData])
-def read_sensor_data():
+@app.get("/sensor", response_model=Page[SensorData])
+async def read_sensor_data(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           after: Optional[str] = None):
     try:
-        return get_all_sensor_data()
+        return page_response(SensorData, await get_all_sensor_data(limit, after))
     except HTTPException:
         raise
     except Exception as e:
@@ -128,9 +199,9 @@ def read_sensor_data():
 
 
 @app.get("/sensor/latest", response_model=SensorData)
-def read_latest_sensor_data():
+async def read_latest_sensor_data():
     try:
-        latest_data = get_latest_sensor_data()
+        latest_data = await get_latest_sensor_data()
         if not latest_data:
             raise HTTPException(status_code=404, detail="Latest Sensor data not found")
         return latest_data
@@ -140,12 +211,12 @@ def read_latest_sensor_data():
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/sensor/dates", response_model=List)
-def sensor_dates():
+async def sensor_dates():
     """
     Retrieve sensor dates.
     """
     try:
-        sensor_dates = get_available_sensor_dates()
+        sensor_dates = await get_available_sensor_dates()
         if not sensor_dates:
             raise HTTPException(status_code=404, detail="Sensor data not found")
         return sensor_dates
@@ -153,22 +224,22 @@ def sensor_dates():
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/sensor/monthly", response_model=List[SensorData])
-def read_monthly_sensor_data():
+async def read_monthly_sensor_data(points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     """
     Retrieve monthly Sensor data.
     """
     try:
-        monthly_data = get_monthly_sensor_data()
+        monthly_data = await get_monthly_sensor_data()
         if not monthly_data:
             raise HTTPException(status_code=404, detail="Monthly Sensor data not found")
-        return monthly_data
+        return rows_response(SensorData, downsample_records(monthly_data, CHART_METRICS["sensor"], points))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/sensor/{sensor_id}", response_model=SensorData)
-def read_sensor_data_by_id(sensor_id: int):
+async def read_sensor_data_by_id(sensor_id: int):
     try:
-        sensor_data = get_sensor_data_by_id(sensor_id)
+        sensor_data = await get_sensor_data_by_id(sensor_id)
         if not sensor_data:
             raise HTTPException(status_code=404, detail="Sensor data not found")
         return sensor_data
@@ -178,10 +249,11 @@ def read_sensor_data_by_id(sensor_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/weather", response_model=List[Weather])
-def read_weather_data():
+@app.get("/weather", response_model=Page[Weather])
+async def read_weather_data(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                            after: Optional[str] = None):
     try:
-        return get_all_weather_data()
+        return page_response(Weather, await get_all_weather_data(limit, after))
     except HTTPException:
         raise
     except Exception as e:
@@ -189,9 +261,9 @@ def read_weather_data():
 
 
 @app.get("/weather/latest", response_model=Weather)
-def read_latest_weather_data():
+async def read_latest_weather_data():
     try:
-        weather_data = get_latest_weather_data()
+        weather_data = await get_latest_weather_data()
         if not weather_data:
             raise HTTPException(status_code=404, detail="No weather data found")
         return weather_data
@@ -201,25 +273,25 @@ def read_latest_weather_data():
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/weather/monthly", response_model=List[Weather])
-def read_monthly_weather_data():
+async def read_monthly_weather_data(points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     """
     Retrieve monthly weather data.
     """
     try:
-        monthly_data = get_monthly_weather_data()
+        monthly_data = await get_monthly_weather_data()
         if not monthly_data:
             raise HTTPException(status_code=404, detail="Monthly weather data not found")
-        return monthly_data
+        return rows_response(Weather, downsample_records(monthly_data, CHART_METRICS["weather"], points))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/weather/dates", response_model=List)
-def weather_dates():
+async def weather_dates():
     """
     Retrieve weather dates.
     """
     try:
-        weather_dates = get_available_weather_dates()
+        weather_dates = await get_available_weather_dates()
         if not weather_dates:
             raise HTTPException(status_code=404, detail="Weather data not found")
         return weather_dates
@@ -228,9 +300,9 @@ def weather_dates():
 
     
 @app.get("/weather/{weather_id}", response_model=Weather)
-def read_weather_data_by_id(weather_id: int):
+async def read_weather_data_by_id(weather_id: int):
     try:
-        weather_data = get_weather_data_by_id(weather_id)
+        weather_data = await get_weather_data_by_id(weather_id)
         if not weather_data:
             raise HTTPException(status_code=404, detail="Weather data not found")
         return weather_data
@@ -240,16 +312,42 @@ def read_weather_data_by_id(weather_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _date_range_response(request, bounds, model, load, metrics, points, not_found):
+    """
+    Serve a date-range endpoint with HTTP caching. A range that has fully
+    passed rarely changes: its ETag comes from the request alone, so a
+    matching If-None-Match gets a 304 without loading any rows, and the
+    response is cacheable for HISTORY_MAX_AGE, after which the ETag
+    changes too (see request_etag). A range that includes today gets a
+    short max-age and an ETag over the response body.
+    """
+    start, end = bounds
+    closed = range_is_closed(end)
+    if_none_match = request.headers.get("if-none-match")
+    if closed:
+        headers = range_cache_headers(request_etag(request), end, closed=True)
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    rows = await load()
+    if not rows:
+        raise HTTPException(status_code=404, detail=not_found)
+    response = rows_response(model, downsample_records(rows, metrics, points))
+    if not closed:
+        headers = range_cache_headers(body_etag(response.body), max(row["ts"] for row in rows), closed=False)
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
 @app.get("/aqicn/date/{date}", response_model=List[AQICN])
-def read_aqicn_data_by_date(date: str):
+async def read_aqicn_data_by_date(request: Request, date: str, points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     try:
-        aqicn_data = get_aqicn_data_by_date(date)
-        if not aqicn_data:
-            raise HTTPException(
-                status_code=404,
-                detail="AQICN data not found for the specified date",
-            )
-        return aqicn_data
+        return await _date_range_response(
+            request, day_bounds(date), AQICN, lambda: get_aqicn_data_by_date(date),
+            CHART_METRICS["aqicn"], points, "AQICN data not found for the specified date",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -257,15 +355,13 @@ def read_aqicn_data_by_date(date: str):
 
 
 @app.get("/aqicn/date/{start_date}/{end_date}", response_model=List[AQICN])
-def read_aqicn_data_by_date_range(start_date: str, end_date: str):
+async def read_aqicn_data_by_date_range(request: Request, start_date: str, end_date: str,
+                                        points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     try:
-        aqicn_data = get_aqicn_data_by_date_range(start_date, end_date)
-        if not aqicn_data:
-            raise HTTPException(
-                status_code=404,
-                detail="AQICN data not found for the specified date range",
-            )
-        return aqicn_data
+        return await _date_range_response(
+            request, range_bounds(start_date, end_date), AQICN, lambda: get_aqicn_data_by_date_range(start_date, end_date),
+            CHART_METRICS["aqicn"], points, "AQICN data not found for the specified date range",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -273,15 +369,12 @@ def read_aqicn_data_by_date_range(start_date: str, end_date: str):
 
 
 @app.get("/sensor/date/{date}", response_model=List[SensorData])
-def read_sensor_data_by_date(date: str):
+async def read_sensor_data_by_date(request: Request, date: str, points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     try:
-        sensor_data = get_sensor_data_by_date(date)
-        if not sensor_data:
-            raise HTTPException(
-                status_code=404,
-                detail="Sensor data not found for the specified date",
-            )
-        return sensor_data
+        return await _date_range_response(
+            request, day_bounds(date), SensorData, lambda: get_sensor_data_by_date(date),
+            CHART_METRICS["sensor"], points, "Sensor data not found for the specified date",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -289,21 +382,207 @@ def read_sensor_data_by_date(date: str):
 
 
 @app.get("/weather/date/{date}", response_model=List[Weather])
-def read_weather_data_by_date(date: str):
+async def read_weather_data_by_date(request: Request, date: str, points: Optional[int] = Query(None, ge=3, le=MAX_CHART_POINTS)):
     try:
-        weather_data = get_weather_data_by_date(date)
-        if not weather_data:
-            raise HTTPException(
-                status_code=404,
-                detail="Weather data not found for the specified date",
-            )
-        return weather_data
+        return await _date_range_response(
+            request, day_bounds(date), Weather, lambda: get_weather_data_by_date(date),
+            CHART_METRICS["weather"], points, "Weather data not found for the specified date",
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/export/{source}")
+def export_data(source: str,
+                fmt: str = Query("ndjson", alias="format", enum=["ndjson", "csv"]),
+                start_date: Optional[date] = None,
+                end_date: Optional[date] = None,
+                room_id: Optional[int] = None):
+    """
+    Stream a full table (sensor, aqicn or weather) as NDJSON or CSV,
+    optionally limited to a date range and, for sensor data, one room.
+    """
+    stream = stream_export(source, fmt, start_date, end_date, room_id)
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"{EXPORT_TABLES[source][0]}.{'csv' if fmt == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/rollups/{source}/{granularity}", response_model=List[Rollup])
+async def read_rollups(source: str = Path(..., enum=list(ROLLUP_SOURCES)),
+                       granularity: str = Path(..., enum=["hourly", "daily"]),
+                       start_date: Optional[date] = None,
+                       end_date: Optional[date] = None,
+                       room_id: Optional[int] = None):
+    """
+    Retrieve hourly or daily min/max/mean/count buckets, by default for the
+    last month. Sensor buckets are per room.
+    """
+    try:
+        rollups = await get_rollups(source, granularity, start_date, end_date, room_id)
+        if not rollups:
+            raise HTTPException(status_code=404, detail="Rollup data not found")
+        return rollups
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Largest number of readings accepted in one batch request
+MAX_INGEST_BATCH = 5000
+
+
+async def _ingest(source, readings, flush):
+    try:
+        if not readings:
+            raise HTTPException(status_code=400, detail="No readings in batch")
+        if len(readings) > MAX_INGEST_BATCH:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_INGEST_BATCH} readings")
+        buffer = get_buffer(source)
+        await buffer.add(readings)
+        # Queued readings are accepted even if this write fails; they stay buffered
+        written = await buffer.try_flush() if flush else 0
+        return {"accepted": len(readings), "written": written, "pending": len(buffer)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/sensor/batch", status_code=202)
+async def ingest_sensor_data(readings: List[SensorDataCreate], flush: bool = False):
+    """
+    Accept a batch of sensor readings. Readings are buffered and written in
+    multi-row inserts; pass flush=true to write them before responding.
+    """
+    return await _ingest("sensor", readings, flush)
+
+
+@app.post("/aqicn/batch", status_code=202)
+async def ingest_aqicn_data(readings: List[AQICNCreate], flush: bool = False):
+    """
+    Accept a batch of AQICN observations (see /sensor/batch).
+    """
+    return await _ingest("aqicn", readings, flush)
+
+
+@app.post("/weather/batch", status_code=202)
+async def ingest_weather_data(readings: List[WeatherCreate], flush: bool = False):
+    """
+    Accept a batch of weather observations (see /sensor/batch).
+    """
+    return await _ingest("weather", readings, flush)
+
+
+@app.get("/metrics/ingest")
+def read_ingest_metrics():
+    """
+    Retrieve pending and written row counts per ingest buffer.
+    """
+    return get_ingest_stats()
+
+
+@app.get("/metrics/live")
+def read_live_metrics():
+    """
+    Retrieve live feed subscriber count, poll count and last ids seen.
+    """
+    return live_feed.stats()
+
+
+# Comment line sent to idle live clients so proxies keep the stream open
+LIVE_HEARTBEAT_SECONDS = 15
+
+# Ingested rows reach live clients without waiting for the next poll
+add_flush_listener(live_feed.notify)
+
+
+@app.get("/live")
+async def live(request: Request):
+    """
+    Server-Sent Events stream of new readings. Events are `sensor`, `aqicn`
+    and `weather` (JSON list of new rows) and `dashboard` (same shape as
+    /dashboard/latest, also sent on connect). Every client shares one
+    database poller.
+    """
+    async def events():
+        queue = live_feed.subscribe()
+        try:
+            yield f"retry: {int(LIVE_HEARTBEAT_SECONDS * 1000)}\n\n".encode()
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    message = b": keep-alive\n\n"
+                yield message
+        finally:
+            live_feed.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+_ingest_task = None
+
+
+async def _flush_ingest_periodically():
+    while True:
+        await asyncio.sleep(min(INGEST_FLUSH_SECONDS, 1))
+        try:
+            await flush_due_buffers()
+        except Exception:
+            logger.exception("Ingest flush failed")
+
+
+@app.on_event("startup")
+async def start_ingest_flusher():
+    global _ingest_task
+    _ingest_task = asyncio.create_task(_flush_ingest_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_ingest_flusher():
+    if _ingest_task is not None:
+        _ingest_task.cancel()
+    await flush_due_buffers(force=True)
+
+
+# Seconds between rollup refreshes; 0 disables the background task
+ROLLUP_REFRESH_SECONDS = int(os.getenv("ROLLUP_REFRESH_SECONDS", "300"))
+_rollup_task = None
+
+
+async def _refresh_rollups_periodically():
+    while True:
+        try:
+            await run_in_threadpool(refresh_rollups)
+        except Exception:
+            logger.exception("Rollup refresh failed")
+        await asyncio.sleep(ROLLUP_REFRESH_SECONDS)
+
+
+@app.on_event("startup")
+async def start_rollup_refresh():
+    global _rollup_task
+    if ROLLUP_REFRESH_SECONDS > 0:
+        _rollup_task = asyncio.create_task(_refresh_rollups_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_rollup_refresh():
+    if _rollup_task is not None:
+        _rollup_task.cancel()
+
+
 MODEL_CONFIG = {
     "indoor": {
         "no_ac": {
@@ -327,18 +606,72 @@ TARGET_COLS = {
 }
 
 
+# Set to false to serve only the data endpoints; TensorFlow is then never loaded
+FORECAST_ENABLED = os.getenv("FORECAST_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _require_forecasting():
+    if not FORECAST_ENABLED:
+        raise HTTPException(status_code=503, detail="Forecasting is disabled on this server")
+
+
+@app.on_event("startup")
+def load_forecast_models():
+    # Opt-in so dev reloads and tests don't pay the model load up front
+    if FORECAST_ENABLED and os.getenv("PRELOAD_MODELS", "false").lower() in ("1", "true", "yes"):
+        forecast_service.start(MODEL_CONFIG)
+
+
+@app.on_event("shutdown")
+def stop_forecast_workers():
+    forecast_service.shutdown()
+
+
+@app.get("/metrics/forecast")
+def read_forecast_metrics():
+    """
+    Retrieve forecast request, coalescing and micro-batch counters.
+    """
+    return forecast_service.get_stats()
+
+
+@app.on_event("shutdown")
+async def close_database_pools():
+    await close_async_pool()
+
+
 @app.get("/predict/indoor")
-def predict_indoor(model_type: str = Query(..., enum=["no_ac", "with_ac"]),
-                   hours: int = Query(12, enum=[6, 12, 24])):
+async def predict_indoor(model_type: str = Query(..., enum=["no_ac", "with_ac"]),
+                   hours: int = Query(12, enum=[6, 12, 24]),
+                   room_id: str = Query("1", description='Room id, or "all" for every room')):
+    _require_forecasting()
+    if room_id == "all":
+        room = None
+    elif room_id.isdigit():
+        room = int(room_id)
+    else:
+        raise HTTPException(status_code=400, detail='room_id must be an integer or "all"')
+
     config = MODEL_CONFIG["indoor"][model_type]
-    df = load_latest_features(mode="indoor")  # 🚫 no room_id filter
-    forecast_df = predict(config["model"], config["scaler"], df, TARGET_COLS["indoor"], forecast_hours=hours)
-    return {"forecast": forecast_df.to_dict(orient="index")}
+    windows = await run_in_threadpool(load_latest_room_features, room_id=room)
+    # Every room's window goes through the model in the same batch
+    forecasts = await forecast_service.forecast_many(
+        {("indoor", model_type, key): df for key, df in windows.items()},
+        config["model"], config["scaler"], TARGET_COLS["indoor"], forecast_hours=hours,
+    )
+    if room is not None:
+        forecast_df = forecasts[("indoor", model_type, room)]
+        return {"room_id": room, "forecast": forecast_df.to_dict(orient="index")}
+    return {"forecasts": {key: forecasts[("indoor", model_type, key)].to_dict(orient="index")
+                          for key in windows}}
 
 
 @app.get("/predict/outdoor")
-def predict_outdoor(hours: int = Query(12, enum=[6, 12, 24])):
+async def predict_outdoor(hours: int = Query(12, enum=[6, 12, 24])):
+    _require_forecasting()
     config = MODEL_CONFIG["outdoor"]
-    df = load_latest_features(mode="outdoor")
-    forecast_df = predict(config["model"], config["scaler"], df, TARGET_COLS["outdoor"], forecast_hours=hours)
+    df = await run_in_threadpool(load_latest_features, mode="outdoor")
+    forecasts = await forecast_service.forecast_many({("outdoor", None): df}, config["model"], config["scaler"],
+                                                     TARGET_COLS["outdoor"], forecast_hours=hours)
+    forecast_df = forecasts[("outdoor", None)]
     return {"forecast": forecast_df.to_dict(orient="index")}
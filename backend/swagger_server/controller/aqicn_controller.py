@@ -1,78 +1,80 @@
-from ..database.connection import execute_query, timed_cache
+from ..database.async_connection import async_execute_query
+from ..database.connection import timed_cache
+from ..database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from ..database.time_range import day_bounds, range_bounds
 from ..models.aqicn import AQICN
+from ..models.rows import validate_rows
 
 @timed_cache(ttl=15)
-def get_all_aqicn_data():
+async def get_all_aqicn_data(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
     """
-    Fetch all AQICN data from the database.
+    Fetch one page of AQICN data from the database, ordered by (ts, id).
     """
-    query = "SELECT * FROM project_aqicn"
-    result = execute_query(query)
-    aqicn_data = [AQICN(**row) for row in result]
-    return aqicn_data
+    result, next_cursor = await fetch_page("project_aqicn", limit, after)
+    return {"items": validate_rows(AQICN, result), "next_cursor": next_cursor}
 
 @timed_cache(ttl=15)
-def get_aqicn_data_by_id(aqicn_id: int):
+async def get_aqicn_data_by_id(aqicn_id: int):
     """
     Fetch AQICN data by ID from the database.
     """
     query = "SELECT * FROM project_aqicn WHERE id = %s"
-    result = execute_query(query, (aqicn_id,))
+    result = await async_execute_query(query, (aqicn_id,))
     if not result:
         return None
     return AQICN(**result[0])
 
 @timed_cache(ttl=15)
-def get_aqicn_data_by_date(date: str):
+async def get_aqicn_data_by_date(date: str):
     """
     Fetch AQICN data by date from the database.
     """
-    query = "SELECT * FROM project_aqicn WHERE DATE(ts) = %s"
-    result = execute_query(query, (date,))
+    query = "SELECT * FROM project_aqicn WHERE ts >= %s AND ts < %s"
+    result = await async_execute_query(query, day_bounds(date))
     if not result:
         return None
-    return [AQICN(**row) for row in result]
+    return validate_rows(AQICN, result)
 
 @timed_cache(ttl=15)
-def get_aqicn_data_by_date_range(start_date: str, end_date: str):
+async def get_aqicn_data_by_date_range(start_date: str, end_date: str):
     """
     Fetch AQICN data by date range from the database.
     """
-    query = "SELECT * FROM project_aqicn WHERE DATE(ts) BETWEEN %s AND %s"
-    result = execute_query(query, (start_date, end_date))
+    query = "SELECT * FROM project_aqicn WHERE ts >= %s AND ts < %s"
+    result = await async_execute_query(query, range_bounds(start_date, end_date))
     if not result:
         return None
-    return [AQICN(**row) for row in result]
+    return validate_rows(AQICN, result)
 
 @timed_cache(ttl=15)
-def get_latest_aqicn_data():
+async def get_latest_aqicn_data():
     """
     Fetch the latest AQICN data entry from the database.
     """
     query = "SELECT * FROM project_aqicn ORDER BY ts DESC LIMIT 1"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
     return AQICN(**result[0])
 
 @timed_cache(ttl=15)
-def get_monthly_aqicn_data():
+async def get_monthly_aqicn_data():
     """
     Fetch monthly AQICN data from the database.
     """
-    query = "SELECT * FROM project_aqicn WHERE DATE(ts) >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)"
-    result = execute_query(query)
+    query = "SELECT * FROM project_aqicn WHERE ts >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)"
+    result = await async_execute_query(query)
     if not result:
         return None
-    return [AQICN(**row) for row in result]
+    return validate_rows(AQICN, result)
 
 @timed_cache(ttl=15)
-def get_available_aqicn_dates():
+async def get_available_aqicn_dates():
     """
     Fetch available AQICN dates from the database.
     """
     query = "SELECT DISTINCT DATE(ts) AS date FROM project_aqicn ORDER BY date DESC"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
     return [row['date'] for row in result]
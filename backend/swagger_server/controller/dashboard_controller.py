@@ -0,0 +1,92 @@
+import asyncio
+
+from .aqicn_controller import get_latest_aqicn_data
+from .sensor_controller import get_latest_sensor_data
+from .weather_controller import get_latest_weather_data
+from ..http_cache import make_etag
+
+# Health thresholds, highest first: (lower bound exclusive, status, icon, message)
+INDOOR_PM25_LEVELS = [
+    (35, "red", "⚠️", "Indoor PM2.5 is high. Consider improving ventilation or using an air purifier."),
+    (12, "orange", "🔸", "Indoor PM2.5 is moderate. Keep the room ventilated."),
+]
+OUTDOOR_PM25_LEVELS = [
+    (150, "red", "☠️", "Outdoor PM2.5 is very high. Avoid going out and wear a mask."),
+    (55, "orange", "🚨", "Outdoor PM2.5 is high. Wear a mask if you need to go out."),
+    (35, "yellow", "⚠️", "Outdoor PM2.5 is moderate. Sensitive groups should take precautions."),
+]
+# Outdoor card colour follows the AQI score rather than PM2.5
+AQI_STATUS_LEVELS = [(150, "red"), (100, "orange"), (50, "yellow")]
+NO_DATA = {"status": "lightblue", "icon": "❔", "message": "No recent readings."}
+
+
+def _by_level(value, levels, good_message):
+    for bound, status, icon, message in levels:
+        if value > bound:
+            return {"status": status, "icon": icon, "message": message}
+    return {"status": "green", "icon": "✅", "message": good_message}
+
+
+def indoor_summary(sensor):
+    if sensor is None:
+        return NO_DATA
+    return _by_level(sensor.pm25, INDOOR_PM25_LEVELS, "Indoor air quality is good.")
+
+
+def outdoor_summary(aqi):
+    if aqi is None:
+        return NO_DATA
+    summary = _by_level(aqi.pm25, OUTDOOR_PM25_LEVELS, "Outdoor air quality is good.")
+    summary["status"] = next((status for bound, status in AQI_STATUS_LEVELS if aqi.aqi_score > bound), "green")
+    return summary
+
+
+def weather_summary(weather):
+    if weather is None:
+        return NO_DATA
+    temperature = weather.temperature
+    if temperature > 33 or temperature < 0:
+        status = "red"
+    elif temperature > 30 or temperature < 5:
+        status = "orange"
+    elif temperature > 28 or temperature < 10:
+        status = "yellow"
+    else:
+        status = "green"
+
+    if temperature < 18:
+        icon, message = "🧥", "It's quite cold outside. Dress warmly."
+    elif temperature > 33:
+        icon, message = "🔥", "It's hot outside. Stay hydrated and avoid direct sunlight."
+    elif weather.wind_speed > 10:
+        icon, message = "💨", "It's windy today. Secure loose items and be cautious outdoors."
+    else:
+        icon, message = "🌤️", "The weather outside is pleasant."
+    return {"status": status, "icon": icon, "message": message}
+
+
+def summarise(aqi, sensor, weather):
+    """Dashboard snapshot of the latest rows (models or None) with health summaries."""
+    return {
+        "aqi": aqi,
+        "sensor": sensor,
+        "weather": weather,
+        "summary": {
+            "indoor": indoor_summary(sensor),
+            "outdoor": outdoor_summary(aqi),
+            "weather": weather_summary(weather),
+        },
+    }
+
+
+async def get_dashboard_snapshot():
+    """
+    Fetch the latest AQICN, sensor and weather readings concurrently and
+    summarise them. Returns (snapshot, etag); the ETag only changes when
+    one of the three latest rows does.
+    """
+    aqi, sensor, weather = await asyncio.gather(
+        get_latest_aqicn_data(), get_latest_sensor_data(), get_latest_weather_data()
+    )
+    etag = make_etag(*((row.id, row.ts.isoformat()) if row else None for row in (aqi, sensor, weather)))
+    return summarise(aqi, sensor, weather), etag
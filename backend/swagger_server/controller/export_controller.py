@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException
+
+from ..database.async_connection import async_stream_query
+from ..database.time_range import day_bounds
+
+# Export name -> (table, columns in the order of the ml/data CSV exports)
+EXPORT_TABLES = {
+    "sensor": ("SensorData", ["id", "ts", "temperature", "humidity", "pm25", "pm10",
+                              "latitude", "longitude", "room_id"]),
+    "aqicn": ("project_aqicn", ["id", "ts", "pm25", "pm10", "aqi_score"]),
+    "weather": ("project_weather", ["id", "ts", "temperature", "humidity", "wind_speed"]),
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+def build_export_query(source, start_date=None, end_date=None, room_id=None):
+    """Build the SELECT for an export, filtering on a half-open ts range."""
+    if source not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export source '{source}'")
+    table, columns = EXPORT_TABLES[source]
+
+    conditions, params = [], []
+    if start_date:
+        conditions.append("ts >= %s")
+        params.append(day_bounds(start_date)[0])
+    if end_date:
+        conditions.append("ts < %s")
+        params.append(day_bounds(end_date)[1])
+    if room_id is not None:
+        if "room_id" not in columns:
+            raise HTTPException(status_code=400, detail="room_id filter only applies to sensor exports")
+        conditions.append("room_id = %s")
+        params.append(room_id)
+
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY ts, id"
+    return query, tuple(params), columns
+
+def stream_export(source, fmt="ndjson", start_date: date = None, end_date: date = None,
+                  room_id: int = None):
+    """
+    Stream a table as NDJSON lines or a CSV shaped like the ml/data exports.
+    Rows are read EXPORT_CHUNK_SIZE at a time and emitted one chunk per yield.
+    Invalid filters raise before the returned generator starts streaming.
+    """
+    query, params, columns = build_export_query(source, start_date, end_date, room_id)
+
+    async def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        if fmt == "csv":
+            writer.writerow(columns)
+
+        async for rows in async_stream_query(query, params, EXPORT_CHUNK_SIZE):
+            if fmt == "csv":
+                writer.writerows([_csv_value(row[col]) for col in columns] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(row, default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return generate()
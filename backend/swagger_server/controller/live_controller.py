@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+
+from .dashboard_controller import summarise
+from ..database.async_connection import async_execute_query
+from ..models.aqicn import AQICN
+from ..models.dashboard import Dashboard
+from ..models.rows import rows_json, validate_rows
+from ..models.sensor_data import SensorData
+from ..models.weather import Weather
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls for new rows (an ingest flush wakes the poller early)
+LIVE_POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "5"))
+# Most new rows pushed per source and poll
+LIVE_BATCH_LIMIT = 500
+# Messages buffered per client; a slow client loses the oldest first
+LIVE_QUEUE_SIZE = 100
+
+# Live source -> (table, model)
+LIVE_SOURCES = {
+    "aqicn": ("project_aqicn", AQICN),
+    "sensor": ("SensorData", SensorData),
+    "weather": ("project_weather", Weather),
+}
+
+
+def sse_message(event, data):
+    """Encode one Server-Sent Events message; data is JSON bytes."""
+    return f"event: {event}\ndata: ".encode() + data + b"\n\n"
+
+
+class LiveFeed:
+    """
+    One shared poller that reads rows newer than the last id it has seen
+    and fans them out to every connected client's queue, so database load
+    does not grow with the number of viewers.
+
+    Each poll pushes a `<source>` event with the new rows of that source and,
+    when any latest reading changed, a `dashboard` event shaped like
+    /dashboard/latest. New clients get the last dashboard event right away.
+    The poller runs only while someone is subscribed.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.last_ids = {}
+        self.latest = {}
+        self.dashboard = None
+        self.polls = 0
+        self._task = None
+        self._wakeup = None
+
+    async def poll_once(self):
+        changed = False
+        for source, (table, model) in LIVE_SOURCES.items():
+            last_id = self.last_ids.get(source)
+            if last_id is None:
+                # First poll only learns where the table ends
+                query, params = f"SELECT * FROM {table} ORDER BY id DESC LIMIT 1", None
+            else:
+                query = f"SELECT * FROM {table} WHERE id > %s ORDER BY id LIMIT %s"
+                params = (last_id, LIVE_BATCH_LIMIT)
+            rows = await async_execute_query(query, params)
+            if not rows:
+                self.last_ids.setdefault(source, 0)
+                continue
+
+            rows = validate_rows(model, rows)
+            self.last_ids[source] = max(row["id"] for row in rows)
+            if last_id is not None:
+                self.publish(source, rows_json(model, rows))
+            newest = max(rows, key=lambda row: row["ts"])
+            current = self.latest.get(source)
+            if current is None or newest["ts"] >= current.ts:
+                self.latest[source] = model(**newest)
+                changed = True
+        self.polls += 1
+
+        if changed:
+            snapshot = summarise(self.latest.get("aqicn"), self.latest.get("sensor"), self.latest.get("weather"))
+            self.dashboard = sse_message("dashboard", Dashboard(**snapshot).model_dump_json().encode())
+            for queue in self.subscribers:
+                self._put(queue, self.dashboard)
+
+    def publish(self, event, data):
+        message = sse_message(event, data)
+        for queue in self.subscribers:
+            self._put(queue, message)
+
+    @staticmethod
+    def _put(queue, message):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        try:
+            while self.subscribers:
+                try:
+                    await self.poll_once()
+                except Exception:
+                    logger.exception("Live poll failed")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), LIVE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            # Start from the table ends again next time instead of replaying a backlog
+            self.last_ids.clear()
+            self._wakeup = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(LIVE_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.dashboard is not None:
+            queue.put_nowait(self.dashboard)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._wakeup is not None:
+            self._wakeup.set()
+
+    def notify(self, *_):
+        """Poll now rather than at the next interval, e.g. after an ingest flush."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self):
+        return {"subscribers": len(self.subscribers), "polls": self.polls, "last_ids": dict(self.last_ids)}
+
+
+live_feed = LiveFeed()
@@ -0,0 +1,58 @@
+from fastapi import HTTPException
+
+from ..database.async_connection import async_execute_query
+from ..database.connection import timed_cache
+from ..database.schema import ROLLUP_METRICS, rollup_table
+from ..database.time_range import day_bounds
+from ..models.rollup import Rollup
+
+# API source name -> source table
+ROLLUP_SOURCES = {
+    "sensor": "SensorData",
+    "aqicn": "project_aqicn",
+    "weather": "project_weather",
+}
+
+def _to_rollup(row, metrics):
+    return Rollup(
+        bucket=row["bucket"],
+        room_id=row["room_id"],
+        count=row["n"],
+        metrics={
+            m: {"min": row[f"{m}_min"], "max": row[f"{m}_max"], "mean": row[f"{m}_sum"] / row["n"]}
+            for m in metrics
+        },
+    )
+
+@timed_cache(ttl=60)
+async def get_rollups(source: str, granularity: str, start_date: str = None,
+                      end_date: str = None, room_id: int = None):
+    """
+    Fetch rollup buckets for a source, defaulting to the last month.
+    """
+    if source not in ROLLUP_SOURCES:
+        raise HTTPException(status_code=404, detail=f"Unknown rollup source '{source}'")
+    table = ROLLUP_SOURCES[source]
+    if room_id is not None and table != "SensorData":
+        raise HTTPException(status_code=400, detail="room_id filter only applies to sensor rollups")
+
+    conditions, params = [], []
+    if start_date:
+        conditions.append("bucket >= %s")
+        params.append(day_bounds(start_date)[0])
+    else:
+        conditions.append("bucket >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)")
+    if end_date:
+        conditions.append("bucket < %s")
+        params.append(day_bounds(end_date)[1])
+    if room_id is not None:
+        conditions.append("room_id = %s")
+        params.append(room_id)
+
+    query = f"""
+        SELECT * FROM {rollup_table(table, granularity)}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY bucket, room_id
+    """
+    result = await async_execute_query(query, tuple(params))
+    return [_to_rollup(row, ROLLUP_METRICS[table]) for row in result]
@@ -1,69 +1,71 @@
-from ..database.connection import execute_query, timed_cache
+from ..database.async_connection import async_execute_query
+from ..database.connection import timed_cache
+from ..database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from ..database.time_range import day_bounds
 from ..models.sensor_data import SensorData
+from ..models.rows import validate_rows
 
 @timed_cache(ttl=15)
-def get_all_sensor_data():
+async def get_all_sensor_data(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
     """
-    Fetch all sensor data from the database.
+    Fetch one page of sensor data from the database, ordered by (ts, id).
     """
-    query = "SELECT * FROM SensorData"
-    result = execute_query(query)
-    sensor_data = [SensorData(**row) for row in result]
-    return sensor_data
+    result, next_cursor = await fetch_page("SensorData", limit, after)
+    return {"items": validate_rows(SensorData, result), "next_cursor": next_cursor}
 
 @timed_cache(ttl=15)
-def get_sensor_data_by_id(sensor_id: int):
+async def get_sensor_data_by_id(sensor_id: int):
     """
     Fetch sensor data by ID from the database.
     """
     query = "SELECT * FROM SensorData WHERE id = %s"
-    result = execute_query(query, (sensor_id,))
+    result = await async_execute_query(query, (sensor_id,))
     if not result:
         return None
     return SensorData(**result[0])
 
 @timed_cache(ttl=15)
-def get_sensor_data_by_date(date: str):
+async def get_sensor_data_by_date(date: str):
     """
     Fetch sensor data by date from the database.
     """
-    query = "SELECT * FROM SensorData WHERE DATE(ts) = %s"
-    result = execute_query(query, (date,))
+    query = "SELECT * FROM SensorData WHERE ts >= %s AND ts < %s"
+    result = await async_execute_query(query, day_bounds(date))
     if not result:
         return None
-    return [SensorData(**row) for row in result]
+    return validate_rows(SensorData, result)
 
 @timed_cache(ttl=15)
-def get_latest_sensor_data():
+async def get_latest_sensor_data():
     """
     Fetch the latest Sensor data entry from the database.
     """
     query = "SELECT * FROM SensorData ORDER BY ts DESC LIMIT 1"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
     return SensorData(**result[0])
 
 @timed_cache(ttl=15)
-def get_monthly_sensor_data():
+async def get_monthly_sensor_data():
     """
     Fetch monthly sensor data from the database.
     """
     query = """
-        SELECT * FROM SensorData WHERE DATE(ts) >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)
+        SELECT * FROM SensorData WHERE ts >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)
     """
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
-    return [SensorData(**row) for row in result]
+    return validate_rows(SensorData, result)
 
 @timed_cache(ttl=15)
-def get_available_sensor_dates():
+async def get_available_sensor_dates():
     """
     Fetch available sensor dates from the database.
     """
     query = "SELECT DISTINCT DATE(ts) as date FROM SensorData ORDER BY date DESC"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
     return [row['date'] for row in result]
@@ -1,68 +1,70 @@
-from ..database.connection import execute_query, timed_cache
+from ..database.async_connection import async_execute_query
+from ..database.connection import timed_cache
+from ..database.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from ..database.time_range import day_bounds
 from ..models.weather import Weather
+from ..models.rows import validate_rows
 
 @timed_cache(ttl=15)
-def get_all_weather_data():
+async def get_all_weather_data(limit: int = DEFAULT_PAGE_SIZE, after: str = None):
     """
-    Fetch all weather data from the database.
+    Fetch one page of weather data from the database, ordered by (ts, id).
     """
-    query = "SELECT * FROM project_weather"
-    result = execute_query(query)
-    weather_data = [Weather(**row) for row in result]
-    return weather_data
+    result, next_cursor = await fetch_page("project_weather", limit, after)
+    return {"items": validate_rows(Weather, result), "next_cursor": next_cursor}
 
 @timed_cache(ttl=15)
-def get_weather_data_by_id(weather_id: int):
+async def get_weather_data_by_id(weather_id: int):
     """
     Fetch weather data by ID from the database.
     """
     query = "SELECT * FROM project_weather WHERE id = %s"
-    result = execute_query(query, (weather_id,))
+    result = await async_execute_query(query, (weather_id,))
     if not result:
         return None
     return Weather(**result[0])
 
 @timed_cache(ttl=15)
-def get_weather_data_by_date(date: str):
+async def get_weather_data_by_date(date: str):
     """
     Fetch weather data by date from the database.
     """
-    query = "SELECT * FROM project_weather WHERE DATE(ts) = %s"
-    result = execute_query(query, (date,))
+    query = "SELECT * FROM project_weather WHERE ts >= %s AND ts < %s"
+    result = await async_execute_query(query, day_bounds(date))
     if not result:
         return None
-    return [Weather(**row) for row in result]
+    return validate_rows(Weather, result)
 
 @timed_cache(ttl=15)
-def get_latest_weather_data():
+async def get_latest_weather_data():
     """
     Fetch the latest weather data entry from the database.
     """
     query = "SELECT * FROM project_weather ORDER BY ts DESC LIMIT 1"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return None
     return Weather(**result[0])
 
 @timed_cache(ttl=15)
-def get_available_weather_dates():
+async def get_available_weather_dates():
     """
     Fetch unique available weather dates from the database (sorted).
     Returns a list of date strings in 'YYYY-MM-DD' format.
     """
     query = "SELECT DISTINCT DATE(ts) as date FROM project_weather ORDER BY date DESC"
-    result = execute_query(query)
+    result = await async_execute_query(query)
     if not result:
         return []
     return [row["date"].strftime("%Y-%m-%d") for row in result]
 
 @timed_cache(ttl=15)
-def get_monthly_weather_data():
+async def get_monthly_weather_data():
     """
     Fetch monthly weather data from the database.
     """
-    query = "SELECT * FROM project_weather WHERE DATE(ts) >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)"
-    result = execute_query(query)
+    query = "SELECT * FROM project_weather WHERE ts >= DATE_SUB(CURDATE(), INTERVAL 1 MONTH)"
+    result = await async_execute_query(query)
     if not result:
         return None
-    return [Weather(**row) for row in result]
+    return validate_rows(Weather, result)
@@ -0,0 +1,120 @@
+import asyncio
+
+import aiomysql
+
+from .connection import db_config, pool_config
+
+# One aiomysql pool per event loop, created on first use
+_async_pool = None
+_async_pool_loop = None
+
+async def _init_async_pool():
+    """Initialize the async connection pool on first use in this event loop."""
+    global _async_pool, _async_pool_loop
+    loop = asyncio.get_running_loop()
+    if _async_pool is None or _async_pool_loop is not loop:
+        # Store the pending task so concurrent first callers share it
+        _async_pool_loop = loop
+        _async_pool = loop.create_task(aiomysql.create_pool(
+            minsize=1,
+            maxsize=pool_config["size"] + pool_config["max_overflow"],
+            pool_recycle=int(pool_config["recycle"]),
+            host=db_config["host"],
+            user=db_config["user"],
+            password=db_config["password"],
+            db=db_config["database"],
+        ))
+    try:
+        return await _async_pool
+    except Exception:
+        _async_pool = None
+        raise
+
+async def async_execute_query(query, params=None, fetch=True):
+    """Execute a query without blocking the event loop and return results if needed"""
+    pool = await _init_async_pool()
+    connection = await asyncio.wait_for(pool.acquire(), timeout=pool_config["timeout"])
+    try:
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            try:
+                await cursor.execute(query, params or ())
+                if fetch:
+                    return await cursor.fetchall()
+                await connection.commit()
+                return cursor.lastrowid
+            except Exception:
+                await connection.rollback()
+                raise
+    finally:
+        pool.release(connection)
+
+async def async_execute_many(query, rows):
+    """
+    Run an INSERT for many parameter rows in one transaction. aiomysql
+    rewrites INSERT ... VALUES into multi-row statements. Returns the
+    number of rows written.
+    """
+    pool = await _init_async_pool()
+    connection = await asyncio.wait_for(pool.acquire(), timeout=pool_config["timeout"])
+    try:
+        async with connection.cursor() as cursor:
+            try:
+                written = await cursor.executemany(query, rows)
+                await connection.commit()
+                return written
+            except Exception:
+                await connection.rollback()
+                raise
+    finally:
+        pool.release(connection)
+
+async def async_stream_query(query, params=None, chunk_size=1000):
+    """
+    Yield query results in lists of up to chunk_size rows using an unbuffered
+    server-side cursor, so memory stays flat regardless of result size.
+    """
+    pool = await _init_async_pool()
+    connection = await asyncio.wait_for(pool.acquire(), timeout=pool_config["timeout"])
+    finished = False
+    try:
+        cursor = await connection.cursor(aiomysql.SSDictCursor)
+        await cursor.execute(query, params or ())
+        while True:
+            rows = await cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+        await cursor.close()
+        finished = True
+    finally:
+        if not finished:
+            # Abandoned mid-stream: draining the rest could take a while, so
+            # drop the connection instead of returning it to the pool.
+            connection.close()
+        pool.release(connection)
+
+async def close_async_pool():
+    """Close the async pool, waiting for borrowed connections to return."""
+    global _async_pool
+    if _async_pool is None:
+        return
+    pool, _async_pool = _async_pool, None
+    try:
+        pool = await pool
+    except Exception:
+        return
+    pool.close()
+    await pool.wait_closed()
+
+def get_async_pool_stats():
+    """Return usage of the async pool, or None if it has not been created."""
+    if (_async_pool is None or not _async_pool.done() or _async_pool.cancelled()
+            or _async_pool.exception()):
+        return None
+    pool = _async_pool.result()
+    return {
+        "size": pool.size,
+        "free": pool.freesize,
+        "in_use": pool.size - pool.freesize,
+        "max_size": pool.maxsize,
+    }
@@ -1,7 +1,14 @@
 import mysql.connector
-from mysql.connector import pooling
+from mysql.connector import errors, pooling
 import os
 from dotenv import load_dotenv
+from collections import OrderedDict
+import asyncio
+import functools
+import inspect
+import pickle
+import sys
+import threading
 import time
 
 # Load environment variables
@@ -15,24 +22,119 @@ db_config = {
     "database": os.getenv("DB_NAME")
 }
 
+# Connection pool settings
+pool_config = {
+    "size": min(int(os.getenv("DB_POOL_SIZE", "8")), pooling.CNX_POOL_MAXSIZE),
+    # Extra short-lived connections opened when the pool is exhausted
+    "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "4")),
+    # Seconds to wait for a free connection before failing
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    # Seconds after which a pooled connection is reconnected
+    "recycle": float(os.getenv("DB_POOL_RECYCLE", "3600")),
+}
+
 # Lazy-initialized connection pool
 _connection_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = None
+_connection_born = {}
+
+_pool_stats_lock = threading.Lock()
+_pool_stats = {
+    "in_use": 0,
+    "overflow_in_use": 0,
+    "acquired": 0,
+    "waits": 0,
+    "wait_time": 0.0,
+    "acquire_failures": 0,
+}
 
 def _init_pool():
     """Initialize the connection pool on first use."""
-    global _connection_pool
+    global _connection_pool, _pool_slots
     if _connection_pool is None:
-        _connection_pool = pooling.MySQLConnectionPool(
-            pool_name="air_quality_pool",
-            pool_size=1,
-            **db_config
-        )
+        with _pool_lock:
+            if _connection_pool is None:
+                _pool_slots = threading.BoundedSemaphore(
+                    pool_config["size"] + pool_config["max_overflow"]
+                )
+                _connection_pool = pooling.MySQLConnectionPool(
+                    pool_name="air_quality_pool",
+                    pool_size=pool_config["size"],
+                    **db_config
+                )
     return _connection_pool
 
+def _count(**deltas):
+    with _pool_stats_lock:
+        for name, delta in deltas.items():
+            _pool_stats[name] += delta
+
+def _recycle(connection):
+    """Reconnect a pooled connection that has outlived DB_POOL_RECYCLE."""
+    now = time.monotonic()
+    born = _connection_born.get(connection.connection_id)
+    if born is None:
+        _connection_born[connection.connection_id] = now
+    elif now - born > pool_config["recycle"]:
+        _connection_born.pop(connection.connection_id, None)
+        connection.reconnect()
+        _connection_born[connection.connection_id] = time.monotonic()
+
 def get_connection():
-    """Get a connection from the initialized pool."""
+    """
+    Get a connection from the initialized pool.
+
+    Waits up to DB_POOL_TIMEOUT seconds for a free slot. When every pooled
+    connection is busy, up to DB_POOL_MAX_OVERFLOW direct connections are
+    opened instead. Always hand the connection back with release_connection().
+    """
     pool = _init_pool()
-    return pool.get_connection()
+
+    if not _pool_slots.acquire(blocking=False):
+        started = time.monotonic()
+        acquired = _pool_slots.acquire(timeout=pool_config["timeout"])
+        _count(waits=1, wait_time=time.monotonic() - started)
+        if not acquired:
+            _count(acquire_failures=1)
+            raise errors.PoolError(
+                f"Timed out after {pool_config['timeout']}s waiting for a database connection"
+            )
+
+    try:
+        try:
+            connection = pool.get_connection()
+        except errors.PoolError:
+            connection = mysql.connector.connect(**db_config)
+            _count(in_use=1, overflow_in_use=1, acquired=1)
+            return connection
+        try:
+            _recycle(connection)
+        except Exception:
+            connection.close()
+            raise
+    except Exception:
+        _pool_slots.release()
+        _count(acquire_failures=1)
+        raise
+    _count(in_use=1, acquired=1)
+    return connection
+
+def release_connection(connection):
+    """Return a connection from get_connection() to the pool."""
+    overflow = not isinstance(connection, pooling.PooledMySQLConnection)
+    try:
+        connection.close()
+    finally:
+        _pool_slots.release()
+        _count(in_use=-1, overflow_in_use=-1 if overflow else 0)
+
+def get_pool_stats():
+    """Return pool configuration and usage counters."""
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+    stats["wait_time"] = round(stats["wait_time"], 6)
+    return {**pool_config, **stats}
 
 def execute_query(query, params=None, fetch=True):
     """Execute a query and return results if needed"""
@@ -51,27 +153,198 @@ def execute_query(query, params=None, fetch=True):
         raise e
     finally:
         cursor.close()
-        connection.close()
+        release_connection(connection)
 
 
+# Custom timed cache: process-wide LRU shared by every @timed_cache function
+cache_config = {
+    "max_entries": int(os.getenv("CACHE_MAX_ENTRIES", "1024")),
+    "max_bytes": int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+}
+
+_cache = OrderedDict()  # key -> (result, stored_at, expires_at, stale_until, size)
+_cache_lock = threading.Lock()
+_cache_bytes = 0
+_refreshing = set()
+# Striped locks so only one caller per key recomputes an expired entry
+_key_locks = [threading.Lock() for _ in range(64)]
+# In-flight recomputations of async functions, shared by concurrent awaiters
+_inflight = {}
+
+_cache_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stale_hits": 0,
+    "evictions": 0,
+    "expirations": 0,
+}
+
+def _estimate_size(value):
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
 
+def _count_cache(name):
+    with _cache_lock:
+        _cache_stats[name] += 1
 
-# Custom timed cache
-_cache = {}
-def timed_cache(ttl=10):
+def _drop(key):
+    """Remove a key; caller holds _cache_lock."""
+    global _cache_bytes
+    entry = _cache.pop(key)
+    _cache_bytes -= entry[4]
+
+def _cache_get(key, now):
+    """Return (result, state) where state is "fresh", "stale" or None."""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None, None
+        result, _, expires_at, stale_until, _ = entry
+        if now < expires_at:
+            _cache.move_to_end(key)
+            return result, "fresh"
+        if now < stale_until:
+            _cache.move_to_end(key)
+            return result, "stale"
+        _drop(key)
+        _cache_stats["expirations"] += 1
+        return None, None
+
+def _cache_put(key, result, now, ttl, stale_ttl):
+    global _cache_bytes
+    size = _estimate_size(result)
+    if size > cache_config["max_bytes"]:
+        return
+    with _cache_lock:
+        if key in _cache:
+            _drop(key)
+        _cache[key] = (result, now, now + ttl, now + ttl + stale_ttl, size)
+        _cache_bytes += size
+
+        # Expired entries at the LRU end go first, then evict by budget
+        while _cache:
+            oldest_key, oldest = next(iter(_cache.items()))
+            if now >= oldest[3]:
+                _drop(oldest_key)
+                _cache_stats["expirations"] += 1
+            elif (len(_cache) > cache_config["max_entries"]
+                    or _cache_bytes > cache_config["max_bytes"]):
+                _drop(oldest_key)
+                _cache_stats["evictions"] += 1
+            else:
+                break
+
+def _refresh(key, func, args, kwargs, ttl, stale_ttl):
+    try:
+        with _key_locks[hash(key) % len(_key_locks)]:
+            result = func(*args, **kwargs)
+            _cache_put(key, result, time.monotonic(), ttl, stale_ttl)
+    except Exception:
+        pass  # keep serving the stale value; the next miss will surface errors
+    finally:
+        with _cache_lock:
+            _refreshing.discard(key)
+
+def timed_cache(ttl=10, stale_ttl=0):
+    """
+    Cache a function's result for ttl seconds.
+
+    Concurrent callers of an expired key wait for a single recomputation.
+    With stale_ttl > 0 an expired result is still returned for that many
+    extra seconds while it is refreshed in a background thread.
+    """
     def decorator(func):
-        def wrapper(*args):
-            key = (func.__name__, args)
-            now = time.time()
-            # If cache exists and is fresh
-            if key in _cache:
-                result, timestamp = _cache[key]
-                if now - timestamp < ttl:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            return _async_timed_cache(func, name, ttl, stale_ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            result, state = _cache_get(key, time.monotonic())
+            if state == "fresh":
+                _count_cache("hits")
+                return result
+            if state == "stale":
+                _count_cache("stale_hits")
+                with _cache_lock:
+                    start_refresh = key not in _refreshing
+                    _refreshing.add(key)
+                if start_refresh:
+                    threading.Thread(
+                        target=_refresh,
+                        args=(key, func, args, kwargs, ttl, stale_ttl),
+                        daemon=True,
+                    ).start()
+                return result
+
+            with _key_locks[hash(key) % len(_key_locks)]:
+                # Another caller may have filled the entry while we waited
+                result, state = _cache_get(key, time.monotonic())
+                if state == "fresh":
+                    _count_cache("hits")
                     return result
-            # Otherwise fetch and cache
-            result = func(*args)
-            _cache[key] = (result, now)
-            return result
+                _count_cache("misses")
+                result = func(*args, **kwargs)
+                _cache_put(key, result, time.monotonic(), ttl, stale_ttl)
+                return result
         return wrapper
     return decorator
 
+def _async_timed_cache(func, name, ttl, stale_ttl):
+    """timed_cache for coroutine functions; waiters share one asyncio task."""
+    async def fill(key, args, kwargs):
+        result = await func(*args, **kwargs)
+        _cache_put(key, result, time.monotonic(), ttl, stale_ttl)
+        return result
+
+    def forget(key, task):
+        if _inflight.get(key) is task:
+            del _inflight[key]
+        if not task.cancelled():
+            task.exception()  # background refresh errors are not raised anywhere
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        result, state = _cache_get(key, time.monotonic())
+        if state == "fresh":
+            _count_cache("hits")
+            return result
+
+        loop = asyncio.get_running_loop()
+        task = _inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            _count_cache("stale_hits" if state == "stale" else "misses")
+            task = loop.create_task(fill(key, args, kwargs))
+            _inflight[key] = task
+            task.add_done_callback(lambda t: forget(key, t))
+        elif state == "stale":
+            _count_cache("stale_hits")
+        else:
+            _count_cache("hits")
+
+        if state == "stale":
+            return result
+        return await asyncio.shield(task)
+    return wrapper
+
+def get_cache_stats():
+    """Return cache budgets, current size and hit/miss/eviction counters."""
+    with _cache_lock:
+        return {
+            **cache_config,
+            **_cache_stats,
+            "entries": len(_cache),
+            "bytes": _cache_bytes,
+        }
+
+def clear_cache():
+    """Drop every cached result."""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
@@ -0,0 +1,126 @@
+import logging
+import os
+import time
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from .async_connection import async_execute_many
+
+logger = logging.getLogger(__name__)
+
+# Flush a table's buffer once it holds this many rows...
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+# ...or once its oldest row has waited this many seconds
+INGEST_FLUSH_SECONDS = float(os.getenv("INGEST_FLUSH_SECONDS", "5"))
+# Reject new readings while this many are still waiting to be written
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "50000"))
+
+# Ingest source -> (table, insert columns)
+INGEST_TABLES = {
+    "sensor": ("SensorData", ["ts", "temperature", "humidity", "pm25", "pm10",
+                              "latitude", "longitude", "room_id"]),
+    "aqicn": ("project_aqicn", ["ts", "pm25", "pm10", "aqi_score"]),
+    "weather": ("project_weather", ["ts", "temperature", "humidity", "wind_speed"]),
+}
+
+
+class IngestBuffer:
+    """
+    Pending rows for one table, written with a single multi-row INSERT when
+    the buffer reaches INGEST_BATCH_SIZE rows or INGEST_FLUSH_SECONDS age.
+
+    Rows are swapped out synchronously before the write is awaited, so
+    concurrent add()/flush() calls on the event loop never share a batch.
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                      f"VALUES ({', '.join(['%s'] * len(columns))})")
+        self.rows = []
+        self.first_added = None
+        self.written = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    async def add(self, readings):
+        """Queue validated readings; tries an inline flush if the batch is full."""
+        if len(self.rows) + len(readings) > INGEST_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="Ingest buffer is full, retry later")
+        now = datetime.now()
+        if not self.rows:
+            self.first_added = time.monotonic()
+        for reading in readings:
+            values = reading.model_dump()
+            values["ts"] = values["ts"] or now
+            self.rows.append(tuple(values[col] for col in self.columns))
+        if len(self.rows) >= INGEST_BATCH_SIZE:
+            await self.try_flush()
+
+    def due(self):
+        return bool(self.rows) and time.monotonic() - self.first_added >= INGEST_FLUSH_SECONDS
+
+    async def flush(self):
+        """Write every pending row in one transaction and return the count."""
+        if not self.rows:
+            return 0
+        batch, first_added = self.rows, self.first_added
+        self.rows, self.first_added = [], None
+        try:
+            await async_execute_many(self.query, batch)
+        except Exception:
+            # Put the batch back in front of anything queued meanwhile
+            self.rows[:0] = batch
+            self.first_added = first_added
+            raise
+        self.written += len(batch)
+        for listener in _flush_listeners:
+            listener(self.table)
+        return len(batch)
+
+    async def try_flush(self):
+        """
+        flush() for request handlers. Once readings are queued they are
+        accepted: a failed write is logged and the rows stay queued for the
+        next flush, rather than failing a request the client would retry
+        and so insert twice. Returns the number of rows written.
+        """
+        try:
+            return await self.flush()
+        except Exception:
+            logger.exception("Flushing %s failed; %d rows stay queued", self.table, len(self.rows))
+            return 0
+
+
+# Called with the table name after every successful flush
+_flush_listeners = []
+
+
+def add_flush_listener(listener):
+    _flush_listeners.append(listener)
+
+
+_buffers = {source: IngestBuffer(table, columns) for source, (table, columns) in INGEST_TABLES.items()}
+
+
+def get_buffer(source):
+    return _buffers[source]
+
+
+async def flush_due_buffers(force=False):
+    """Flush every buffer that is due (or all of them when force is set)."""
+    flushed = {}
+    for source, buffer in _buffers.items():
+        if force or buffer.due():
+            flushed[source] = await buffer.flush()
+    return flushed
+
+
+def get_ingest_stats():
+    return {
+        source: {"pending": len(buffer), "written": buffer.written}
+        for source, buffer in _buffers.items()
+    }
@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from .async_connection import async_execute_query
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+def encode_cursor(row):
+    """Encode the (ts, id) position of a row as an opaque cursor."""
+    raw = f"{row['ts'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor() back into (ts, id)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+async def fetch_page(table, limit=DEFAULT_PAGE_SIZE, after=None):
+    """
+    Fetch up to `limit` rows of `table` ordered by (ts, id), starting after
+    the cursor position. Returns (rows, next_cursor); next_cursor is None on
+    the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if after:
+        ts, row_id = decode_cursor(after)
+        query = f"""
+            SELECT * FROM {table}
+            WHERE (ts, id) > (%s, %s)
+            ORDER BY ts, id
+            LIMIT %s
+        """
+        params = (ts, row_id, limit + 1)
+    else:
+        query = f"SELECT * FROM {table} ORDER BY ts, id LIMIT %s"
+        params = (limit + 1,)
+
+    # One extra row tells us whether another page exists
+    rows = await async_execute_query(query, params)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
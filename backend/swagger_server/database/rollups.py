@@ -0,0 +1,172 @@
+"""
+Incremental maintenance of the hourly/daily rollup tables.
+
+Rows are folded into their buckets in id order; rollup_watermarks records
+the highest source id already merged per (table, granularity), so each
+refresh only reads rows that arrived since the last one.
+
+Auto-increment ids can commit out of order: a row from a slower
+transaction can become visible after the watermark has moved past its
+id. To catch those, every refresh also rebuilds from scratch the buckets
+within RECONCILE_HOURS of the table's newest reading, where concurrent
+ingestion lands. Late rows older than that (e.g. a backfill running while
+the API refreshes) are only picked up by a full rebuild. Run once with:
+
+    python -m swagger_server.database.rollups [--rebuild]
+"""
+import argparse
+from datetime import timedelta
+
+from .connection import get_connection, release_connection
+from .schema import ROLLUP_GRANULARITIES, ROLLUP_METRICS, rollup_table
+
+# SQL expression mapping ts to the start of its bucket
+BUCKET_EXPRESSIONS = {
+    "hourly": "TIMESTAMP(DATE(ts), MAKETIME(HOUR(ts), 0, 0))",
+    "daily": "TIMESTAMP(DATE(ts))",
+}
+
+# Only one process refreshes at a time; others skip rather than wait
+REFRESH_LOCK = "breatheeasy_rollup_refresh"
+
+# Buckets this close to a table's newest reading are rebuilt on every refresh
+RECONCILE_HOURS = 2
+
+def bucket_start(ts, granularity):
+    """Python counterpart of BUCKET_EXPRESSIONS."""
+    ts = ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0) if granularity == "daily" else ts
+
+def _select_buckets(table, granularity, where):
+    metrics = ROLLUP_METRICS[table]
+    room = "room_id" if table == "SensorData" else "0"
+    aggregates = ", ".join(f"MIN({m}), MAX({m}), SUM({m})" for m in metrics)
+    columns = ", ".join(f"{m}_min, {m}_max, {m}_sum" for m in metrics)
+    not_null = " AND ".join(f"{m} IS NOT NULL" for m in metrics)
+    return f"""
+        INSERT INTO {rollup_table(table, granularity)} (bucket, room_id, n, {columns})
+        SELECT {BUCKET_EXPRESSIONS[granularity]} AS bucket, {room} AS room_id, COUNT(*), {aggregates}
+        FROM {table}
+        WHERE {where} AND {not_null}
+        GROUP BY bucket, room_id
+    """
+
+def build_upsert(table, granularity):
+    """
+    Build the INSERT ... SELECT that merges rows with last_id < id <= max_id
+    and ts before the reconciled buckets into their buckets.
+    """
+    metrics = ROLLUP_METRICS[table]
+    merges = ", ".join(
+        f"{m}_min = LEAST({m}_min, VALUES({m}_min)), "
+        f"{m}_max = GREATEST({m}_max, VALUES({m}_max)), "
+        f"{m}_sum = {m}_sum + VALUES({m}_sum)"
+        for m in metrics
+    )
+    select = _select_buckets(table, granularity, "id > %s AND id <= %s AND ts < %s")
+    return f"{select}    ON DUPLICATE KEY UPDATE n = n + VALUES(n), {merges}\n"
+
+def build_reconcile(table, granularity):
+    """
+    Build the statement that recomputes every bucket from ts onwards out of
+    all rows with id <= max_id, replacing what was merged there before.
+    """
+    columns = ["n", *(f"{m}_{agg}" for m in ROLLUP_METRICS[table] for agg in ("min", "max", "sum"))]
+    updates = ", ".join(f"{c} = VALUES({c})" for c in columns)
+    select = _select_buckets(table, granularity, "ts >= %s AND id <= %s")
+    return f"{select}    ON DUPLICATE KEY UPDATE {updates}\n"
+
+def refresh_rollups():
+    """
+    Merge rows added since the last refresh into every rollup table and
+    rebuild the buckets within RECONCILE_HOURS of each table's newest
+    reading. Returns {rollup table: number of source ids merged}; empty if
+    another process holds the refresh lock.
+    """
+    connection = get_connection()
+    cursor = connection.cursor(dictionary=True)
+    refreshed = {}
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (REFRESH_LOCK,))
+        if not cursor.fetchone()["acquired"]:
+            return refreshed
+        try:
+            for table in ROLLUP_METRICS:
+                cursor.execute(f"SELECT MAX(id) AS max_id, MAX(ts) AS max_ts FROM {table}")
+                newest = cursor.fetchone()
+                max_id = newest["max_id"]
+                if max_id is None:
+                    continue
+                for granularity in ROLLUP_GRANULARITIES:
+                    since = bucket_start(newest["max_ts"] - timedelta(hours=RECONCILE_HOURS), granularity)
+                    cursor.execute(
+                        "SELECT last_id FROM rollup_watermarks "
+                        "WHERE source_table = %s AND granularity = %s",
+                        (table, granularity),
+                    )
+                    row = cursor.fetchone()
+                    last_id = row["last_id"] if row else 0
+                    # Bucket upserts and watermark move commit together
+                    if max_id > last_id:
+                        cursor.execute(build_upsert(table, granularity), (last_id, max_id, since))
+                        cursor.execute(
+                            "INSERT INTO rollup_watermarks (source_table, granularity, last_id) "
+                            "VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)",
+                            (table, granularity, max_id),
+                        )
+                        refreshed[rollup_table(table, granularity)] = max_id - last_id
+                    cursor.execute(build_reconcile(table, granularity), (since, max(max_id, last_id)))
+                    connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (REFRESH_LOCK,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+        release_connection(connection)
+    return refreshed
+
+
+def reset_rollups(table, timeout=30):
+    """
+    Empty a source table's rollup buckets and drop its watermarks, for when
+    the source itself was truncated: its ids restart from 1, so the old
+    watermark would hide every new row. Waits for any running refresh.
+    """
+    connection = get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (REFRESH_LOCK, timeout))
+        if not cursor.fetchone()["acquired"]:
+            raise TimeoutError(f"Rollup refresh still running after {timeout}s")
+        try:
+            for granularity in ROLLUP_GRANULARITIES:
+                cursor.execute(f"DELETE FROM {rollup_table(table, granularity)}")
+            cursor.execute("DELETE FROM rollup_watermarks WHERE source_table = %s", (table,))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (REFRESH_LOCK,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+        release_connection(connection)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bring the rollup tables up to date.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute every bucket, e.g. after a backfill ran alongside the API")
+    args = parser.parse_args()
+    if args.rebuild:
+        for table in ROLLUP_METRICS:
+            reset_rollups(table)
+    print(refresh_rollups() or "Rollups are up to date")
+
+
+if __name__ == "__main__":
+    main()
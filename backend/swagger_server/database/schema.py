@@ -0,0 +1,115 @@
+"""
+Schema migrations for the BreatheEasy tables.
+
+Run from the backend directory with:
+
+    python -m swagger_server.database.schema
+
+Each migration is applied only if it has not been applied before, so the
+module is safe to run on every deploy.
+"""
+from .connection import execute_query
+
+# (table, index name, columns). Indexes on ts let the half-open range
+# filters in the controllers and data_loader seek instead of scanning;
+# (ts, id) matches the keyset order of the paginated endpoints and
+# snapshot refreshes, so `(ts, id) > (%s, %s)` pages are one range read.
+# InnoDB appends the primary key to secondary indexes, so the per-room
+# index already orders each room's rows by (ts, id).
+INDEXES = [
+    ("SensorData", "idx_sensordata_ts", "ts"),
+    ("SensorData", "idx_sensordata_room_ts", "room_id, ts"),
+    ("SensorData", "idx_sensordata_ts_id", "ts, id"),
+    ("project_aqicn", "idx_aqicn_ts", "ts"),
+    ("project_aqicn", "idx_aqicn_ts_id", "ts, id"),
+    ("project_weather", "idx_weather_ts", "ts"),
+    ("project_weather", "idx_weather_ts_id", "ts, id"),
+]
+
+def index_exists(table, index_name):
+    query = """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """
+    return bool(execute_query(query, (table, index_name)))
+
+def create_index(table, index_name, columns):
+    """Create an index unless it already exists. Returns True if created."""
+    if index_exists(table, index_name):
+        return False
+    execute_query(f"CREATE INDEX {index_name} ON {table} ({columns})", fetch=False)
+    return True
+
+# Source table -> numeric columns summarised in its rollup tables
+ROLLUP_METRICS = {
+    "SensorData": ["temperature", "humidity", "pm25", "pm10"],
+    "project_aqicn": ["pm25", "pm10", "aqi_score"],
+    "project_weather": ["temperature", "humidity", "wind_speed"],
+}
+ROLLUP_GRANULARITIES = ["hourly", "daily"]
+
+def rollup_table(table, granularity):
+    return f"{table}_{granularity}"
+
+def table_exists(table):
+    query = """
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+        LIMIT 1
+    """
+    return bool(execute_query(query, (table,)))
+
+def create_rollup_tables():
+    """
+    Create the hourly/daily rollup tables and their watermark table.
+    Each bucket stores count, min, max and sum per metric so that new rows
+    can be merged in without rescanning the bucket; mean is sum / n.
+    Returns the names of the tables created.
+    """
+    created = []
+    if not table_exists("rollup_watermarks"):
+        execute_query("""
+            CREATE TABLE rollup_watermarks (
+                source_table VARCHAR(64) NOT NULL,
+                granularity VARCHAR(16) NOT NULL,
+                last_id BIGINT NOT NULL,
+                PRIMARY KEY (source_table, granularity)
+            )
+        """, fetch=False)
+        created.append("rollup_watermarks")
+
+    for table, metrics in ROLLUP_METRICS.items():
+        for granularity in ROLLUP_GRANULARITIES:
+            name = rollup_table(table, granularity)
+            if table_exists(name):
+                continue
+            metric_columns = ",\n".join(
+                f"{m}_min DOUBLE NOT NULL, {m}_max DOUBLE NOT NULL, {m}_sum DOUBLE NOT NULL"
+                for m in metrics
+            )
+            execute_query(f"""
+                CREATE TABLE {name} (
+                    bucket DATETIME NOT NULL,
+                    room_id INT NOT NULL DEFAULT 0,
+                    n INT NOT NULL,
+                    {metric_columns},
+                    PRIMARY KEY (bucket, room_id)
+                )
+            """, fetch=False)
+            created.append(name)
+    return created
+
+def apply_migrations(indexes=INDEXES):
+    """Apply every pending migration and return the names of those applied."""
+    applied = []
+    for table, index_name, columns in indexes:
+        if create_index(table, index_name, columns):
+            applied.append(index_name)
+    applied.extend(create_rollup_tables())
+    return applied
+
+
+if __name__ == "__main__":
+    applied = apply_migrations()
+    print("Applied: " + ", ".join(applied) if applied else "Schema is up to date")
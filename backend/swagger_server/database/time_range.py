@@ -0,0 +1,26 @@
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+
+# Helpers for sargable date filters: compare the raw ts column against a
+# half-open [start, end) range instead of wrapping it in DATE(), so MySQL
+# can use the ts indexes from schema.py.
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid date '{value}', expected YYYY-MM-DD")
+
+def day_bounds(day):
+    """Return [start, end) datetimes covering one calendar day."""
+    start = datetime.combine(_to_date(day), datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def range_bounds(start_day, end_day):
+    """Return [start, end) datetimes covering start_day through end_day inclusive."""
+    return day_bounds(start_day)[0], day_bounds(end_day)[1]
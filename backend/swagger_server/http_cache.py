@@ -0,0 +1,61 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+
+def make_etag(*parts):
+    """Strong ETag over the string form of parts (e.g. row ids and timestamps)."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def body_etag(body):
+    """Strong ETag over a response body."""
+    return make_etag(hashlib.sha1(body).hexdigest())
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+# Cache lifetimes for date-range endpoints. Closed ranges can still be
+# backfilled (batch ingest, bulk_load), so they aren't cached forever.
+HISTORY_MAX_AGE = max(int(os.getenv("HISTORY_MAX_AGE", str(24 * 3600))), 1)
+CURRENT_MAX_AGE = int(os.getenv("CURRENT_MAX_AGE", "60"))
+# Bump to invalidate every cached historical response at once
+HISTORY_VERSION = os.getenv("HISTORY_VERSION", "1")
+
+
+def http_date(value):
+    """Format a naive server-local datetime as an HTTP date."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def range_is_closed(end):
+    """True once the half-open range ending at `end` (server-local) is entirely in the past."""
+    return end.astimezone(timezone.utc) <= datetime.now(timezone.utc)
+
+
+def request_etag(request):
+    """
+    ETag of a request's path and query parameters, which is the ETag of
+    closed ranges and can be checked before any data is loaded. It changes
+    every HISTORY_MAX_AGE seconds, so a backfilled range reaches clients
+    within that time even when they revalidate.
+    """
+    period = int(time.time() // HISTORY_MAX_AGE)
+    return make_etag(HISTORY_VERSION, period, request.url.path, sorted(request.query_params.multi_items()))
+
+
+def range_cache_headers(etag, last_modified, closed):
+    """A HISTORY_MAX_AGE lifetime for closed ranges, a short one for ranges still filling up."""
+    max_age = HISTORY_MAX_AGE if closed else CURRENT_MAX_AGE
+    return {"ETag": etag, "Last-Modified": http_date(last_modified), "Cache-Control": f"public, max-age={max_age}"}
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import Optional
 
 
 class AQICN(BaseModel):
@@ -12,4 +13,14 @@ class AQICN(BaseModel):
     pm10: float
     aqi_score: int
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AQICNCreate(BaseModel):
+    """
+    AQICNCreate is one AQICN observation submitted for storage.
+    """
+    ts: Optional[datetime] = None
+    pm25: float = Field(ge=0)
+    pm10: float = Field(ge=0)
+    aqi_score: int = Field(ge=0)
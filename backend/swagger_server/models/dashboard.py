@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Optional
+
+from .aqicn import AQICN
+from .sensor_data import SensorData
+from .weather import Weather
+
+
+class HealthSummary(BaseModel):
+    """
+    HealthSummary is the status colour and advice shown for one dashboard card.
+    """
+    status: str
+    icon: str
+    message: str
+
+
+class DashboardSummary(BaseModel):
+    indoor: HealthSummary
+    outdoor: HealthSummary
+    weather: HealthSummary
+
+
+class Dashboard(BaseModel):
+    """
+    Dashboard is the latest reading of every source with its health summary.
+    A source without readings is null.
+    """
+    aqi: Optional[AQICN] = None
+    sensor: Optional[SensorData] = None
+    weather: Optional[Weather] = None
+    summary: DashboardSummary
@@ -0,0 +1,14 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    Page is one keyset-paginated slice of a table, ordered by (ts, id).
+    Pass next_cursor back as `after` to fetch the following page.
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Dict
+
+
+class MetricStats(BaseModel):
+    """
+    MetricStats summarises one metric over a rollup bucket.
+    """
+    min: float
+    max: float
+    mean: float
+
+
+class Rollup(BaseModel):
+    """
+    Rollup is one hourly or daily bucket of a table, per room for sensor data
+    (room_id 0 for outdoor sources).
+    """
+    bucket: datetime
+    room_id: int
+    count: int
+    metrics: Dict[str, MetricStats]
+
+    model_config = ConfigDict(from_attributes=True)
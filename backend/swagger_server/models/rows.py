@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+
+@lru_cache(maxsize=None)
+def row_type(model):
+    """
+    A TypedDict with the same fields as `model`. Rows validated against it
+    stay plain dicts, so bulk responses never build one model per row.
+    """
+    fields = {name: field.annotation for name, field in model.model_fields.items()}
+    return TypedDict(f"{model.__name__}Row", fields)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model):
+    return TypeAdapter(List[row_type(model)])
+
+
+@lru_cache(maxsize=None)
+def _page_adapter(model):
+    page = TypedDict(f"{model.__name__}RowPage", {"items": List[row_type(model)], "next_cursor": Optional[str]})
+    return TypeAdapter(page)
+
+
+def validate_rows(model, rows):
+    """Coerce database rows to `model`'s field types in a single call."""
+    return _list_adapter(model).validate_python(rows)
+
+
+def rows_json(model, rows):
+    """JSON bytes of rows from validate_rows()."""
+    return _list_adapter(model).dump_json(rows)
+
+
+def rows_response(model, rows):
+    """
+    Serialise rows from validate_rows() straight to JSON. Returning a
+    Response skips FastAPI's second validation pass; the route's
+    response_model still documents the schema.
+    """
+    return Response(content=rows_json(model, rows), media_type="application/json")
+
+
+def page_response(model, page):
+    """rows_response() for a {"items": rows, "next_cursor": ...} page."""
+    return Response(content=_page_adapter(model).dump_json(page), media_type="application/json")
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import Optional
 
 
 class SensorData(BaseModel):
@@ -17,4 +18,18 @@ class SensorData(BaseModel):
     room_id: int
 
     model_config = ConfigDict(from_attributes=True)
-        
\ No newline at end of file
+
+
+class SensorDataCreate(BaseModel):
+    """
+    SensorDataCreate is one reading submitted by a room sensor. A missing
+    ts is set to the time the API accepts the reading.
+    """
+    ts: Optional[datetime] = None
+    temperature: float = Field(ge=-40, le=80)
+    humidity: float = Field(ge=0, le=100)
+    pm25: int = Field(ge=0)
+    pm10: int = Field(ge=0)
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    room_id: int = Field(ge=1)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from typing import Optional
 
 
 class Weather(BaseModel):
@@ -12,4 +13,14 @@ class Weather(BaseModel):
     humidity: float
     wind_speed: float
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WeatherCreate(BaseModel):
+    """
+    WeatherCreate is one OpenWeatherMap observation submitted for storage.
+    """
+    ts: Optional[datetime] = None
+    temperature: float = Field(ge=-60, le=60)
+    humidity: float = Field(ge=0, le=100)
+    wind_speed: float = Field(ge=0)
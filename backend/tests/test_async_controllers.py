@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.database.connection import clear_cache
+
+SENSOR_ROW = {
+    "id": 7, "ts": datetime(2025, 4, 7, 20, 9, 37), "temperature": 31.0,
+    "humidity": 60.0, "pm25": 21, "pm10": 30, "latitude": 13.7448,
+    "longitude": 100.5127, "room_id": 1,
+}
+
+
+class TestAsyncControllers(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.client = TestClient(app)
+
+    @patch("swagger_server.controller.sensor_controller.async_execute_query", new_callable=AsyncMock)
+    def test_sensor_by_id_goes_through_async_query(self, mock_query):
+        mock_query.return_value = [SENSOR_ROW]
+        res = self.client.get("/sensor/7")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["room_id"], 1)
+        mock_query.assert_awaited_once_with("SELECT * FROM SensorData WHERE id = %s", (7,))
+
+    @patch("swagger_server.controller.sensor_controller.async_execute_query", new_callable=AsyncMock)
+    def test_repeated_requests_hit_cache(self, mock_query):
+        mock_query.return_value = [SENSOR_ROW]
+        for _ in range(3):
+            self.assertEqual(self.client.get("/sensor/latest").status_code, 200)
+        self.assertEqual(mock_query.await_count, 1)
+
+    @patch("swagger_server.controller.sensor_controller.async_execute_query", new_callable=AsyncMock)
+    def test_not_found(self, mock_query):
+        mock_query.return_value = []
+        res = self.client.get("/sensor/404")
+        self.assertEqual(res.status_code, 404)
+
+    @patch("swagger_server.controller.sensor_controller.async_execute_query", new_callable=AsyncMock)
+    def test_date_filter_uses_ts_range(self, mock_query):
+        mock_query.return_value = [SENSOR_ROW]
+        self.assertEqual(self.client.get("/sensor/date/2025-04-07").status_code, 200)
+        mock_query.assert_awaited_once_with(
+            "SELECT * FROM SensorData WHERE ts >= %s AND ts < %s",
+            (datetime(2025, 4, 7), datetime(2025, 4, 8)),
+        )
+        self.assertEqual(self.client.get("/sensor/date/07-04-2025").status_code, 400)
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.client = TestClient(app)
+        self.rows = [{**SENSOR_ROW, "id": i, "ts": datetime(2025, 4, 7, i)} for i in range(1, 4)]
+
+    @patch("swagger_server.database.pagination.async_execute_query", new_callable=AsyncMock)
+    def test_first_page_returns_cursor(self, mock_query):
+        mock_query.return_value = self.rows
+        body = self.client.get("/sensor", params={"limit": 2}).json()
+        self.assertEqual([item["id"] for item in body["items"]], [1, 2])
+        self.assertIsNotNone(body["next_cursor"])
+        self.assertEqual(mock_query.await_args.args[1], (3,))
+
+    @patch("swagger_server.database.pagination.async_execute_query", new_callable=AsyncMock)
+    def test_cursor_round_trips_into_keyset_query(self, mock_query):
+        mock_query.return_value = self.rows
+        cursor = self.client.get("/sensor", params={"limit": 2}).json()["next_cursor"]
+
+        mock_query.return_value = self.rows[2:]
+        body = self.client.get("/sensor", params={"limit": 2, "after": cursor}).json()
+        self.assertEqual([item["id"] for item in body["items"]], [3])
+        self.assertIsNone(body["next_cursor"])
+        ts = datetime(2025, 4, 7, 2)
+        query, params = mock_query.await_args.args
+        self.assertIn("WHERE (ts, id) > (%s, %s)", query)
+        self.assertEqual(params, (ts, 2, 3))
+
+    def test_invalid_cursor(self):
+        res = self.client.get("/weather", params={"after": "not-a-cursor"})
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+import pandas as pd
+
+from swagger_server.database.rollups import reset_rollups
+from utils.bulk_load import _load_insert, export_files, iter_chunks, load_mysql
+
+
+class TestBulkLoad(unittest.TestCase):
+
+    def test_export_files_include_site_variants(self):
+        self.assertEqual(export_files("SensorData"),
+                         ["ml/data/SensorData.csv", "ml/data/SensorData_G.csv"])
+
+    def test_chunks_dedupe_across_files_and_runs(self):
+        paths = export_files("SensorData")
+        seen = set()
+        chunks = list(iter_chunks("SensorData", paths + paths[:1], chunksize=500, seen=seen))
+        expected = sum(len(pd.read_csv(path)) for path in paths)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), expected)
+        self.assertEqual(len(seen), expected)
+        self.assertNotIn("id", chunks[0].columns)
+        # Everything is already seen on a second pass
+        self.assertEqual(list(iter_chunks("SensorData", paths, seen=seen)), [])
+
+    def test_insert_sends_one_executemany_per_chunk(self):
+        chunk = next(iter_chunks("project_weather", export_files("project_weather"), chunksize=100))
+        chunk.iloc[0, 1] = float("nan")
+        cursor = MagicMock()
+        _load_insert(cursor, "project_weather", chunk)
+        query, rows = cursor.executemany.call_args.args
+        self.assertTrue(query.startswith("INSERT INTO project_weather (ts, temperature, humidity, wind_speed)"))
+        self.assertEqual(len(rows), 100)
+        self.assertIsNone(rows[0][1])
+
+    @patch("utils.bulk_load.mysql.connector.connect")
+    @patch("utils.bulk_load.table_exists", return_value=True)
+    def test_truncate_resets_and_refreshes_rollups(self, _, mock_connect):
+        steps = MagicMock()
+        with patch("utils.bulk_load.execute_query", steps.truncate), \
+                patch("utils.bulk_load.reset_rollups", steps.reset), \
+                patch("utils.bulk_load.refresh_rollups", steps.refresh):
+            loaded = load_mysql("project_weather", export_files("project_weather"), method="insert", truncate=True)
+        self.assertGreater(loaded, 0)
+        self.assertEqual(steps.mock_calls, [
+            call.truncate("TRUNCATE TABLE project_weather", fetch=False),
+            call.reset("project_weather"),
+            call.refresh(),
+        ])
+
+    @patch("swagger_server.database.rollups.release_connection")
+    @patch("swagger_server.database.rollups.get_connection")
+    def test_reset_rollups_clears_buckets_and_watermarks(self, mock_get, _):
+        cursor = mock_get.return_value.cursor.return_value
+        cursor.fetchone.return_value = {"acquired": 1}
+        reset_rollups("SensorData")
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertIn("DELETE FROM SensorData_hourly", statements)
+        self.assertIn("DELETE FROM SensorData_daily", statements)
+        self.assertIn(call("DELETE FROM rollup_watermarks WHERE source_table = %s", ("SensorData",)),
+                      cursor.execute.call_args_list)
+        mock_get.return_value.commit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
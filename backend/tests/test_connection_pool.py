@@ -0,0 +1,75 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from mysql.connector import errors
+
+from swagger_server.database import connection as db
+
+
+class FakePool:
+    """Stands in for MySQLConnectionPool with a fixed number of connections."""
+
+    def __init__(self, pool_size, **kwargs):
+        self.free = pool_size
+
+    def get_connection(self):
+        if self.free == 0:
+            raise errors.PoolError("Failed getting connection; pool exhausted")
+        self.free -= 1
+        conn = MagicMock(spec=db.pooling.PooledMySQLConnection)
+        conn.connection_id = self.free
+        conn.close.side_effect = self._give_back
+        return conn
+
+    def _give_back(self):
+        self.free += 1
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            patch.object(db, "_connection_pool", None),
+            patch.object(db, "_pool_slots", None),
+            patch.dict(db.pool_config, {"size": 2, "max_overflow": 1, "timeout": 0.05}),
+            patch.dict(db._pool_stats, {k: 0 for k in db._pool_stats}),
+            patch.object(db.pooling, "MySQLConnectionPool", FakePool),
+            patch.object(db.mysql.connector, "connect", side_effect=lambda **kw: MagicMock()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_overflow_then_timeout(self):
+        held = [db.get_connection() for _ in range(3)]
+        stats = db.get_pool_stats()
+        self.assertEqual(stats["in_use"], 3)
+        self.assertEqual(stats["overflow_in_use"], 1)
+
+        with self.assertRaises(errors.PoolError):
+            db.get_connection()
+        stats = db.get_pool_stats()
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["acquire_failures"], 1)
+
+        for conn in held:
+            db.release_connection(conn)
+        stats = db.get_pool_stats()
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["overflow_in_use"], 0)
+
+    def test_waiter_gets_released_connection(self):
+        held = [db.get_connection() for _ in range(3)]
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(db.get_connection()))
+        db.pool_config["timeout"] = 2
+        waiter.start()
+        db.release_connection(held.pop())
+        waiter.join()
+        self.assertEqual(len(got), 1)
+        self.assertEqual(db.get_pool_stats()["waits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.http_cache import etag_matches
+from swagger_server.models.aqicn import AQICN
+from swagger_server.models.sensor_data import SensorData
+from swagger_server.models.weather import Weather
+
+TS = datetime(2025, 4, 7, 20, 9, 37)
+AQI = AQICN(id=1, ts=TS, pm25=60.0, pm10=80.0, aqi_score=120)
+SENSOR = SensorData(id=2, ts=TS, temperature=29.0, humidity=55.0, pm25=8, pm10=12,
+                    latitude=13.7448, longitude=100.5127, room_id=1)
+WEATHER = Weather(id=3, ts=TS, temperature=8.0, humidity=60.0, wind_speed=3.5)
+
+CONTROLLER = "swagger_server.controller.dashboard_controller"
+
+
+class TestDashboard(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        self.mocks = {}
+        for name, value in [("aqicn", AQI), ("sensor", SENSOR), ("weather", WEATHER)]:
+            patcher = patch(f"{CONTROLLER}.get_latest_{name}_data", new_callable=AsyncMock, return_value=value)
+            self.mocks[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_snapshot_with_summaries(self):
+        res = self.client.get("/dashboard/latest")
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual(body["aqi"]["aqi_score"], 120)
+        self.assertEqual(body["sensor"]["room_id"], 1)
+        self.assertEqual(body["summary"]["indoor"]["status"], "green")
+        self.assertEqual(body["summary"]["outdoor"]["status"], "orange")
+        self.assertEqual(body["summary"]["outdoor"]["icon"], "🚨")
+        self.assertEqual(body["summary"]["weather"], {
+            "status": "yellow", "icon": "🧥", "message": "It's quite cold outside. Dress warmly."})
+        self.assertIn("ETag", res.headers)
+
+    def test_unchanged_snapshot_returns_304(self):
+        etag = self.client.get("/dashboard/latest").headers["ETag"]
+        res = self.client.get("/dashboard/latest", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+
+        self.mocks["sensor"].return_value = SENSOR.model_copy(update={"id": 4})
+        res = self.client.get("/dashboard/latest", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+
+    def test_missing_source_is_null(self):
+        self.mocks["weather"].return_value = None
+        body = self.client.get("/dashboard/latest").json()
+        self.assertIsNone(body["weather"])
+        self.assertEqual(body["summary"]["weather"]["status"], "lightblue")
+
+    def test_etag_matching(self):
+        self.assertTrue(etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
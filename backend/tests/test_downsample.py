@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from utils.downsample import downsample_records, lttb_indices
+
+
+class TestLTTB(unittest.TestCase):
+
+    def test_keeps_endpoints_and_spike(self):
+        x = np.arange(1000, dtype=float)
+        y = np.zeros(1000)
+        y[437] = 50.0
+        idx = lttb_indices(x, y, 20)
+        self.assertEqual(len(idx), 20)
+        self.assertEqual(idx[0], 0)
+        self.assertEqual(idx[-1], 999)
+        self.assertIn(437, idx)
+        self.assertTrue((np.diff(idx) > 0).all())
+
+    def test_short_series_untouched(self):
+        self.assertEqual(lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist(), [0, 1, 2, 3, 4])
+
+    def test_records_bounded_and_sorted(self):
+        start = datetime(2025, 4, 1)
+        rng = np.random.default_rng(0)
+        records = [{"ts": start + timedelta(minutes=10 * i), "temperature": float(t), "pm25": float(p)}
+                   for i, (t, p) in enumerate(rng.normal(size=(3000, 2)).cumsum(axis=0))]
+        records.reverse()
+        result = downsample_records(records, ["temperature", "pm25"], 500)
+        self.assertLessEqual(len(result), 500)
+        self.assertEqual([r["ts"] for r in result], sorted(r["ts"] for r in result))
+
+    def test_small_budget_never_exceeded(self):
+        start = datetime(2025, 4, 1)
+        rng = np.random.default_rng(1)
+        metrics = ["temperature", "humidity", "pm25", "pm10"]
+        records = [{"ts": start + timedelta(minutes=i), **dict(zip(metrics, map(float, row)))}
+                   for i, row in enumerate(rng.normal(size=(1000, 4)))]
+        for points in (3, 5, 10, 11, 12, 13):
+            self.assertLessEqual(len(downsample_records(records, metrics, points)), points, points)
+
+
+class TestChartEndpoints(unittest.TestCase):
+
+    @patch("swagger_server.app.get_monthly_weather_data", new_callable=AsyncMock)
+    def test_monthly_points(self, mock_monthly):
+        start = datetime(2025, 4, 1)
+        mock_monthly.return_value = [
+            {"id": i, "ts": start + timedelta(minutes=30 * i), "temperature": 30 + np.sin(i / 10),
+             "humidity": 60.0, "wind_speed": 3.0}
+            for i in range(2000)
+        ]
+        client = TestClient(app)
+        self.assertEqual(len(client.get("/weather/monthly").json()), 2000)
+        body = client.get("/weather/monthly", params={"points": 300}).json()
+        self.assertLessEqual(len(body), 300)
+        self.assertEqual(body[0]["id"], 0)
+        self.assertEqual(body[-1]["id"], 1999)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.controller.export_controller import build_export_query
+
+WEATHER_ROWS = [
+    {"id": 2, "ts": datetime(2025, 3, 29, 0, 50, 25), "temperature": 28.95, "humidity": 60, "wind_speed": 4.73},
+    {"id": 4, "ts": datetime(2025, 3, 29, 1, 50, 24), "temperature": 30.94, "humidity": 62, "wind_speed": 4.37},
+]
+
+
+def fake_stream(rows, calls):
+    async def stream(query, params=None, chunk_size=1000):
+        calls.append((query, params))
+        for row in rows:
+            yield [row]
+    return stream
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        self.calls = []
+        patcher = patch("swagger_server.controller.export_controller.async_stream_query",
+                        fake_stream(WEATHER_ROWS, self.calls))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_csv_matches_ml_data_layout(self):
+        res = self.client.get("/export/weather", params={"format": "csv"})
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.headers["content-type"].startswith("text/csv"))
+        self.assertEqual(res.text.splitlines(), [
+            '"id","ts","temperature","humidity","wind_speed"',
+            '"2","2025-03-29 00:50:25","28.95","60","4.73"',
+            '"4","2025-03-29 01:50:24","30.94","62","4.37"',
+        ])
+
+    def test_ndjson(self):
+        res = self.client.get("/export/weather")
+        lines = [json.loads(line) for line in res.text.splitlines()]
+        self.assertEqual([line["id"] for line in lines], [2, 4])
+        self.assertEqual(lines[0]["ts"], "2025-03-29T00:50:25")
+
+    def test_invalid_filters(self):
+        self.assertEqual(self.client.get("/export/aqicn", params={"room_id": 1}).status_code, 400)
+        self.assertEqual(self.client.get("/export/rooms").status_code, 404)
+
+    def test_date_range_is_half_open(self):
+        query, params, _ = build_export_query("sensor", date(2025, 4, 1), date(2025, 4, 7), 2)
+        self.assertIn("ts >= %s AND ts < %s AND room_id = %s", query)
+        self.assertEqual(params, (datetime(2025, 4, 1), datetime(2025, 4, 8), 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import re
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from fastapi import HTTPException
+
+from utils import data_loader
+
+TABLES = {
+    "SensorData": pd.read_csv("ml/data/SensorData.csv", parse_dates=["ts"]),
+    "project_aqicn": pd.read_csv("ml/data/project_aqicn.csv", parse_dates=["ts"]),
+    "project_weather": pd.read_csv("ml/data/project_weather.csv", parse_dates=["ts"]),
+}
+
+
+def csv_execute_query(query, params=None, fetch=True):
+    """Answer the data_loader queries from the ml/data CSV exports."""
+    df = TABLES[re.search(r"FROM (\w+)", query).group(1)]
+    params = list(params or ())
+    if "MAX(ts)" in query:
+        if "room_id = %s" in query:
+            df = df[df.room_id == params.pop(0)]
+        if "GROUP BY room_id" in query:
+            return [{"room_id": room, "ts": ts.to_pydatetime()} for room, ts in df.groupby("room_id").ts.max().items()]
+        return [{"ts": df.ts.max().to_pydatetime()}]
+    if "ts >= %s" in query:
+        df = df[df.ts >= params.pop(0)]
+    if "ts < %s" in query:
+        df = df[df.ts < params.pop(0)]
+    if "room_id = %s" in query:
+        df = df[df.room_id == params.pop(0)]
+    aliases = dict(re.findall(r"(\w+) AS (\w+)", query))
+    keys = ["ts", "room_id"] if "ts, room_id," in query else ["ts"]
+    return df[[*keys, *aliases]].rename(columns=aliases).to_dict("records")
+
+
+class TestAsofJoin(unittest.TestCase):
+
+    def test_takes_latest_previous_reading_within_tolerance(self):
+        base = pd.DataFrame({"a": [1.0, 2.0, 3.0]},
+                            index=pd.date_range("2025-04-01 00:00", periods=3, freq="1h"))
+        other = pd.DataFrame({"b": [10.0, 20.0]},
+                             index=pd.DatetimeIndex(["2025-03-30 22:00", "2025-04-01 01:00"]))
+        joined = data_loader.asof_join(base, other)
+        # 00:00 is more than a day after the 22:00 reading, so it stays empty
+        self.assertTrue(pd.isna(joined["b"].iloc[0]))
+        self.assertEqual(joined["b"].tolist()[1:], [20.0, 20.0])
+
+
+@patch("utils.data_loader.execute_query", csv_execute_query)
+class TestLatestFeatures(unittest.TestCase):
+
+    def test_indoor_window_is_hourly_and_complete(self):
+        df = data_loader.load_latest_features(n_rows=12, mode="indoor")
+        self.assertEqual(len(df), 12)
+        self.assertTrue((df.index.to_series().diff().dropna() == pd.Timedelta(hours=1)).all())
+        self.assertEqual(df.index[-1], TABLES["SensorData"].ts.max().floor("1h"))
+        self.assertFalse(df.isna().any().any())
+        self.assertEqual(list(df.columns), ['temp_in', 'hum_in', 'pm25_in', 'pm10_in', 'pm25_out',
+                                            'pm10_out', 'temp_out', 'hum_out', 'wind_speed',
+                                            'hour', 'day_of_week'])
+
+    def test_outdoor_window_uses_previous_weather(self):
+        df = data_loader.load_latest_features(n_rows=12, mode="outdoor")
+        weather = TABLES["project_weather"].set_index("ts")["temperature"]
+        last_hour = df.index[-1]
+        expected = weather[weather.index < last_hour + pd.Timedelta(hours=1)].iloc[-1]
+        self.assertEqual(len(df), 12)
+        self.assertAlmostEqual(df["temperature"].iloc[-1], expected)
+
+    def test_too_few_readings_is_not_enough_data(self):
+        sensor = TABLES["SensorData"]
+        last_hour = sensor.ts.max().floor("1h")
+        single = sensor.tail(1)
+        # Readings in the first and last hour only: interpolating 10 of 12 hours isn't a window
+        first_hour = last_hour - pd.Timedelta(hours=11)
+        sparse = sensor[sensor.ts.between(first_hour, first_hour + pd.Timedelta(minutes=59)) | (sensor.ts >= last_hour)]
+        for rows in (single, sparse):
+            with patch.dict(TABLES, SensorData=rows), self.assertRaises(HTTPException) as raised:
+                data_loader.load_latest_features(n_rows=12, mode="indoor")
+            self.assertEqual(raised.exception.status_code, 400)
+
+
+ALL_ROOMS = pd.concat([TABLES["SensorData"], pd.read_csv("ml/data/SensorData_G.csv", parse_dates=["ts"])])
+
+
+@patch("utils.data_loader.execute_query", csv_execute_query)
+@patch.dict(TABLES, SensorData=ALL_ROOMS)
+class TestRoomFeatures(unittest.TestCase):
+
+    def test_one_window_per_room(self):
+        windows = data_loader.load_latest_room_features(n_rows=12)
+        self.assertEqual(sorted(windows), [1, 2])
+        for room, df in windows.items():
+            readings = ALL_ROOMS[ALL_ROOMS.room_id == room]
+            # Each window ends at its own room's newest reading, not the newest of any room
+            self.assertEqual(df.index[-1], readings.ts.max().floor("1h"))
+            self.assertEqual(len(df), 12)
+            self.assertFalse(df.isna().any().any())
+            last = readings[readings.ts >= df.index[-1]]
+            self.assertAlmostEqual(df["temp_in"].iloc[-1], last.temperature.mean())
+        self.assertLess(windows[1].index[-1], windows[2].index[-1])
+
+    def test_single_room_ends_at_its_own_latest_reading(self):
+        windows = data_loader.load_latest_room_features(n_rows=12, room_id=1)
+        self.assertEqual(list(windows), [1])
+        self.assertEqual(windows[1].index[-1], TABLES["SensorData"].pipe(
+            lambda df: df[df.room_id == 1]).ts.max().floor("1h"))
+
+
+if __name__ == "__main__":
+    unittest.main()
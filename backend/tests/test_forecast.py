@@ -0,0 +1,153 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from swagger_server.app import MODEL_CONFIG, TARGET_COLS
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from utils.forecast import (cached_predict, cached_predict_many, clear_forecast_cache, predict, predict_many,
+                            scaling_vectors)
+from utils.model_registry import get_model
+
+INDOOR_COLS = ['temp_in', 'hum_in', 'pm25_in', 'pm10_in', 'pm25_out',
+               'pm10_out', 'temp_out', 'hum_out', 'wind_speed']
+OUTDOOR_COLS = ['temperature', 'humidity', 'pm25', 'pm10', 'wind_speed']
+
+
+def make_window(cols, n_rows=12, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2025-04-01", periods=n_rows, freq="1h")
+    df = pd.DataFrame(rng.uniform(20, 60, (n_rows, len(cols))), columns=cols, index=index)
+    df["hour"] = df.index.hour
+    df["day_of_week"] = df.index.dayofweek
+    return df
+
+
+def reference_forecast(config, df, target_cols, hours):
+    """The original per-step model.predict loop, kept as a parity oracle."""
+    model, scaler = get_model(config["model"], config["scaler"])
+    feature_cols = scaler.feature_names_in_.tolist()
+    seq = scaler.transform(df[feature_cols])[-12:]
+    out = []
+    for _ in range(hours):
+        pred = model.predict(seq[np.newaxis], verbose=0)[0]
+        row = np.concatenate([pred, seq[-1, len(target_cols):]])
+        out.append(row)
+        seq = np.vstack([seq[1:], row])
+    return scaler.inverse_transform(np.array(out))[:, :len(target_cols)]
+
+
+class TestForecast(unittest.TestCase):
+
+    def test_indoor_matches_reference(self):
+        config = MODEL_CONFIG["indoor"]["no_ac"]
+        df = make_window(INDOOR_COLS)
+        result = predict(config["model"], config["scaler"], df, TARGET_COLS["indoor"], 6)
+        expected = reference_forecast(config, df, TARGET_COLS["indoor"], 6)
+        np.testing.assert_allclose(result.values, expected, rtol=1e-4, atol=1e-3)
+        self.assertEqual(list(result.columns), TARGET_COLS["indoor"])
+        self.assertEqual(result.index[0], df.index[-1] + pd.Timedelta(hours=1))
+
+    def test_outdoor_matches_reference(self):
+        config = MODEL_CONFIG["outdoor"]
+        df = make_window(OUTDOOR_COLS, seed=1)
+        result = predict(config["model"], config["scaler"], df, TARGET_COLS["outdoor"], 12)
+        expected = reference_forecast(config, df, TARGET_COLS["outdoor"], 12)
+        np.testing.assert_allclose(result.values, expected, rtol=1e-4, atol=1e-3)
+        self.assertEqual(len(result), 12)
+
+
+class TestScalingVectors(unittest.TestCase):
+
+    def assert_matches(self, scaler):
+        df = make_window(OUTDOOR_COLS, n_rows=48, seed=2)
+        scaler.fit(df)
+        cols, scale, offset = scaling_vectors(scaler)
+        self.assertEqual(cols, df.columns.tolist())
+        np.testing.assert_allclose(df.values * scale + offset, scaler.transform(df), atol=1e-12)
+        scaled = scaler.transform(df)
+        np.testing.assert_allclose((scaled - offset) / scale, scaler.inverse_transform(scaled), atol=1e-9)
+
+    def test_min_max(self):
+        self.assert_matches(MinMaxScaler(feature_range=(-1, 1)))
+
+    def test_standard(self):
+        self.assert_matches(StandardScaler())
+        self.assert_matches(StandardScaler(with_mean=False))
+
+    def test_clipping_scaler_rejected(self):
+        scaler = MinMaxScaler(clip=True).fit(make_window(OUTDOOR_COLS))
+        with self.assertRaises(TypeError):
+            scaling_vectors(scaler)
+
+    def test_computed_once_per_scaler(self):
+        scaler = MinMaxScaler().fit(make_window(OUTDOOR_COLS))
+        self.assertIs(scaling_vectors(scaler), scaling_vectors(scaler))
+
+
+class TestForecastCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_forecast_cache()
+        self.config = MODEL_CONFIG["outdoor"]
+        self.df = make_window(OUTDOOR_COLS)
+
+    def forecast(self, df, hours):
+        return cached_predict(("outdoor", None), self.config["model"], self.config["scaler"],
+                              df, TARGET_COLS["outdoor"], hours)
+
+    def test_shorter_horizon_sliced_from_cached_rollout(self):
+        with patch("utils.forecast.predict_many", wraps=predict_many) as mock_predict:
+            full = self.forecast(self.df, 24)
+            short = self.forecast(self.df, 6)
+            again = self.forecast(self.df, 12)
+        self.assertEqual(mock_predict.call_count, 1)
+        self.assertEqual(len(short), 6)
+        pd.testing.assert_frame_equal(short, full.iloc[:6])
+        pd.testing.assert_frame_equal(again, full.iloc[:12])
+
+    def test_newer_input_invalidates(self):
+        newer = make_window(OUTDOOR_COLS, n_rows=13)
+        with patch("utils.forecast.predict_many", wraps=predict_many) as mock_predict:
+            self.forecast(self.df, 6)
+            result = self.forecast(newer, 6)
+        self.assertEqual(mock_predict.call_count, 2)
+        self.assertEqual(result.index[0], newer.index[-1] + pd.Timedelta(hours=1))
+
+    def test_reading_in_same_hour_invalidates(self):
+        updated = self.df.copy()
+        updated.iloc[-1, 0] += 1.0  # a later reading moved the last hour's mean
+        with patch("utils.forecast.predict_many", wraps=predict_many) as mock_predict:
+            first = self.forecast(self.df, 6)
+            result = self.forecast(updated, 6)
+        self.assertEqual(mock_predict.call_count, 2)
+        pd.testing.assert_index_equal(result.index, first.index)
+        self.assertFalse(np.allclose(result.values, first.values))
+
+    def test_rooms_forecast_in_one_batch(self):
+        config = MODEL_CONFIG["indoor"]["no_ac"]
+        windows = {("indoor", "no_ac", room): make_window(INDOOR_COLS, seed=room) for room in (1, 2, 3)}
+        with patch("utils.forecast.predict_many", wraps=predict_many) as mock_predict:
+            forecasts = cached_predict_many(windows, config["model"], config["scaler"],
+                                            TARGET_COLS["indoor"], 6)
+            cached_predict_many(windows, config["model"], config["scaler"], TARGET_COLS["indoor"], 12)
+        self.assertEqual(mock_predict.call_count, 1)
+        for key, df in windows.items():
+            expected = predict(config["model"], config["scaler"], df, TARGET_COLS["indoor"], 6)
+            np.testing.assert_allclose(forecasts[key].values, expected.values, rtol=1e-4, atol=1e-4)
+
+
+class TestLazyTensorFlow(unittest.TestCase):
+
+    def test_app_import_does_not_load_tensorflow(self):
+        code = "import sys, swagger_server.app; print('tensorflow' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
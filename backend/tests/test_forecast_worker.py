@@ -0,0 +1,158 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from swagger_server.app import MODEL_CONFIG, TARGET_COLS, app
+from tests.test_forecast import INDOOR_COLS, OUTDOOR_COLS, make_window
+from utils import forecast_worker
+from utils.forecast import clear_forecast_cache, predict
+from utils.forecast_worker import ForecastService
+
+INDOOR = MODEL_CONFIG["indoor"]["no_ac"]
+
+
+def crash_worker(*args):
+    os._exit(1)
+
+
+def echo_windows(model_path, scaler_path, windows, target_cols, forecast_hours):
+    return windows
+
+
+def run_requests(service, requests):
+    """Fire (windows, hours) requests concurrently against the indoor model."""
+    async def scenario():
+        return await asyncio.gather(*(
+            service.forecast_many(windows, INDOOR["model"], INDOOR["scaler"], TARGET_COLS["indoor"], hours)
+            for windows, hours in requests
+        ))
+    return asyncio.run(scenario())
+
+
+class TestForecastService(unittest.TestCase):
+
+    def setUp(self):
+        clear_forecast_cache()
+
+    def test_coalesces_and_micro_batches(self):
+        service = ForecastService(workers=0, batch_window=0.05)
+        self.addCleanup(service.shutdown)
+        room1, room2, room3 = (make_window(INDOOR_COLS, seed=room) for room in (1, 2, 3))
+        requests = [
+            ({("indoor", "no_ac", 1): room1}, 6),
+            ({("indoor", "no_ac", 1): room1}, 24),
+            ({("indoor", "no_ac", 1): room1, ("indoor", "no_ac", 2): room2}, 12),
+            ({("indoor", "no_ac", 3): room3}, 6),
+        ]
+        with patch.object(forecast_worker, "run_batch", wraps=forecast_worker.run_batch) as mock_batch:
+            results = run_requests(service, requests)
+
+        # One model batch of the three distinct windows serves all four requests
+        self.assertEqual(mock_batch.call_count, 1)
+        self.assertEqual(len(mock_batch.call_args.args[2]), 3)
+        self.assertEqual(service.stats["coalesced"], 2)
+        self.assertEqual([len(r[("indoor", "no_ac", 1)]) for r in results[:3]], [6, 24, 12])
+        expected = predict(INDOOR["model"], INDOOR["scaler"], room3, TARGET_COLS["indoor"], 6)
+        np.testing.assert_allclose(results[3][("indoor", "no_ac", 3)].values, expected.values, rtol=1e-4, atol=1e-4)
+
+    def test_same_hour_with_new_reading_is_not_coalesced(self):
+        service = ForecastService(workers=0, batch_window=0.01)
+        self.addCleanup(service.shutdown)
+        window = make_window(INDOOR_COLS)
+        updated = window.copy()
+        updated.iloc[-1, 0] += 1.0
+        with patch.object(forecast_worker, "run_batch", wraps=forecast_worker.run_batch) as mock_batch:
+            results = run_requests(service, [({("indoor", "no_ac", 1): df}, 6) for df in (window, updated)])
+        self.assertEqual(service.stats["coalesced"], 0)
+        self.assertEqual(mock_batch.call_count, 2)
+        self.assertFalse(results[0][("indoor", "no_ac", 1)].equals(results[1][("indoor", "no_ac", 1)]))
+
+    def test_worker_error_reaches_every_waiter(self):
+        service = ForecastService(workers=0, batch_window=0.01)
+        self.addCleanup(service.shutdown)
+        window = make_window(INDOOR_COLS)
+        with patch.object(forecast_worker, "run_batch", side_effect=ValueError("bad window")):
+            with self.assertRaises(ValueError):
+                run_requests(service, [({("indoor", "no_ac", 1): window}, 6)] * 2)
+        self.assertEqual(service.get_stats()["inflight"], 0)
+
+    def test_process_worker_matches_inline(self):
+        service = ForecastService(workers=1)
+        self.addCleanup(service.shutdown)
+        window = make_window(INDOOR_COLS, seed=4)
+        [result] = run_requests(service, [({("indoor", "no_ac", 1): window}, 12)])
+        expected = predict(INDOOR["model"], INDOOR["scaler"], window, TARGET_COLS["indoor"], 12)
+        np.testing.assert_allclose(result[("indoor", "no_ac", 1)].values, expected.values, rtol=1e-4, atol=1e-4)
+
+    def test_dead_worker_replaces_the_pool(self):
+        service = ForecastService(workers=1)
+        self.addCleanup(service.shutdown)
+        request = ({("indoor", "no_ac", 1): make_window(INDOOR_COLS)}, 6)
+        with patch.object(forecast_worker, "run_batch", crash_worker):
+            with self.assertRaises(BrokenProcessPool):
+                run_requests(service, [request])
+        with patch.object(forecast_worker, "run_batch", echo_windows):
+            [result] = run_requests(service, [request])
+        self.assertEqual(len(result[("indoor", "no_ac", 1)]), 6)
+        self.assertEqual(service.stats["restarts"], 1)
+
+    def test_shutdown_fails_queued_forecasts(self):
+        service = ForecastService(workers=0, max_batch=1)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def blocked(*args):
+            release.wait(5)
+            return echo_windows(*args)
+
+        async def scenario():
+            first, second = (
+                asyncio.ensure_future(service.forecast_many(
+                    {("indoor", "no_ac", room): make_window(INDOOR_COLS, seed=room)},
+                    INDOOR["model"], INDOOR["scaler"], TARGET_COLS["indoor"], 6))
+                for room in (1, 2)
+            )
+            await asyncio.sleep(0.05)
+            service.shutdown()
+            # The second batch was still queued behind the first: it must fail, not hang
+            with self.assertRaisesRegex(RuntimeError, "shut down"):
+                await asyncio.wait_for(second, 1)
+            release.set()
+            await first
+
+        with patch.object(forecast_worker, "run_batch", blocked):
+            asyncio.run(scenario())
+        self.assertEqual(service.get_stats()["inflight"], 0)
+
+
+class TestPredictEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        clear_forecast_cache()
+        self.client = TestClient(app)
+        service = ForecastService(workers=0)
+        self.addCleanup(service.shutdown)
+        patcher = patch("swagger_server.app.forecast_service", service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("swagger_server.app.load_latest_features", return_value=make_window(OUTDOOR_COLS))
+    def test_outdoor(self, _):
+        res = self.client.get("/predict/outdoor", params={"hours": 6})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()["forecast"]), 6)
+
+    def test_disabled(self):
+        with patch("swagger_server.app.FORECAST_ENABLED", False):
+            res = self.client.get("/predict/outdoor")
+        self.assertEqual(res.status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.database.connection import clear_cache
+from swagger_server.http_cache import HISTORY_MAX_AGE
+
+
+def weather_rows(day):
+    start = datetime.combine(day, datetime.min.time())
+    return [{"id": i, "ts": start + timedelta(hours=i), "temperature": 30.0,
+             "humidity": 60.0, "wind_speed": 3.0} for i in range(3)]
+
+
+@patch("swagger_server.controller.weather_controller.async_execute_query", new_callable=AsyncMock)
+class TestDateRangeCaching(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.client = TestClient(app)
+
+    def test_past_day_is_cached_for_history_max_age(self, mock_query):
+        mock_query.return_value = weather_rows(date(2025, 4, 7))
+        res = self.client.get("/weather/date/2025-04-07")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers["Cache-Control"], f"public, max-age={HISTORY_MAX_AGE}")
+        # The range ends at server-local midnight, sent in GMT
+        end = datetime(2025, 4, 8).astimezone(timezone.utc)
+        self.assertEqual(res.headers["Last-Modified"], format_datetime(end, usegmt=True))
+
+        clear_cache()
+        res = self.client.get("/weather/date/2025-04-07", headers={"If-None-Match": res.headers["ETag"]})
+        self.assertEqual(res.status_code, 304)
+        # Answered from the ETag alone
+        self.assertEqual(mock_query.await_count, 1)
+
+        # Different query parameters are a different representation
+        res = self.client.get("/weather/date/2025-04-07", params={"points": 3},
+                              headers={"If-None-Match": res.headers["ETag"]})
+        self.assertEqual(res.status_code, 200)
+
+    def test_past_day_etag_changes_after_max_age(self, mock_query):
+        mock_query.return_value = weather_rows(date(2025, 4, 7))
+        now = 1_750_000_000
+        with patch("swagger_server.http_cache.time.time", return_value=now):
+            etag = self.client.get("/weather/date/2025-04-07").headers["ETag"]
+        # A backfilled day must reach clients that keep revalidating
+        with patch("swagger_server.http_cache.time.time", return_value=now + HISTORY_MAX_AGE):
+            res = self.client.get("/weather/date/2025-04-07", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+
+    def test_today_gets_short_ttl(self, mock_query):
+        today = date.today()
+        mock_query.return_value = weather_rows(today)
+        res = self.client.get(f"/weather/date/{today.isoformat()}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers["Cache-Control"], "public, max-age=60")
+        etag = res.headers["ETag"]
+
+        res = self.client.get(f"/weather/date/{today.isoformat()}", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+
+        clear_cache()
+        mock_query.return_value = weather_rows(today) + [{**weather_rows(today)[0], "id": 9}]
+        res = self.client.get(f"/weather/date/{today.isoformat()}", headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+
+    def test_invalid_date_still_rejected(self, mock_query):
+        self.assertEqual(self.client.get("/weather/date/07-04-2025").status_code, 400)
+        mock_query.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
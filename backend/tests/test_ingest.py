@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.database import ingest
+
+READING = {"temperature": 31.5, "humidity": 62, "pm25": 40, "pm10": 55,
+           "latitude": 13.7448, "longitude": 100.5127, "room_id": 2}
+
+
+class TestIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        for buffer in ingest._buffers.values():
+            buffer.rows, buffer.first_added, buffer.written = [], None, 0
+        patcher = patch("swagger_server.database.ingest.async_execute_many", new_callable=AsyncMock)
+        self.mock_write = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_buffered_until_flush(self):
+        res = self.client.post("/sensor/batch", json=[READING] * 3)
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json(), {"accepted": 3, "written": 0, "pending": 3})
+        self.mock_write.assert_not_awaited()
+
+        res = self.client.post("/sensor/batch", params={"flush": True}, json=[{**READING, "ts": "2025-04-07T20:00:00"}])
+        self.assertEqual(res.json(), {"accepted": 1, "written": 4, "pending": 0})
+        query, rows = self.mock_write.await_args.args
+        self.assertTrue(query.startswith("INSERT INTO SensorData (ts, temperature"))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1][-1], 2)
+
+    def test_flushes_when_batch_size_reached(self):
+        with patch.object(ingest, "INGEST_BATCH_SIZE", 4):
+            self.client.post("/weather/batch", json=[{"temperature": 30, "humidity": 60, "wind_speed": 3}] * 5)
+        self.assertEqual(len(self.mock_write.await_args.args[1]), 5)
+        self.assertEqual(ingest.get_ingest_stats()["weather"], {"pending": 0, "written": 5})
+
+    def test_failed_write_keeps_rows_and_accepts(self):
+        self.mock_write.side_effect = RuntimeError("db down")
+        res = self.client.post("/aqicn/batch", params={"flush": True},
+                               json=[{"pm25": 80, "pm10": 40, "aqi_score": 80}])
+        # Not an error: a retried request would queue the same readings twice
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json(), {"accepted": 1, "written": 0, "pending": 1})
+        self.assertEqual(len(ingest.get_buffer("aqicn")), 1)
+
+        self.mock_write.side_effect = None
+        res = self.client.post("/aqicn/batch", params={"flush": True},
+                               json=[{"pm25": 81, "pm10": 41, "aqi_score": 81}])
+        self.assertEqual(res.json(), {"accepted": 1, "written": 2, "pending": 0})
+
+    def test_failed_size_triggered_flush_accepts(self):
+        self.mock_write.side_effect = RuntimeError("db down")
+        with patch.object(ingest, "INGEST_BATCH_SIZE", 2):
+            res = self.client.post("/weather/batch", json=[{"temperature": 30, "humidity": 60, "wind_speed": 3}] * 3)
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json(), {"accepted": 3, "written": 0, "pending": 3})
+
+    def test_validation(self):
+        self.assertEqual(self.client.post("/sensor/batch", json=[{**READING, "humidity": 140}]).status_code, 422)
+        self.assertEqual(self.client.post("/sensor/batch", json=[]).status_code, 400)
+
+    def test_flush_notifies_listeners(self):
+        tables = []
+        with patch.object(ingest, "_flush_listeners", [tables.append]):
+            self.client.post("/aqicn/batch", params={"flush": True},
+                             json=[{"pm25": 30, "pm10": 40, "aqi_score": 80}])
+        self.assertEqual(tables, ["project_aqicn"])
+
+if __name__ == "__main__":
+    unittest.main()
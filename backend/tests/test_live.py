@@ -0,0 +1,103 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from swagger_server.controller import live_controller
+from swagger_server.controller.live_controller import LiveFeed
+
+START = datetime(2025, 4, 7, 20)
+
+
+class FakeTables:
+    """Answers the live poller's queries from in-memory SensorData rows."""
+
+    def __init__(self):
+        self.sensor = [self.row(1)]
+        self.queries = 0
+
+    @staticmethod
+    def row(i):
+        return {"id": i, "ts": START + timedelta(minutes=i), "temperature": 30.0, "humidity": 60.0,
+                "pm25": 10 * i, "pm10": 20, "latitude": 13.7448, "longitude": 100.5127, "room_id": 1}
+
+    async def query(self, query, params=None):
+        self.queries += 1
+        if "FROM SensorData" not in query:
+            return []
+        if "ORDER BY id DESC LIMIT 1" in query:
+            return self.sensor[-1:]
+        return [row for row in self.sensor if row["id"] > params[0]][:params[1]]
+
+
+def parse(message):
+    lines = message.decode().strip().split("\n")
+    return lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: "))
+
+
+class TestLiveFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = FakeTables()
+        patcher = patch.object(live_controller, "async_execute_query", self.tables.query)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_rows_fan_out_to_every_subscriber(self):
+        async def scenario():
+            feed = LiveFeed()
+            queues = [asyncio.Queue(10) for _ in range(3)]
+            feed.subscribers.update(queues)
+            await feed.poll_once()
+            # The first poll only primes: a dashboard event, no rows
+            self.assertEqual([parse(q.get_nowait())[0] for q in queues], ["dashboard"] * 3)
+
+            self.tables.sensor += [self.tables.row(2), self.tables.row(3)]
+            queries = self.tables.queries
+            await feed.poll_once()
+            # One query per source, regardless of the number of viewers
+            self.assertEqual(self.tables.queries - queries, 3)
+            for queue in queues:
+                event, rows = parse(queue.get_nowait())
+                self.assertEqual((event, [row["id"] for row in rows]), ("sensor", [2, 3]))
+                event, dashboard = parse(queue.get_nowait())
+                self.assertEqual(event, "dashboard")
+                self.assertEqual(dashboard["sensor"]["id"], 3)
+                self.assertEqual(dashboard["summary"]["indoor"]["status"], "orange")
+
+        asyncio.run(scenario())
+
+    def test_poller_runs_only_while_subscribed(self):
+        async def scenario():
+            feed = LiveFeed()
+            queue = feed.subscribe()
+            self.assertEqual(parse(await asyncio.wait_for(queue.get(), 1))[0], "dashboard")
+
+            self.tables.sensor.append(self.tables.row(2))
+            feed.notify()
+            event, rows = parse(await asyncio.wait_for(queue.get(), 1))
+            self.assertEqual((event, rows[0]["id"]), ("sensor", 2))
+
+            # Late subscribers get the current dashboard immediately
+            late = feed.subscribe()
+            self.assertEqual(parse(late.get_nowait())[1]["sensor"]["id"], 2)
+
+            feed.unsubscribe(queue)
+            feed.unsubscribe(late)
+            await asyncio.wait_for(feed._task, 1)
+            self.assertEqual(feed.last_ids, {})
+
+        asyncio.run(scenario())
+
+    def test_slow_client_drops_oldest(self):
+        feed = LiveFeed()
+        queue = asyncio.Queue(2)
+        feed.subscribers.add(queue)
+        for i in range(3):
+            feed.publish("sensor", json.dumps([i]).encode())
+        self.assertEqual([parse(queue.get_nowait())[1] for _ in range(2)], [[1], [2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from swagger_server.app import MODEL_CONFIG, TARGET_COLS
+from tests.test_feature_loading import csv_execute_query
+from utils import data_loader
+from utils.forecast import predict_many
+from utils.model_export import export_tflite, max_difference
+from utils.model_registry import get_model, tflite_path
+
+
+@patch("utils.data_loader.execute_query", csv_execute_query)
+def csv_windows(mode, n_rows=12, every=24):
+    """12-hour feature windows across the ml/data CSV history, one per day."""
+    (base_table, base_columns), others = data_loader.FEATURE_SOURCES[mode]
+    base = data_loader.fetch_hourly(base_table, base_columns, room_id=1 if mode == "indoor" else None)
+    df = data_loader.asof_join(base, *[data_loader.fetch_hourly(t, c) for t, c in others]).dropna()
+    df = df.resample("1h").mean().interpolate()
+    df["hour"] = df.index.hour
+    df["day_of_week"] = df.index.dayofweek
+    return {end: df.iloc[end - n_rows:end] for end in range(n_rows, len(df) + 1, every)}
+
+
+class TestTFLiteParity(unittest.TestCase):
+    """The committed .tflite exports must forecast like the Keras models."""
+
+    def assert_parity(self, config, mode):
+        windows = csv_windows(mode)
+        self.assertGreater(len(windows), 3)
+        keras = predict_many(config["model"], config["scaler"], windows, TARGET_COLS[mode], 24, "keras")
+        tflite = predict_many(config["model"], config["scaler"], windows, TARGET_COLS[mode], 24, "tflite")
+        for key in windows:
+            pd.testing.assert_index_equal(tflite[key].index, keras[key].index)
+            np.testing.assert_allclose(tflite[key].values, keras[key].values, rtol=1e-4, atol=1e-3)
+
+    def test_indoor_no_ac(self):
+        self.assert_parity(MODEL_CONFIG["indoor"]["no_ac"], "indoor")
+
+    def test_indoor_with_ac(self):
+        self.assert_parity(MODEL_CONFIG["indoor"]["with_ac"], "indoor")
+
+    def test_outdoor(self):
+        self.assert_parity(MODEL_CONFIG["outdoor"], "outdoor")
+
+    def test_exports_are_current(self):
+        for config in (MODEL_CONFIG["indoor"]["no_ac"], MODEL_CONFIG["indoor"]["with_ac"], MODEL_CONFIG["outdoor"]):
+            self.assertTrue(os.path.exists(tflite_path(config["model"])), config["model"])
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        config = MODEL_CONFIG["outdoor"]
+        self.model_path = shutil.copy(config["model"], self.tmp)
+        self.scaler_path = shutil.copy(config["scaler"], self.tmp)
+
+    def test_export_matches_keras_for_any_batch_size(self):
+        path = export_tflite(self.model_path)
+        self.assertEqual(path, tflite_path(self.model_path))
+        for batch in (1, 5):
+            self.assertLess(max_difference(self.model_path, path, batch=batch), 1e-5)
+
+    def test_missing_export_names_the_tool(self):
+        with self.assertRaisesRegex(FileNotFoundError, "utils.model_export"):
+            get_model(self.model_path, self.scaler_path, "tflite")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_model(self.model_path, self.scaler_path, "onnx")
+
+
+@unittest.skipUnless(importlib.util.find_spec("ai_edge_litert") or importlib.util.find_spec("tflite_runtime"),
+                     "standalone LiteRT runtime not installed")
+class TestTFLiteWithoutTensorFlow(unittest.TestCase):
+
+    def test_forecast_does_not_load_tensorflow(self):
+        code = ("import sys; from swagger_server.app import MODEL_CONFIG, TARGET_COLS; "
+                "from tests.test_forecast import OUTDOOR_COLS, make_window; from utils.forecast import predict; "
+                "c = MODEL_CONFIG['outdoor']; "
+                "f = predict(c['model'], c['scaler'], make_window(OUTDOOR_COLS), TARGET_COLS['outdoor'], 6, 'tflite'); "
+                "print(len(f), 'tensorflow' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], "6 False")
+
+
+if __name__ == "__main__":
+    unittest.main()
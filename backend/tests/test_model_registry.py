@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from utils import model_registry
+from utils.model_registry import clear_models, get_model, preload_models, tflite_path
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.model_path = os.path.join(self.dir, "model.keras")
+        self.scaler_path = os.path.join(self.dir, "scaler.pkl")
+        for path in (self.model_path, self.scaler_path, tflite_path(self.model_path)):
+            open(path, "w").close()
+            os.utime(path, (1_000_000, 1_000_000))
+
+        clear_models()
+        self.addCleanup(clear_models)
+        self.loads = []
+
+        def load_model(model_path, backend):
+            self.loads.append((model_path, backend))
+            time.sleep(0.05)  # wide enough for concurrent first calls to overlap
+            return object()
+
+        for patcher in (patch.object(model_registry, "_load_model", load_model),
+                        patch.object(model_registry.joblib, "load", lambda path: object())):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_loaded_once_per_model_scaler_and_backend(self):
+        first = get_model(self.model_path, self.scaler_path, "keras")
+        self.assertIs(get_model(self.model_path, self.scaler_path, "keras")[0], first[0])
+        self.assertIs(get_model(self.model_path, self.scaler_path, "keras")[1], first[1])
+        tflite = get_model(self.model_path, self.scaler_path, "tflite")
+        self.assertIsNot(tflite[0], first[0])
+        self.assertEqual(self.loads, [(self.model_path, "keras"), (self.model_path, "tflite")])
+
+    def test_reloads_when_a_file_changes(self):
+        model, scaler = get_model(self.model_path, self.scaler_path, "keras")
+        os.utime(self.model_path, (2_000_000, 2_000_000))
+        retrained, _ = get_model(self.model_path, self.scaler_path, "keras")
+        self.assertIsNot(retrained, model)
+
+        os.utime(self.scaler_path, (2_000_000, 2_000_000))
+        _, refit = get_model(self.model_path, self.scaler_path, "keras")
+        self.assertIsNot(refit, scaler)
+        self.assertEqual(len(self.loads), 3)
+        self.assertIs(get_model(self.model_path, self.scaler_path, "keras")[1], refit)
+
+    def test_concurrent_first_calls_share_one_load(self):
+        results = []
+
+        def call():
+            results.append(get_model(self.model_path, self.scaler_path, "keras"))
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.loads), 1)
+        self.assertEqual(len({id(model) for model, _ in results}), 1)
+
+    def test_preload_loads_every_config(self):
+        config = {"indoor": {"no_ac": {"model": self.model_path, "scaler": self.scaler_path}},
+                  "outdoor": {"model": self.model_path, "scaler": self.scaler_path}}
+        preload_models(config, "keras")
+        get_model(self.model_path, self.scaler_path, "keras")
+        self.assertEqual(self.loads, [(self.model_path, "keras")])
+
+
+if __name__ == "__main__":
+    unittest.main()
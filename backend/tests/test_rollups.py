@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from swagger_server.app import app
+from swagger_server.database.connection import clear_cache
+from swagger_server.database.rollups import build_reconcile, build_upsert, refresh_rollups
+
+SENSOR_BUCKET = {
+    "bucket": datetime(2025, 4, 7, 20), "room_id": 2, "n": 4,
+    "temperature_min": 30.0, "temperature_max": 33.0, "temperature_sum": 126.0,
+    "humidity_min": 55.0, "humidity_max": 60.0, "humidity_sum": 230.0,
+    "pm25_min": 20.0, "pm25_max": 30.0, "pm25_sum": 100.0,
+    "pm10_min": 25.0, "pm10_max": 40.0, "pm10_sum": 128.0,
+}
+
+
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.client = TestClient(app)
+
+    @patch("swagger_server.controller.rollup_controller.async_execute_query", new_callable=AsyncMock)
+    def test_hourly_sensor_rollup(self, mock_query):
+        mock_query.return_value = [SENSOR_BUCKET]
+        res = self.client.get("/rollups/sensor/hourly", params={"start_date": "2025-04-07", "room_id": 2})
+        self.assertEqual(res.status_code, 200)
+        bucket = res.json()[0]
+        self.assertEqual(bucket["count"], 4)
+        self.assertEqual(bucket["metrics"]["temperature"], {"min": 30.0, "max": 33.0, "mean": 31.5})
+        query, params = mock_query.await_args.args
+        self.assertIn("FROM SensorData_hourly", query)
+        self.assertEqual(params, (datetime(2025, 4, 7), 2))
+
+    def test_room_filter_only_for_sensor(self):
+        res = self.client.get("/rollups/weather/daily", params={"room_id": 1})
+        self.assertEqual(res.status_code, 400)
+
+    def test_upsert_merges_counts_and_extremes(self):
+        sql = build_upsert("project_weather", "daily")
+        self.assertIn("INSERT INTO project_weather_daily", sql)
+        self.assertIn("0 AS room_id", sql)
+        self.assertIn("wind_speed_max = GREATEST(wind_speed_max, VALUES(wind_speed_max))", sql)
+        self.assertIn("n = n + VALUES(n)", sql)
+
+    def test_reconcile_replaces_recent_buckets(self):
+        sql = build_reconcile("SensorData", "hourly")
+        self.assertIn("WHERE ts >= %s AND id <= %s", sql)
+        self.assertIn("n = VALUES(n)", sql)
+        self.assertIn("pm25_min = VALUES(pm25_min)", sql)
+
+    @patch("swagger_server.database.rollups.release_connection")
+    @patch("swagger_server.database.rollups.get_connection")
+    def test_refresh_reconciles_recent_buckets_without_new_ids(self, mock_get, _):
+        cursor = mock_get.return_value.cursor.return_value
+        newest = {"max_id": 100, "max_ts": datetime(2025, 4, 7, 20, 30)}
+        watermarks = {"SensorData": 90, "project_aqicn": 100, "project_weather": 100}
+
+        def fetchone():
+            query, *params = cursor.execute.call_args.args
+            if "GET_LOCK" in query:
+                return {"acquired": 1}
+            if "MAX(id)" in query:
+                return newest
+            return {"last_id": watermarks[params[0][0]]}
+
+        cursor.fetchone.side_effect = fetchone
+        refreshed = refresh_rollups()
+        self.assertEqual(refreshed, {"SensorData_hourly": 10, "SensorData_daily": 10})
+
+        upserts = [c.args for c in cursor.execute.call_args_list if "id > %s" in c.args[0]]
+        # New ids are merged only below the rebuilt buckets, which every table rebuilds
+        self.assertEqual([args[1] for args in upserts],
+                         [(90, 100, datetime(2025, 4, 7, 18)), (90, 100, datetime(2025, 4, 7))])
+        reconciles = [c.args for c in cursor.execute.call_args_list if "ts >= %s AND id <= %s" in c.args[0]]
+        self.assertEqual(len(reconciles), 6)
+        self.assertEqual(reconciles[-1][1], (datetime(2025, 4, 7), 100))
+        self.assertIn("project_weather_daily", reconciles[-1][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
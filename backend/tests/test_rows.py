@@ -0,0 +1,41 @@
+import json
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+
+from swagger_server.models.rows import page_response, rows_response, validate_rows
+from swagger_server.models.sensor_data import SensorData
+
+ROWS = [
+    {"id": i, "ts": datetime(2025, 4, 7, 20, i), "temperature": 31, "humidity": Decimal("58.5"),
+     "pm25": 24, "pm10": 31, "latitude": Decimal("13.744800"), "longitude": Decimal("100.512700"),
+     "room_id": 1}
+    for i in range(3)
+]
+
+
+class TestRows(unittest.TestCase):
+
+    def test_json_matches_model_serialisation(self):
+        expected = TypeAdapter(List[SensorData]).dump_json([SensorData(**row) for row in ROWS])
+        rows = validate_rows(SensorData, ROWS)
+        self.assertIsInstance(rows[0], dict)
+        self.assertIsInstance(rows[0]["latitude"], float)
+        self.assertEqual(rows_response(SensorData, rows).body, expected)
+
+    def test_page_response(self):
+        page = {"items": validate_rows(SensorData, ROWS[:1]), "next_cursor": "abc"}
+        body = json.loads(page_response(SensorData, page).body)
+        self.assertEqual(body["next_cursor"], "abc")
+        self.assertEqual(body["items"][0]["ts"], "2025-04-07T20:00:00")
+
+    def test_invalid_row_rejected(self):
+        with self.assertRaises(ValueError):
+            validate_rows(SensorData, [{**ROWS[0], "pm25": "n/a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
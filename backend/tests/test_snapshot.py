@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from tests.test_feature_loading import TABLES, csv_execute_query
+from utils import data_loader, snapshot
+from utils.bulk_load import export_files, load_parquet
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        patcher = patch.object(snapshot, "SNAPSHOT_DIR", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_bulk_load_builds_sorted_snapshot(self):
+        written = load_parquet("SensorData", export_files("SensorData"))
+        df = snapshot.read_snapshot("SensorData")
+        self.assertEqual(written, len(df))
+        self.assertTrue(df.ts.is_monotonic_increasing)
+        self.assertEqual(len(snapshot._parts("SensorData")), 1)
+        self.assertEqual(snapshot.snapshot_max_ts("SensorData"), df.ts.max())
+
+    def test_range_read_matches_mysql_path(self):
+        load_parquet("SensorData", export_files("SensorData")[:1])
+        start, end = pd.Timestamp("2025-04-05"), pd.Timestamp("2025-04-08")
+        with patch("utils.data_loader.execute_query", csv_execute_query):
+            expected = data_loader.fetch_hourly("SensorData", data_loader.INDOOR_COLUMNS, start, end, 1)
+        result = data_loader.fetch_hourly_snapshot("SensorData", data_loader.INDOOR_COLUMNS, start, end, 1)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_refresh_appends_only_newer_rows(self):
+        weather = TABLES["project_weather"]
+        snapshot.append_snapshot("project_weather", weather.iloc[:200])
+        # A reading that shares the newest cached ts arrived after the snapshot
+        late = weather.iloc[[199]].assign(id=10_000)
+        table = pd.concat([weather, late]).sort_values(["ts", "id"])
+
+        def fake_query(query, params=None, fetch=True):
+            df = table
+            if "ts >= %s" in query:
+                df = df[df.ts >= params[0]]
+            elif "(ts, id) > (%s, %s)" in query:
+                ts, row_id = params[0], params[1]
+                df = df[(df.ts > ts) | ((df.ts == ts) & (df.id > row_id))]
+            return df.head(params[-1]).to_dict("records")
+
+        with patch("utils.snapshot.execute_query", fake_query):
+            appended = snapshot.refresh_snapshot("project_weather", page_size=25)
+        self.assertEqual(appended, len(weather) - 200)
+        df = snapshot.read_snapshot("project_weather")
+        self.assertEqual(len(df), len(weather))
+        self.assertEqual(df.ts.max(), weather.ts.max())
+
+    @patch("utils.data_loader.fetch_hourly_rollup")
+    @patch("utils.data_loader.refresh_rollups")
+    def test_history_without_snapshot_refreshes_rollups_first(self, mock_refresh, mock_rollup):
+        steps = MagicMock()
+        steps.attach_mock(mock_refresh, "refresh")
+        steps.attach_mock(mock_rollup, "read")
+        data_loader.fetch_history("project_weather", data_loader.WEATHER_COLUMNS)
+        self.assertEqual([name for name, _, _ in steps.mock_calls], ["refresh", "read"])
+
+        mock_refresh.reset_mock()
+        data_loader.fetch_history("project_weather", data_loader.WEATHER_COLUMNS, refresh=False)
+        mock_refresh.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
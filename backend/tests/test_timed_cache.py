@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from swagger_server.database import connection as db
+
+
+class TestTimedCache(unittest.TestCase):
+
+    def setUp(self):
+        db.clear_cache()
+        patcher = patch.dict(db.cache_config, {"max_entries": 3, "max_bytes": 10_000})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db.clear_cache)
+
+    def test_lru_eviction_by_entry_count(self):
+        calls = []
+
+        @db.timed_cache(ttl=60)
+        def lookup(day):
+            calls.append(day)
+            return day
+
+        for day in ["a", "b", "c"]:
+            lookup(day)
+        lookup("a")  # refresh "a" so "b" becomes least recently used
+        lookup("d")
+        lookup("a")
+        lookup("b")
+
+        self.assertEqual(calls, ["a", "b", "c", "d", "b"])
+        stats = db.get_cache_stats()
+        self.assertLessEqual(stats["entries"], 3)
+        self.assertGreaterEqual(stats["evictions"], 2)
+
+    def test_byte_budget_skips_oversized_results(self):
+        @db.timed_cache(ttl=60)
+        def big():
+            return "x" * 20_000
+
+        big()
+        self.assertEqual(db.get_cache_stats()["entries"], 0)
+
+    def test_single_flight_on_miss(self):
+        calls = []
+        release = threading.Event()
+
+        @db.timed_cache(ttl=60)
+        def slow():
+            calls.append(1)
+            release.wait(1)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_stale_while_revalidate(self):
+        values = iter(["old", "new"])
+        refreshed = threading.Event()
+
+        @db.timed_cache(ttl=0.01, stale_ttl=60)
+        def latest():
+            value = next(values)
+            if value == "new":
+                refreshed.set()
+            return value
+
+        self.assertEqual(latest(), "old")
+        time.sleep(0.02)
+        self.assertEqual(latest(), "old")
+        self.assertTrue(refreshed.wait(1))
+        time.sleep(0.01)
+        self.assertEqual(latest(), "new")
+
+    def test_async_callers_share_one_query(self):
+        calls = []
+
+        @db.timed_cache(ttl=60)
+        async def latest():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def burst():
+            return await asyncio.gather(*(latest() for _ in range(10)))
+
+        self.assertEqual(asyncio.run(burst()), ["value"] * 10)
+        self.assertEqual(asyncio.run(latest()), "value")
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
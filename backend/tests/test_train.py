@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, call, patch
+
+import numpy as np
+import pandas as pd
+
+from swagger_server.app import TARGET_COLS
+from utils import snapshot, train
+from utils.bulk_load import BULK_TABLES, export_files, load_parquet
+from utils.forecast import predict
+
+
+def loop_windows(values, window, target_idx):
+    """The notebooks' create_sequences plus NaN mask, kept as an oracle."""
+    X, y = [], []
+    for i in range(window, len(values)):
+        X.append(values[i - window:i])
+        y.append(values[i, target_idx])
+    X, y = np.array(X), np.array(y)
+    keep = ~np.isnan(X).any(axis=(1, 2)) & ~np.isnan(y).any(axis=1)
+    return X[keep], y[keep]
+
+
+class TestSlidingWindows(unittest.TestCase):
+
+    def test_matches_loop(self):
+        values = np.random.default_rng(0).uniform(size=(50, 5))
+        values[[3, 30], [1, 4]] = np.nan
+        X, y = train.sliding_windows(values, 12, [0, 1])
+        expected_X, expected_y = loop_windows(values, 12, [0, 1])
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+        self.assertLess(len(X), 50 - 12)
+
+
+class CsvSnapshotTest(unittest.TestCase):
+    """Sources served from Parquet snapshots built from the ml/data CSVs."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.snapshot_dir = tempfile.mkdtemp()
+        with patch.object(snapshot, "SNAPSHOT_DIR", cls.snapshot_dir):
+            for table in BULK_TABLES:
+                load_parquet(table, export_files(table))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.snapshot_dir)
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        patcher = patch.object(snapshot, "SNAPSHOT_DIR", self.snapshot_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestTrainingFrame(CsvSnapshotTest):
+
+    def test_frame_is_hourly_with_notebook_features(self):
+        df, _ = train.load_training_frame("indoor", room_id=1, refresh=False, cache_dir=self.dir)
+        self.assertTrue((df.index.to_series().diff().dropna() == pd.Timedelta(hours=1)).all())
+        self.assertEqual(list(df.columns), ['temp_in', 'hum_in', 'pm25_in', 'pm10_in', 'pm25_out',
+                                            'pm10_out', 'temp_out', 'hum_out', 'wind_speed',
+                                            'hour', 'day_of_week'])
+
+    def test_cached_until_sources_change(self):
+        first, key = train.load_training_frame("outdoor", refresh=False, cache_dir=self.dir)
+        with patch("utils.train.load_feature_history") as load:
+            again, same_key = train.load_training_frame("outdoor", refresh=False, cache_dir=self.dir)
+            load.assert_not_called()
+        self.assertEqual(key, same_key)
+        pd.testing.assert_frame_equal(again, first, check_freq=False)
+
+        newer = pd.Timestamp("2030-01-01")
+        with patch("utils.train.snapshot_max_ts", return_value=newer):
+            _, new_key = train.load_training_frame("outdoor", refresh=False, cache_dir=self.dir)
+        self.assertNotEqual(new_key, key)
+
+
+@patch("utils.train.snapshot_exists", return_value=False)
+class TestRollupTrainingFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.frame = pd.DataFrame({"pm25": [1.0]}, index=pd.DatetimeIndex(["2025-04-01"], name="ts"))
+
+    def test_refreshes_rollups_and_keys_on_them(self, _):
+        steps = MagicMock()
+        steps.query.return_value = [{"last_id": 10, "ts": datetime(2025, 4, 1), "n": 40}]
+        steps.load.return_value = self.frame
+        with patch("utils.train.refresh_rollups", steps.refresh), \
+                patch("utils.train.execute_query", steps.query), \
+                patch("utils.train.load_feature_history", steps.load):
+            _, key = train.load_training_frame("outdoor", cache_dir=self.dir)
+            self.assertEqual(steps.mock_calls[0], call.refresh())
+            self.assertTrue(all("_hourly" in c.args[0] for c in steps.query.call_args_list))
+
+            # Rollups that took in more rows give a new key, so the cached frame isn't reused
+            steps.query.return_value = [{"last_id": 12, "ts": datetime(2025, 4, 1), "n": 42}]
+            _, new_key = train.load_training_frame("outdoor", cache_dir=self.dir)
+            self.assertNotEqual(new_key, key)
+            self.assertEqual(steps.load.call_count, 2)
+
+            steps.refresh.reset_mock()
+            train.load_training_frame("outdoor", refresh=False, cache_dir=self.dir)
+            steps.refresh.assert_not_called()
+
+
+class TestTrain(CsvSnapshotTest):
+
+    def test_writes_versioned_artifacts_that_forecast(self):
+        out_dir = train.train("outdoor", TARGET_COLS["outdoor"], epochs=2, refresh=False, version="v1",
+                              artifact_dir=self.dir, cache_dir=self.dir, verbose=0)
+        self.assertEqual(out_dir, os.path.join(self.dir, "outdoor", "v1"))
+        with open(os.path.join(out_dir, "meta.json")) as f:
+            meta = json.load(f)
+        self.assertEqual(meta["feature_cols"][:4], TARGET_COLS["outdoor"])
+        self.assertEqual(meta["params"]["epochs_run"], 2)
+        self.assertEqual(set(meta["metrics"]), set(TARGET_COLS["outdoor"]))
+
+        model_path, scaler_path = os.path.join(out_dir, "model.keras"), os.path.join(out_dir, "scaler.pkl")
+        df, _ = train.load_training_frame("outdoor", refresh=False, cache_dir=self.dir)
+        forecast = predict(model_path, scaler_path, df.iloc[-12:], TARGET_COLS["outdoor"], 3)
+        self.assertEqual(len(forecast), 3)
+        self.assertFalse(forecast.isna().any().any())
+
+        config = {"model": os.path.join(self.dir, "current.keras"), "scaler": os.path.join(self.dir, "current.pkl")}
+        train.promote(out_dir, config)
+        with open(config["model"], "rb") as current, open(model_path, "rb") as trained:
+            self.assertEqual(current.read(), trained.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
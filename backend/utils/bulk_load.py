@@ -0,0 +1,188 @@
+"""
+Bulk import of the ml/data CSV exports into MySQL or a local Parquet cache.
+
+Every export file is read in chunks and deduplicated on its natural key
+(ts, plus room_id for SensorData) across all files of the same table. The
+exported ids are not kept: each site's export numbers its rows from 1, so
+ids collide between SensorData.csv and SensorData_G.csv. Rows get fresh
+auto-increment ids instead. Run from the backend directory:
+
+    python -m utils.bulk_load                      # LOAD DATA LOCAL INFILE
+    python -m utils.bulk_load --method insert      # batched multi-row INSERTs
+    python -m utils.bulk_load --target parquet     # ml/snapshots/<table>/ (utils.snapshot)
+
+Against MySQL, keys already in the table are skipped, so re-running the
+loader is safe. --truncate empties the tables (and their rollups) first for
+a clean rebuild. The rollups are brought up to date after loading.
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import mysql.connector
+import pandas as pd
+
+from swagger_server.database.connection import db_config, execute_query
+from swagger_server.database.rollups import refresh_rollups, reset_rollups
+from swagger_server.database.schema import table_exists
+
+DATA_DIR = "ml/data"
+CHUNK_SIZE = 50000
+
+# Table -> (columns loaded, natural key columns)
+BULK_TABLES = {
+    "SensorData": (["ts", "temperature", "humidity", "pm25", "pm10", "latitude", "longitude", "room_id"],
+                   ["ts", "room_id"]),
+    "project_aqicn": (["ts", "pm25", "pm10", "aqi_score"], ["ts"]),
+    "project_weather": (["ts", "temperature", "humidity", "wind_speed"], ["ts"]),
+}
+
+
+def export_files(table, data_dir=DATA_DIR):
+    """The export file of a table followed by its site variants (<table>_G.csv, ...)."""
+    return sorted(glob.glob(os.path.join(data_dir, f"{table}.csv"))) + \
+        sorted(glob.glob(os.path.join(data_dir, f"{table}_*.csv")))
+
+
+def _keys(df, key):
+    return list(zip(*(df[col].tolist() for col in key)))
+
+
+def iter_chunks(table, paths, chunksize=CHUNK_SIZE, seen=None):
+    """
+    Yield DataFrames of not-yet-seen rows of a table from its export files.
+    seen is a set of natural-key tuples; it is updated in place, so rows
+    repeated within a file, across files, or already loaded are dropped.
+    """
+    columns, key = BULK_TABLES[table]
+    seen = set() if seen is None else seen
+    for path in paths:
+        for chunk in pd.read_csv(path, usecols=columns, parse_dates=["ts"], chunksize=chunksize):
+            chunk = chunk[columns].drop_duplicates(key)
+            fresh = [k not in seen for k in _keys(chunk, key)]
+            chunk = chunk[fresh]
+            seen.update(_keys(chunk, key))
+            if not chunk.empty:
+                yield chunk
+
+
+def existing_keys(table):
+    """Natural keys already stored in a MySQL table."""
+    _, key = BULK_TABLES[table]
+    rows = execute_query(f"SELECT {', '.join(key)} FROM {table}")
+    return {tuple(pd.Timestamp(row[col]) if col == "ts" else row[col] for col in key) for row in rows}
+
+
+def _load_infile(cursor, table, chunk):
+    """Write one chunk to a temporary CSV and LOAD DATA it in a single statement."""
+    columns = list(chunk.columns)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            chunk.to_csv(f, index=False, header=False, na_rep="\\N", date_format="%Y-%m-%d %H:%M:%S")
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+            f"({', '.join(columns)})",
+            (path,),
+        )
+    finally:
+        os.remove(path)
+
+
+def _load_insert(cursor, table, chunk):
+    """executemany on a plain INSERT is sent as one multi-row statement."""
+    columns = list(chunk.columns)
+    rows = chunk.astype(object).where(chunk.notna(), None)
+    rows["ts"] = chunk["ts"].dt.to_pydatetime()
+    cursor.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+        list(rows.itertuples(index=False, name=None)),
+    )
+
+
+def load_mysql(table, paths, method="infile", chunksize=CHUNK_SIZE, truncate=False):
+    """
+    Load a table's export files into MySQL, one transaction per chunk.
+    Uses a dedicated connection because LOAD DATA LOCAL INFILE has to be
+    enabled when connecting. Returns the number of rows loaded.
+
+    truncate also empties the table's rollups, whose buckets and watermark
+    would otherwise keep the old rows and skip the reused ids. Either way
+    the rollups are refreshed once the rows are in.
+    """
+    rollups = table_exists("rollup_watermarks")
+    if truncate:
+        execute_query(f"TRUNCATE TABLE {table}", fetch=False)
+        if rollups:
+            reset_rollups(table)
+        seen = set()
+    else:
+        seen = existing_keys(table)
+
+    load = _load_infile if method == "infile" else _load_insert
+    connection = mysql.connector.connect(**db_config, allow_local_infile=method == "infile")
+    cursor = connection.cursor()
+    loaded = 0
+    try:
+        for chunk in iter_chunks(table, paths, chunksize, seen):
+            load(cursor, table, chunk)
+            connection.commit()
+            loaded += len(chunk)
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+    if rollups:
+        refresh_rollups()
+    return loaded
+
+
+def load_parquet(table, paths, snapshot_dir=None, chunksize=CHUNK_SIZE):
+    """
+    Rebuild a table's Parquet snapshot (see utils.snapshot) from its export
+    files, one part per chunk, compacted into a single ts-sorted part at the
+    end. Returns the number of rows written.
+    """
+    from utils.snapshot import _parts, append_snapshot, compact_snapshot
+
+    for path in _parts(table, snapshot_dir):
+        os.remove(path)
+    written = 0
+    for chunk in iter_chunks(table, paths, chunksize):
+        written += append_snapshot(table, chunk, snapshot_dir)
+    compact_snapshot(table, snapshot_dir)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--target", choices=["mysql", "parquet"], default="mysql")
+    parser.add_argument("--method", choices=["infile", "insert"], default="infile",
+                        help="how rows are sent to MySQL")
+    parser.add_argument("--snapshot-dir", default=None, help="defaults to $SNAPSHOT_DIR or ml/snapshots")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--truncate", action="store_true", help="empty the MySQL tables first")
+    parser.add_argument("tables", nargs="*", help=f"any of {', '.join(BULK_TABLES)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.tables) - set(BULK_TABLES)
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(sorted(unknown))}")
+
+    for table in args.tables or BULK_TABLES:
+        paths = export_files(table, args.data_dir)
+        started = time.perf_counter()
+        if args.target == "parquet":
+            count = load_parquet(table, paths, args.snapshot_dir, args.chunksize)
+        else:
+            count = load_mysql(table, paths, args.method, args.chunksize, args.truncate)
+        print(f"{table}: {count:,} rows from {len(paths)} file(s) in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
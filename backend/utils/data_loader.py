@@ -1,69 +1,216 @@
 import pandas as pd
 from swagger_server.database.connection import execute_query
+from swagger_server.database.rollups import refresh_rollups
+from swagger_server.database.schema import rollup_table
 from fastapi import HTTPException
-import numpy as np
-import joblib
-from tensorflow.keras.models import load_model
-
-def load_outdoor_data():
-    query = """
-        SELECT 
-            a.ts AS ts,
-            a.pm25 AS pm25,
-            a.pm10 AS pm10,
-            w.wind_speed AS wind_speed,
-            w.temperature AS temperature,
-            w.humidity AS humidity
-        FROM 
-            project_aqicn a
-        JOIN 
-            project_weather w ON DATE(a.ts) = DATE(w.ts)
-        WHERE 
-            a.pm25 IS NOT NULL AND a.pm10 IS NOT NULL AND
-            w.wind_speed IS NOT NULL AND
-            w.temperature IS NOT NULL AND
-            w.humidity IS NOT NULL
-        ORDER BY a.ts ASC
+from utils.snapshot import read_snapshot, refresh_snapshot, snapshot_exists
+
+# Source columns -> feature names, per table and per model family
+INDOOR_COLUMNS = {"temperature": "temp_in", "humidity": "hum_in", "pm25": "pm25_in", "pm10": "pm10_in"}
+AQICN_INDOOR_COLUMNS = {"pm25": "pm25_out", "pm10": "pm10_out"}
+WEATHER_INDOOR_COLUMNS = {"temperature": "temp_out", "humidity": "hum_out", "wind_speed": "wind_speed"}
+AQICN_COLUMNS = {"pm25": "pm25", "pm10": "pm10"}
+WEATHER_COLUMNS = {"wind_speed": "wind_speed", "temperature": "temperature", "humidity": "humidity"}
+
+# (base source, as-of joined sources) for each forecast mode
+FEATURE_SOURCES = {
+    "indoor": (
+        ("SensorData", INDOOR_COLUMNS),
+        [("project_aqicn", AQICN_INDOOR_COLUMNS), ("project_weather", WEATHER_INDOOR_COLUMNS)],
+    ),
+    "outdoor": (
+        ("project_aqicn", AQICN_COLUMNS),
+        [("project_weather", WEATHER_COLUMNS)],
+    ),
+}
+
+# How far back an as-of join may reach for a joined source's reading
+ASOF_TOLERANCE = pd.Timedelta(days=1)
+
+# Share of a forecast window's hours that must hold real base readings
+MIN_WINDOW_COVERAGE = 0.5
+
+
+def _filters(ts_column, start, end, room_id):
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(f"{ts_column} >= %s")
+        params.append(pd.Timestamp(start).to_pydatetime())
+    if end is not None:
+        conditions.append(f"{ts_column} < %s")
+        params.append(pd.Timestamp(end).to_pydatetime())
+    if room_id is not None:
+        conditions.append("room_id = %s")
+        params.append(room_id)
+    return conditions, params
+
+
+def _hourly_frame(rows, columns):
+    df = pd.DataFrame(rows, columns=["ts", *columns.values()])
+    df["ts"] = pd.to_datetime(df["ts"]).astype("datetime64[ns]")
+    return df.set_index("ts").astype(float)
+
+
+def fetch_hourly(table, columns, start=None, end=None, room_id=None):
     """
-    result = execute_query(query)
-    df = pd.DataFrame(result)
-    df['ts'] = pd.to_datetime(df['ts'])
-    df.set_index('ts', inplace=True)
+    Fetch one source's non-null readings in [start, end) and average them
+    into hourly buckets. Hours without readings are dropped.
+    """
+    select = ", ".join(f"{col} AS {alias}" for col, alias in columns.items())
+    conditions, params = _filters("ts", start, end, room_id)
+    conditions = [f"{col} IS NOT NULL" for col in columns] + conditions
 
-    # Add time-based features
-    df["hour"] = df.index.hour
-    df["day_of_week"] = df.index.dayofweek
+    query = f"""
+        SELECT ts, {select}
+        FROM {table}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY ts ASC
+    """
+    df = _hourly_frame(execute_query(query, tuple(params)), columns)
+    return df.resample("1h").mean().dropna()
 
-    df = df.resample("1h").mean().interpolate()
-    return df
 
-def load_indoor_data():
-    query = """
-        SELECT 
-            ts,
-            temperature AS temp_in,
-            humidity AS hum_in,
-            pm25 AS pm25_in,
-            pm10 AS pm10_in
-        FROM 
-            SensorData
-        WHERE
-            room_id = 1 AND
-            temperature IS NOT NULL AND
-            humidity IS NOT NULL AND
-            pm25 IS NOT NULL AND
-            pm10 IS NOT NULL
-        ORDER BY ts ASC
+def fetch_hourly_rollup(table, columns, start=None, end=None, room_id=None):
+    """
+    Same result as fetch_hourly, read from the pre-aggregated hourly rollup
+    table. Buckets of several rooms are combined weighted by reading count.
+    """
+    select = ", ".join(f"SUM({col}_sum) / SUM(n) AS {alias}" for col, alias in columns.items())
+    conditions, params = _filters("bucket", start, end, room_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    query = f"""
+        SELECT bucket AS ts, {select}
+        FROM {rollup_table(table, "hourly")}
+        {where}
+        GROUP BY bucket
+        ORDER BY bucket ASC
+    """
+    return _hourly_frame(execute_query(query, tuple(params)), columns)
+
+
+def fetch_hourly_snapshot(table, columns, start=None, end=None, room_id=None):
+    """Same result as fetch_hourly, read from the table's local Parquet snapshot."""
+    df = read_snapshot(table, list(columns), start, end, room_id).dropna().rename(columns=columns)
+    return _hourly_frame(df, columns).resample("1h").mean().dropna()
+
+
+def fetch_history(table, columns, start=None, end=None, room_id=None, refresh=True):
+    """
+    Hourly history for training and backtests. Reads the Parquet snapshot
+    when one has been built and falls back to the hourly rollup table
+    otherwise. Unless refresh is False, newer MySQL rows are first appended
+    to the snapshot or merged into the rollups; outside a running API
+    nothing else keeps the rollups current.
+    """
+    if snapshot_exists(table):
+        if refresh:
+            refresh_snapshot(table)
+        return fetch_hourly_snapshot(table, columns, start, end, room_id)
+    if refresh:
+        refresh_rollups()
+    return fetch_hourly_rollup(table, columns, start, end, room_id)
+
+
+def asof_join(base, *others, tolerance=ASOF_TOLERANCE):
+    """
+    Attach to each hourly bucket of base the most recent bucket at or before
+    it from every other source, looking back at most `tolerance`.
+    """
+    result = base
+    for other in others:
+        result = pd.merge_asof(result, other, left_index=True, right_index=True,
+                               direction="backward", tolerance=tolerance)
+    return result
+
+
+def fetch_hourly_by_room(table, columns, start=None, end=None, room_id=None):
+    """
+    fetch_hourly for every room (or one room) of a per-room table in a
+    single query, bucketed separately per room. Returns {room_id: DataFrame}.
+    """
+    select = ", ".join(f"{col} AS {alias}" for col, alias in columns.items())
+    conditions, params = _filters("ts", start, end, room_id)
+    conditions = [f"{col} IS NOT NULL" for col in columns] + conditions
+
+    query = f"""
+        SELECT ts, room_id, {select}
+        FROM {table}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY room_id ASC, ts ASC
+    """
+    df = pd.DataFrame(execute_query(query, tuple(params)), columns=["ts", "room_id", *columns.values()])
+    df["ts"] = pd.to_datetime(df["ts"]).astype("datetime64[ns]")
+    return {
+        int(room): group.drop(columns="room_id").set_index("ts").astype(float).resample("1h").mean().dropna()
+        for room, group in df.groupby("room_id")
+    }
+
+
+def _window_bounds(table, n_rows, room_id=None):
+    """[start, end) of the last n_rows hourly buckets up to the newest reading."""
+    conditions, params = _filters("ts", None, None, room_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    latest = execute_query(f"SELECT MAX(ts) AS ts FROM {table} {where}", tuple(params))[0]["ts"]
+    if latest is None:
+        raise HTTPException(status_code=400, detail="Not enough data to forecast.")
+
+    end = pd.Timestamp(latest).floor("1h") + pd.Timedelta(hours=1)
+    return end - pd.Timedelta(hours=n_rows), end
+
+
+def _room_window_bounds(table, n_rows, room_id=None):
+    """_window_bounds for every room (or one room) in one query, {room_id: (start, end)}."""
+    conditions, params = _filters("ts", None, None, room_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = execute_query(f"SELECT room_id, MAX(ts) AS ts FROM {table} {where} GROUP BY room_id", tuple(params))
+    bounds = {}
+    for row in rows:
+        end = pd.Timestamp(row["ts"]).floor("1h") + pd.Timedelta(hours=1)
+        bounds[int(row["room_id"])] = (end - pd.Timedelta(hours=n_rows), end)
+    return bounds
+
+
+def _fill_window(base, joined, start, end):
     """
-    result = execute_query(query)
-    df = pd.DataFrame(result)
-    df['ts'] = pd.to_datetime(df['ts'])
-    df.set_index('ts', inplace=True)
+    Regularise base to every hour of [start, end) and as-of join the other
+    sources onto it. Returns None unless the first and last hour and at
+    least MIN_WINDOW_COVERAGE of the hours hold real readings, or if any
+    feature is still missing.
+    """
+    hours = pd.date_range(start, end, freq="1h", inclusive="left", unit="ns")
+    base = base.reindex(hours)
+    observed = base.notna().all(axis=1)
+    if not (observed.iloc[0] and observed.iloc[-1]) or observed.mean() < MIN_WINDOW_COVERAGE:
+        return None
+    # Fill hours between readings so the window is a regular hourly sequence
+    base = base.interpolate(limit_area="inside")
+    df = asof_join(base, *joined)
+    if df.isna().any().any():
+        return None
+    df.index.name = "ts"
+    return df
+
+
+def _latest_window(mode, n_rows, room_id=None):
+    """Assemble the last n_rows hourly buckets of features for a forecast mode."""
+    (base_table, base_columns), others = FEATURE_SOURCES[mode]
+    start, end = _window_bounds(base_table, n_rows, room_id)
+    base = fetch_hourly(base_table, base_columns, start, end, room_id)
+    joined = [fetch_hourly(table, columns, start - ASOF_TOLERANCE, end) for table, columns in others]
+    df = _fill_window(base, joined, start, end)
+    if df is None:
+        raise HTTPException(status_code=400, detail="Not enough data to forecast.")
+    return df
+
+
+def load_indoor_data(start=None, end=None, refresh=True):
+    df = fetch_history("SensorData", INDOOR_COLUMNS, start, end, room_id=1, refresh=refresh)
     df = df.resample('1h').mean().interpolate()
     return df
 
 
-def load_outdoor_data():
+def load_outdoor_data(start=None, end=None, refresh=True):
     """
     Load outdoor environment data.
 
@@ -77,192 +224,86 @@ def load_outdoor_data():
     - temperature (float): Temperature
     - humidity (float): Humidity
 
-    The data is resampled to an hourly frequency and any gaps are filled
-    using linear interpolation.
+    AQICN and weather hourly buckets are read separately (from the local
+    snapshot if one exists, see fetch_history) within [start, end) and
+    aligned with an as-of join, so each hour takes the latest weather at or
+    before it. The data is resampled to an hourly frequency and any gaps are
+    filled using linear interpolation.
 
     Returns
     -------
     pd.DataFrame
     """
-
-    query = """
-        SELECT 
-            a.ts AS ts,
-            a.pm25 AS pm25,
-            a.pm10 AS pm10,
-            w.wind_speed AS wind_speed,
-            w.temperature AS temperature,
-            w.humidity AS humidity
-        FROM 
-            project_aqicn a
-        JOIN 
-            project_weather w ON DATE(a.ts) = DATE(w.ts)
-        WHERE 
-            a.pm25 IS NOT NULL AND a.pm10 IS NOT NULL AND
-            w.wind_speed IS NOT NULL AND w.temperature IS NOT NULL AND w.humidity IS NOT NULL
-        ORDER BY a.ts ASC
-    """
-    result = execute_query(query)
-    df = pd.DataFrame(result)
-
-    df['ts'] = pd.to_datetime(df['ts'])
-    df.set_index('ts', inplace=True)
+    df = asof_join(
+        fetch_history("project_aqicn", AQICN_COLUMNS, start, end, refresh=refresh),
+        fetch_history("project_weather", WEATHER_COLUMNS, start, end, refresh=refresh),
+    ).dropna()
     # Resample to hourly frequency and interpolate
     df = df.resample("1h").mean().interpolate()
 
     return df
 
 
-def load_latest_lagged_features(n_lags=6):
-    query = f"""
-        SELECT 
-            s.ts AS ts,
-            s.temperature AS temp_in,
-            s.humidity AS hum_in,
-            s.pm25 AS pm25_in,
-            s.pm10 AS pm10_in,
-            a.pm25 AS pm25_out,
-            a.pm10 AS pm10_out,
-            w.temperature AS temp_out,
-            w.humidity AS hum_out,
-            w.wind_speed AS wind_speed
-        FROM SensorData s
-        LEFT JOIN project_aqicn a ON DATE(s.ts) = DATE(a.ts)
-        LEFT JOIN project_weather w ON DATE(s.ts) = DATE(w.ts)
-        ORDER BY s.ts DESC
-        LIMIT {n_lags}
+def load_feature_history(mode, start=None, end=None, room_id=None, refresh=True):
     """
-    df = pd.DataFrame(execute_query(query))
-    print("QUERY RESULT:")
-    print(df.head())
-    print(df.columns)
-
-    # Safety check
-    if df.empty or "ts" not in df.columns:
-        raise HTTPException(status_code=400, detail="No valid data returned from database.")
-
-    # Fix: ts might be a string or datetime, ensure sorted ASC
-    df["ts"] = pd.to_datetime(df["ts"])
-    df = df.sort_values("ts").set_index("ts")
+    Hourly feature history of a forecast mode in [start, end) for training:
+    the mode's base source with the other sources as-of joined, every hour
+    of the range present, gaps inside it interpolated, plus the hour and
+    day_of_week features. Sources are read through fetch_history.
+    """
+    (base_table, base_columns), others = FEATURE_SOURCES[mode]
+    base = fetch_history(base_table, base_columns, start, end, room_id, refresh)
+    joined_start = None if start is None else pd.Timestamp(start) - ASOF_TOLERANCE
+    joined = [fetch_history(table, columns, joined_start, end, refresh=refresh) for table, columns in others]
+    df = asof_join(base, *joined).resample("1h").mean().interpolate(limit_area="inside")
+    df["hour"] = df.index.hour
+    df["day_of_week"] = df.index.dayofweek
+    return df
 
-    if len(df) < n_lags:
-        raise HTTPException(status_code=400, detail="Not enough data to create lagged input.")
 
-    return df
+def load_latest_lagged_features(n_lags=6):
+    return _latest_window("indoor", n_lags)
 
 
 def load_latest_outdoor_lagged(n_lags=6):
-    query = f"""
-        SELECT 
-            a.ts AS ts,
-            a.pm25 AS pm25,
-            a.pm10 AS pm10,
-            w.wind_speed AS wind_speed,
-            w.temperature AS temperature,
-            w.humidity AS humidity
-        FROM 
-            project_aqicn a
-        JOIN 
-            project_weather w ON DATE(a.ts) = DATE(w.ts)
-        WHERE 
-            a.pm25 IS NOT NULL AND a.pm10 IS NOT NULL AND
-            w.wind_speed IS NOT NULL AND
-            w.temperature IS NOT NULL AND
-            w.humidity IS NOT NULL
-        ORDER BY a.ts DESC
-        LIMIT {n_lags}
-    """
-    df = pd.DataFrame(execute_query(query))
-    if df.empty or "ts" not in df.columns:
-        raise HTTPException(status_code=400, detail="No valid outdoor data returned from database.")
-
-    df["ts"] = pd.to_datetime(df["ts"])
-    df = df.sort_values("ts").set_index("ts")
+    df = _latest_window("outdoor", n_lags)
     df["hour"] = df.index.hour
     df["day_of_week"] = df.index.dayofweek
-
-    if len(df) < n_lags:
-        raise HTTPException(status_code=400, detail="Not enough data to create lagged input.")
-
     return df
 
 
-def load_latest_features(n_rows: int = 12, mode: str = "indoor"):
-    if mode == "indoor":
-        query = f"""
-            SELECT 
-                s.ts AS ts,
-                s.temperature AS temp_in,
-                s.humidity AS hum_in,
-                s.pm25 AS pm25_in,
-                s.pm10 AS pm10_in,
-                a.pm25 AS pm25_out,
-                a.pm10 AS pm10_out,
-                w.temperature AS temp_out,
-                w.humidity AS hum_out,
-                w.wind_speed AS wind_speed
-            FROM SensorData s
-            JOIN project_aqicn a ON DATE(s.ts) = DATE(a.ts)
-            JOIN project_weather w ON DATE(s.ts) = DATE(w.ts)
-            ORDER BY s.ts DESC
-            LIMIT {n_rows}
-        """
-    else:
-        query = f"""
-            SELECT 
-                a.ts AS ts,
-                a.pm25 AS pm25,
-                a.pm10 AS pm10,
-                w.wind_speed AS wind_speed,
-                w.temperature AS temperature,
-                w.humidity AS humidity
-            FROM project_aqicn a
-            JOIN project_weather w ON DATE(a.ts) = DATE(w.ts)
-            ORDER BY a.ts DESC
-            LIMIT {n_rows}
-        """
-
-    df = pd.DataFrame(execute_query(query))
-    if df.empty or len(df) < n_rows:
-        raise HTTPException(status_code=400, detail="Not enough data to forecast.")
-    df['ts'] = pd.to_datetime(df['ts'])
-    df = df.sort_values('ts').set_index('ts')
+def load_latest_features(n_rows: int = 12, mode: str = "indoor", room_id=None):
+    df = _latest_window(mode, n_rows, room_id)
     df['hour'] = df.index.hour
     df['day_of_week'] = df.index.dayofweek
     return df
 
 
-def predict(model_path, scaler_path, df, target_cols, forecast_hours):
-    scaler = joblib.load(scaler_path)
-    model = load_model(model_path)
-
-    feature_cols = scaler.feature_names_in_.tolist()
-    df = df[feature_cols]
-    df_scaled = pd.DataFrame(scaler.transform(df), columns=feature_cols, index=df.index)
-
-    last_seq = df_scaled[-12:].copy()
-    forecast_scaled = []
-
-    for _ in range(forecast_hours):
-        input_seq = np.expand_dims(last_seq.values, axis=0)
-        pred = model.predict(input_seq)[0]
-
-        non_target_cols = [col for col in feature_cols if col not in target_cols]
-        padded = np.concatenate([pred, last_seq.iloc[-1][non_target_cols].values])
-        forecast_scaled.append(padded[:len(target_cols)])
-
-        new_df = pd.DataFrame([padded], columns=feature_cols)
-        last_seq = pd.concat([last_seq, new_df], ignore_index=True).iloc[1:]
-
-    forecast_scaled = np.array(forecast_scaled)
-    inverse = scaler.inverse_transform(
-        np.hstack([
-            forecast_scaled,
-            np.zeros((forecast_scaled.shape[0], len(feature_cols) - len(target_cols)))
-        ])
-    )[:, :len(target_cols)]
+def load_latest_room_features(n_rows: int = 12, room_id=None):
+    """
+    Latest indoor feature window per room, {room_id: DataFrame}.
 
-    forecast_df = pd.DataFrame(inverse, columns=target_cols)
-    forecast_df['time'] = pd.date_range(start=df.index[-1] + pd.Timedelta(hours=1), periods=forecast_hours, freq="H")
-    forecast_df.set_index('time', inplace=True)
-    return forecast_df
\ No newline at end of file
+    Each room's window ends at that room's own newest reading, so a room
+    that stopped reporting is forecast from where its data ends. Rooms
+    whose windows end in the same hour (normally all of them) share one
+    SensorData query and one read of the outdoor sources. Rooms without
+    enough readings in their window are left out.
+    """
+    (base_table, base_columns), others = FEATURE_SOURCES["indoor"]
+    rooms_by_bounds = {}
+    for room, bounds in _room_window_bounds(base_table, n_rows, room_id).items():
+        rooms_by_bounds.setdefault(bounds, []).append(room)
+
+    windows = {}
+    for (start, end), rooms in rooms_by_bounds.items():
+        bases = fetch_hourly_by_room(base_table, base_columns, start, end, room_id)
+        joined = [fetch_hourly(table, columns, start - ASOF_TOLERANCE, end) for table, columns in others]
+        for room in rooms:
+            df = _fill_window(bases[room], joined, start, end) if room in bases else None
+            if df is not None:
+                df['hour'] = df.index.hour
+                df['day_of_week'] = df.index.dayofweek
+                windows[room] = df
+    if not windows:
+        raise HTTPException(status_code=400, detail="Not enough data to forecast.")
+    return windows
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: pick n_out indices of (x, y) that keep
+    the visual shape of the series. x must be sorted ascending. The first
+    and last points are always kept; each bucket in between keeps the point
+    forming the largest triangle with the previously kept point and the
+    mean of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points 1..n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Mean of every bucket at once; the "next" of the last bucket is the last point
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    counts = ends - starts
+    next_x = np.append((sums_x / counts)[1:], x[n - 1])
+    next_y = np.append((sums_y / counts)[1:], y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_records(records, metrics, points, ts_field="ts"):
+    """
+    Reduce a list of readings (models or dicts) to at most `points` rows,
+    sorted by timestamp. Each metric gets an equal share of the budget and
+    the rows LTTB keeps for any metric are returned whole, so every chart
+    line keeps its peaks and troughs. LTTB needs at least 3 points per
+    metric, so a budget smaller than 3 per metric covers only the first
+    points // 3 metrics.
+    """
+    if not records or points is None:
+        return records
+
+    def field(record, name):
+        return record[name] if isinstance(record, dict) else getattr(record, name)
+
+    x = np.array([field(r, ts_field).timestamp() for r in records], dtype=np.float64)
+    order = np.argsort(x, kind="stable")
+    if len(records) <= points:
+        return [records[i] for i in order]
+
+    x = x[order]
+    # The union of the per-metric selections must stay within points
+    metrics = metrics[:max(1, min(len(metrics), points // 3))]
+    per_metric = points // len(metrics)
+    keep = np.zeros(len(records), dtype=bool)
+    for metric in metrics:
+        y = np.array([field(records[i], metric) for i in order], dtype=np.float64)
+        keep[lttb_indices(x, y, per_metric)] = True
+    return [records[i] for i in order[keep]]
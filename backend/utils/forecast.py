@@ -0,0 +1,209 @@
+"""
+Forecasting with the LSTM models: batched autoregressive rollouts and the
+per-input forecast cache. TensorFlow is imported on first use, so processes
+that never forecast (data endpoints, tests, tooling) don't load it, and
+with FORECAST_BACKEND=tflite it is not needed at all.
+"""
+import hashlib
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils.model_registry import TFLiteModel, get_model
+
+# Compiled inference functions, one per loaded model
+_inference_fns = weakref.WeakKeyDictionary()
+# (feature columns, scale, offset) vectors, one per loaded scaler
+_scalings = weakref.WeakKeyDictionary()
+
+# Longest horizon served by the API; shorter requests slice this rollout
+MAX_FORECAST_HOURS = 24
+
+# Latest forecast per (mode, model_type[, room_id]), replaced when newer input lands
+_forecast_cache = {}
+_forecast_cache_lock = threading.Lock()
+
+
+def _inference_fn(model):
+    """Return a graph-compiled forward pass for the model, tracing it once."""
+    if isinstance(model, TFLiteModel):
+        return model
+    fn = _inference_fns.get(model)
+    if fn is None:
+        import tensorflow as tf
+
+        spec = tf.TensorSpec([None, *model.input_shape[1:]], tf.float32)
+
+        def forward(x):
+            return model(x, training=False)
+
+        fn = tf.function(forward, input_signature=[spec])
+        _inference_fns[model] = fn
+    return fn
+
+
+def scaling_vectors(scaler):
+    """
+    Reduce a fitted MinMaxScaler or StandardScaler to per-feature vectors
+    with scaler.transform(X) == X * scale + offset, computed once per
+    loaded scaler. Returns (feature columns, scale, offset).
+    """
+    vectors = _scalings.get(scaler)
+    if vectors is not None:
+        return vectors
+
+    n_features = len(scaler.feature_names_in_)
+    if hasattr(scaler, "data_range_"):
+        if getattr(scaler, "clip", False):
+            raise TypeError("MinMaxScaler(clip=True) is not affine; refit without clip")
+        scale, offset = scaler.scale_, scaler.min_
+    elif hasattr(scaler, "with_mean"):
+        # mean_ is set even with with_mean=False, so go by the flags
+        scale = 1 / scaler.scale_ if scaler.with_std else np.ones(n_features)
+        offset = -scaler.mean_ * scale if scaler.with_mean else np.zeros(n_features)
+    else:
+        raise TypeError(f"Unsupported scaler {type(scaler).__name__}; expected MinMaxScaler or StandardScaler")
+
+    vectors = (scaler.feature_names_in_.tolist(), np.asarray(scale, dtype=np.float64),
+               np.asarray(offset, dtype=np.float64))
+    _scalings[scaler] = vectors
+    return vectors
+
+
+def _window_values(df, feature_cols, window):
+    """The last `window` rows of df's feature columns as a float array, without pandas indexing."""
+    values = df.to_numpy(dtype=np.float64)[-window:]
+    cols = df.columns.tolist()
+    if cols == feature_cols:
+        return values
+    return values[:, [cols.index(col) for col in feature_cols]]
+
+
+def rollout(model, windows, steps, target_idx):
+    """
+    Autoregressively roll a batch of scaled input windows forward.
+
+    Parameters
+    ----------
+    model : keras.Model or TFLiteModel
+        Maps (batch, window, n_features) to (batch, len(target_idx)).
+    windows : np.ndarray
+        Scaled inputs of shape (batch, window, n_features).
+    steps : int
+        Number of hours to forecast.
+    target_idx : list[int]
+        Feature positions the model predicts. All other features are
+        carried forward from the last input row.
+
+    Returns
+    -------
+    np.ndarray
+        Scaled forecast rows of shape (batch, steps, n_features).
+    """
+    batch, window, n_features = windows.shape
+    call = _inference_fn(model)
+    non_target_idx = [i for i in range(n_features) if i not in target_idx]
+
+    # Preallocated rolling buffer: step i reads buf[:, i:i + window] and
+    # writes its prediction into row i + window. Carried-forward features
+    # never change, so they are filled for every step up front.
+    buf = np.empty((batch, window + steps, n_features), dtype=np.float32)
+    buf[:, :window] = windows
+    buf[:, window:, non_target_idx] = windows[:, -1:, non_target_idx]
+
+    for i in range(steps):
+        pred = call(buf[:, i:i + window])
+        buf[:, i + window, target_idx] = np.asarray(pred)
+
+    return buf[:, window:]
+
+
+def predict_many(model_path, scaler_path, windows, target_cols, forecast_hours, backend=None):
+    """
+    Forecast several input windows with one batched rollout.
+    windows maps any key (e.g. a room id) to a feature DataFrame; the
+    result maps the same keys to forecast DataFrames. backend picks the
+    model runtime, "keras" or "tflite" (FORECAST_BACKEND by default).
+    """
+    model, scaler = get_model(model_path, scaler_path, backend)
+
+    feature_cols, scale, offset = scaling_vectors(scaler)
+    target_idx = [feature_cols.index(col) for col in target_cols]
+    window = model.input_shape[1]
+
+    keys = list(windows)
+    raw = np.stack([_window_values(windows[key], feature_cols, window) for key in keys])
+    forecast_scaled = rollout(model, raw * scale + offset, forecast_hours, target_idx)
+    # Scaling is per column, so only the target columns need inverting
+    inverse = (forecast_scaled[:, :, target_idx] - offset[target_idx]) / scale[target_idx]
+
+    forecasts = {}
+    for key, values in zip(keys, inverse):
+        forecast_df = pd.DataFrame(values, columns=target_cols)
+        forecast_df['time'] = pd.date_range(start=windows[key].index[-1] + pd.Timedelta(hours=1),
+                                            periods=forecast_hours, freq="1h")
+        forecast_df.set_index('time', inplace=True)
+        forecasts[key] = forecast_df
+    return forecasts
+
+
+def predict(model_path, scaler_path, df, target_cols, forecast_hours, backend=None):
+    return predict_many(model_path, scaler_path, {None: df}, target_cols, forecast_hours, backend)[None]
+
+
+def window_version(df):
+    """
+    Digest of an input window's index and values. The newest hour alone
+    doesn't identify the input: a later reading in the same hour or a new
+    outdoor row changes the hourly values without adding a row.
+    """
+    return hashlib.sha1(pd.util.hash_pandas_object(df).values.tobytes()).hexdigest()
+
+
+def cached_predict_many(windows, model_path, scaler_path, target_cols, forecast_hours, backend=None):
+    """
+    Forecast with predict_many(), reusing the last rollout for the same input.
+
+    windows maps cache keys (e.g. ("indoor", "no_ac", room_id)) to input
+    frames. Entries remember the window_version() of the input and the model
+    they were computed from, so a new reading or a reloaded model
+    invalidates them automatically; every stale window is forecast together in one batch.
+    Every rollout runs to MAX_FORECAST_HOURS so 6/12/24 hour requests share it.
+    """
+    model, _ = get_model(model_path, scaler_path, backend)
+
+    forecasts, stale = {}, {}
+    with _forecast_cache_lock:
+        for cache_key, df in windows.items():
+            entry = _forecast_cache.get(cache_key)
+            version = window_version(df)
+            if (entry is not None and entry["version"] == version and entry["model"] is model
+                    and len(entry["forecast"]) >= forecast_hours):
+                forecasts[cache_key] = entry["forecast"].iloc[:forecast_hours]
+            else:
+                stale[cache_key] = (df, version)
+
+    if stale:
+        horizon = max(forecast_hours, MAX_FORECAST_HOURS)
+        fresh = predict_many(model_path, scaler_path, {key: df for key, (df, _) in stale.items()},
+                             target_cols, horizon, backend)
+        with _forecast_cache_lock:
+            for cache_key, forecast_df in fresh.items():
+                _forecast_cache[cache_key] = {"version": stale[cache_key][1], "model": model,
+                                              "forecast": forecast_df}
+        for cache_key, forecast_df in fresh.items():
+            forecasts[cache_key] = forecast_df.iloc[:forecast_hours]
+    return forecasts
+
+
+def cached_predict(cache_key, model_path, scaler_path, df, target_cols, forecast_hours, backend=None):
+    """cached_predict_many() for a single input window."""
+    return cached_predict_many({cache_key: df}, model_path, scaler_path,
+                               target_cols, forecast_hours, backend)[cache_key]
+
+
+def clear_forecast_cache():
+    with _forecast_cache_lock:
+        _forecast_cache.clear()
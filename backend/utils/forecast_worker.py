@@ -0,0 +1,199 @@
+"""
+Forecast execution off the API event loop and threadpool.
+
+ForecastService queues forecast requests and runs them in a pool of
+worker processes (FORECAST_WORKERS, or one inference thread when 0):
+
+- Coalescing: concurrent requests for the same cache key and input window
+  (same window_version) share one computation.
+- Micro-batching: windows for the same model arriving within
+  FORECAST_BATCH_WINDOW_MS are sent to a worker together and run through
+  the model as one batch by cached_predict_many().
+
+Each worker keeps its own model registry and forecast cache, so TensorFlow
+is only ever loaded in the workers.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.forecast import MAX_FORECAST_HOURS, cached_predict_many, window_version
+from utils.model_registry import preload_models
+
+logger = logging.getLogger(__name__)
+
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", "1"))
+FORECAST_BATCH_WINDOW = float(os.getenv("FORECAST_BATCH_WINDOW_MS", "5")) / 1000
+FORECAST_MAX_BATCH = int(os.getenv("FORECAST_MAX_BATCH", "64"))
+
+
+def _init_worker(model_config):
+    if model_config:
+        preload_models(model_config)
+
+
+def _noop():
+    return None
+
+
+def run_batch(model_path, scaler_path, windows, target_cols, forecast_hours):
+    """Worker entry point: forecast a micro-batch of {cache key: window}."""
+    return cached_predict_many(windows, model_path, scaler_path, target_cols, forecast_hours)
+
+
+class ForecastService:
+
+    def __init__(self, workers=FORECAST_WORKERS, batch_window=FORECAST_BATCH_WINDOW,
+                 max_batch=FORECAST_MAX_BATCH):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._executor = None
+        self._model_config = None
+        self._pending = {}
+        self._timers = {}
+        self._inflight = {}
+        self.stats = {"requests": 0, "coalesced": 0, "batches": 0, "batched_windows": 0, "restarts": 0}
+
+    def start(self, model_config=None):
+        """Create the worker pool; with model_config, load every model in each worker now."""
+        if self._executor is not None:
+            return
+        if model_config:
+            self._model_config = model_config
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        model_config = self._model_config
+        if self.workers == 0:
+            return ThreadPoolExecutor(1, thread_name_prefix="forecast",
+                                      initializer=_init_worker, initargs=(model_config,))
+        # spawn: workers must not inherit the API's threads or sockets
+        executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(model_config,),
+        )
+        if model_config:
+            for _ in range(self.workers):
+                executor.submit(_noop)
+        return executor
+
+    def _restart(self, broken):
+        """
+        Replace a pool broken by a dead worker (e.g. killed for memory);
+        ProcessPoolExecutor rejects all work once any worker has died.
+        """
+        if self._executor is not broken:
+            return
+        logger.warning("Forecast worker died; starting a new worker pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+        self.stats["restarts"] += 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def forecast_many(self, windows, model_path, scaler_path, target_cols, forecast_hours):
+        """
+        Same contract as cached_predict_many(): {cache key: input frame} ->
+        {cache key: forecast frame of forecast_hours rows}.
+        """
+        loop = asyncio.get_running_loop()
+        self.start()
+        group = (model_path, scaler_path, tuple(target_cols))
+        futures = {}
+        for cache_key, df in windows.items():
+            self.stats["requests"] += 1
+            ident = (group, cache_key, window_version(df))
+            future = self._inflight.get(ident)
+            if future is not None:
+                self.stats["coalesced"] += 1
+            else:
+                future = self._inflight[ident] = loop.create_future()
+                self._enqueue(loop, group, ident, cache_key, df, forecast_hours, future)
+            futures[cache_key] = future
+
+        # shield: a client disconnecting must not cancel a forecast others share
+        results = {}
+        for cache_key, future in futures.items():
+            results[cache_key] = (await asyncio.shield(future)).iloc[:forecast_hours]
+        return results
+
+    def _enqueue(self, loop, group, ident, cache_key, df, forecast_hours, future):
+        batch = self._pending.get(group, [])
+        if any(item[1] == cache_key for item in batch):
+            # Same key with a different window: it can't share this batch's dict
+            self._dispatch(loop, group)
+            batch = []
+        batch.append((ident, cache_key, df, forecast_hours, future))
+        self._pending[group] = batch
+        if len(batch) >= self.max_batch:
+            self._dispatch(loop, group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.batch_window, self._dispatch, loop, group)
+
+    def _dispatch(self, loop, group):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group, [])
+        if not batch:
+            return
+
+        model_path, scaler_path, target_cols = group
+        windows = {cache_key: df for _, cache_key, df, _, _ in batch}
+        horizon = max(MAX_FORECAST_HOURS, *(hours for _, _, _, hours, _ in batch))
+        self.stats["batches"] += 1
+        self.stats["batched_windows"] += len(batch)
+        args = (run_batch, model_path, scaler_path, windows, list(target_cols), horizon)
+        executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError("Forecast service is shut down")
+            try:
+                job = loop.run_in_executor(executor, *args)
+            except BrokenProcessPool:
+                # The pool broke since the last batch finished; retry once on a fresh one
+                self._restart(executor)
+                executor = self._executor
+                job = loop.run_in_executor(executor, *args)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        def finish(job):
+            if job.cancelled():
+                self._fail(batch, RuntimeError("Forecast worker pool shut down before the forecast ran"))
+                return
+            error = job.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._restart(executor)
+            if error is not None:
+                self._fail(batch, error)
+                return
+            result = job.result()
+            for ident, cache_key, _, _, future in batch:
+                self._inflight.pop(ident, None)
+                if not future.done():
+                    future.set_result(result[cache_key])
+
+        job.add_done_callback(finish)
+
+    def _fail(self, batch, error):
+        """Fail every waiter of a batch so no request is left hanging."""
+        for ident, _, _, _, future in batch:
+            self._inflight.pop(ident, None)
+            if not future.done():
+                future.set_exception(error)
+
+    def get_stats(self):
+        return {**self.stats, "workers": self.workers, "pending": sum(map(len, self._pending.values())),
+                "inflight": len(self._inflight)}
+
+
+forecast_service = ForecastService()
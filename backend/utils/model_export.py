@@ -0,0 +1,75 @@
+"""
+Export the forecast models in MODEL_CONFIG to TFLite for FORECAST_BACKEND=tflite.
+
+Each .keras model is written as a .tflite file next to it (see
+model_registry.tflite_path); its scaler .pkl is shared by both backends
+and used as is. The LSTM layers are unrolled over the fixed 12-hour window
+before conversion, which lowers them to plain builtin ops that LiteRT runs
+with any batch size and without TensorFlow installed. Run from the backend
+directory after retraining:
+
+    python -m utils.model_export
+
+Each export is checked against the Keras model on a random batch, and the
+largest difference is printed.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from utils.model_registry import TFLiteModel, iter_model_configs, tflite_path
+
+RECURRENT_LAYERS = ("LSTM", "GRU", "SimpleRNN")
+
+
+def _unrolled(model):
+    """A copy of a Sequential/Functional model with its recurrent layers unrolled."""
+    config = model.get_config()
+    for layer in config["layers"]:
+        if layer["class_name"] in RECURRENT_LAYERS:
+            layer["config"]["unroll"] = True
+    clone = model.__class__.from_config(config)
+    clone.set_weights(model.get_weights())
+    return clone
+
+
+def export_tflite(model_path, out_path=None):
+    """Convert a .keras model to TFLite. Returns the path written."""
+    import tensorflow as tf
+
+    out_path = out_path or tflite_path(model_path)
+    model = tf.keras.models.load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(_unrolled(model))
+    data = converter.convert()
+    # Write then rename so the registry never loads a half-written file
+    with open(out_path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(out_path + ".tmp", out_path)
+    return out_path
+
+
+def max_difference(model_path, out_path=None, batch=8, seed=0):
+    """Largest absolute difference between the Keras model and its export on random scaled inputs."""
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path)
+    x = np.random.default_rng(seed).uniform(0, 1, (batch, *model.input_shape[1:])).astype(np.float32)
+    exported = TFLiteModel(out_path or tflite_path(model_path))
+    return float(np.abs(exported(x) - model(x, training=False).numpy()).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.parse_args()
+
+    from swagger_server.app import MODEL_CONFIG
+
+    for config in iter_model_configs(MODEL_CONFIG):
+        path = export_tflite(config["model"])
+        print(f"{path}: {os.path.getsize(path) / 1024:.0f} KiB, "
+              f"max |keras - tflite| = {max_difference(config['model'], path):.2e}")
+
+
+if __name__ == "__main__":
+    main()
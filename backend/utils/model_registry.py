@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# "keras" runs the .keras models through TensorFlow; "tflite" runs the .tflite
+# exports next to them (python -m utils.model_export) through LiteRT
+FORECAST_BACKEND = os.getenv("FORECAST_BACKEND", "keras")
+MODEL_BACKENDS = ("keras", "tflite")
+
+# Loaded (model, scaler) pairs keyed by (model_path, scaler_path, backend)
+_registry = {}
+_registry_lock = threading.Lock()
+_entry_locks = {}
+
+
+def tflite_path(model_path):
+    """Where utils.model_export writes the TFLite export of a .keras model."""
+    return os.path.splitext(model_path)[0] + ".tflite"
+
+
+def _mtimes(model_path, scaler_path):
+    return os.path.getmtime(model_path), os.path.getmtime(scaler_path)
+
+
+def _interpreter_class():
+    """LiteRT's interpreter, from the standalone runtime when installed so TensorFlow isn't needed."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+    return Interpreter
+
+
+class TFLiteModel:
+    """
+    A TFLite export behind the part of the Keras model interface the
+    forecaster uses: input_shape, and calling it on a float32 batch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._interpreter = _interpreter_class()(model_path=path)
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self.input_shape = (None, *self._input["shape_signature"][1:].tolist())
+        self._batch = None
+        # One interpreter per model; its tensors can't be shared between calls
+        self._lock = threading.Lock()
+
+    def __call__(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        with self._lock:
+            if x.shape[0] != self._batch:
+                self._interpreter.resize_tensor_input(self._input["index"], x.shape)
+                self._interpreter.allocate_tensors()
+                self._batch = x.shape[0]
+            self._interpreter.set_tensor(self._input["index"], x)
+            self._interpreter.invoke()
+            return self._interpreter.get_tensor(self._output["index"])
+
+
+def _artifact_path(model_path, backend):
+    """The file `backend` loads for a model."""
+    if backend != "tflite":
+        return model_path
+    path = tflite_path(model_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; export it with python -m utils.model_export")
+    return path
+
+
+def _load_model(model_path, backend):
+    if backend == "tflite":
+        path = tflite_path(model_path)
+        if os.path.getmtime(path) < os.path.getmtime(model_path):
+            logger.warning("%s is older than %s; re-export it with python -m utils.model_export",
+                           path, model_path)
+        return TFLiteModel(path)
+
+    # Deferred so importing the registry doesn't load TensorFlow
+    from tensorflow.keras.models import load_model
+
+    return load_model(model_path)
+
+
+def _entry_lock(key):
+    """Return the lock guarding a single registry entry."""
+    with _registry_lock:
+        lock = _entry_locks.get(key)
+        if lock is None:
+            lock = _entry_locks[key] = threading.Lock()
+        return lock
+
+
+def get_model(model_path, scaler_path, backend=None):
+    """
+    Return the (model, scaler) pair for the given artifact paths, with the
+    model run by `backend` (FORECAST_BACKEND by default).
+
+    The pair is loaded once per process and shared across worker threads.
+    If either file's mtime changes on disk, the pair is reloaded on the
+    next call so retrained artifacts are picked up without a restart.
+    """
+    backend = backend or FORECAST_BACKEND
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown forecast backend {backend!r}; expected one of {MODEL_BACKENDS}")
+    key = (model_path, scaler_path, backend)
+    mtimes = _mtimes(_artifact_path(model_path, backend), scaler_path)
+
+    entry = _registry.get(key)
+    if entry is not None and entry["mtimes"] == mtimes:
+        return entry["model"], entry["scaler"]
+
+    with _entry_lock(key):
+        # Another thread may have finished loading while we waited
+        entry = _registry.get(key)
+        if entry is not None and entry["mtimes"] == mtimes:
+            return entry["model"], entry["scaler"]
+
+        scaler = joblib.load(scaler_path)
+        model = _load_model(model_path, backend)
+        _registry[key] = {"model": model, "scaler": scaler, "mtimes": mtimes}
+        return model, scaler
+
+
+def iter_model_configs(model_config):
+    """Yield every {"model", "scaler"} entry found in a nested MODEL_CONFIG."""
+    if "model" in model_config and "scaler" in model_config:
+        yield model_config
+        return
+    for value in model_config.values():
+        if isinstance(value, dict):
+            yield from iter_model_configs(value)
+
+
+def preload_models(model_config, backend=None):
+    """Eagerly load every model/scaler pair referenced by MODEL_CONFIG."""
+    for config in iter_model_configs(model_config):
+        get_model(config["model"], config["scaler"], backend)
+
+
+def clear_models():
+    """Drop all loaded models, forcing a reload on next use."""
+    with _registry_lock:
+        _registry.clear()
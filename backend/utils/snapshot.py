@@ -0,0 +1,150 @@
+"""
+Local Parquet snapshots of the sensor, AQICN and weather tables.
+
+Each table is a directory of Parquet parts under SNAPSHOT_DIR, read as one
+dataset with the ts/room_id filters pushed down to row-group statistics
+and the files memory-mapped. refresh_snapshot() appends only the rows at
+or after the newest ts already cached, so training and backtests read
+history locally instead of re-querying MySQL. Build or update every
+snapshot from the backend directory with:
+
+    python -m utils.snapshot
+"""
+import glob
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from swagger_server.database.connection import execute_query
+from utils.bulk_load import BULK_TABLES
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "ml/snapshots")
+# Rows fetched from MySQL (and written as one part) per refresh page
+SNAPSHOT_PAGE_SIZE = 100000
+# Rows per Parquet row group; smaller groups prune time ranges more finely
+ROW_GROUP_SIZE = 65536
+# Parts are merged into one ts-sorted file once a table has this many
+SNAPSHOT_MAX_PARTS = 32
+
+
+def _table_dir(table, snapshot_dir=None):
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, table)
+
+
+def _parts(table, snapshot_dir=None):
+    return sorted(glob.glob(os.path.join(_table_dir(table, snapshot_dir), "part-*.parquet")))
+
+
+def snapshot_exists(table, snapshot_dir=None):
+    return bool(_parts(table, snapshot_dir))
+
+
+def _normalise(table, df):
+    """Give every part the same Arrow schema regardless of the input dtypes."""
+    columns, _ = BULK_TABLES[table]
+    df = df[columns].copy()
+    df["ts"] = pd.to_datetime(df["ts"]).astype("datetime64[ns]")
+    for col in columns[1:]:
+        df[col] = df[col].astype("int64" if col == "room_id" else "float64")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def append_snapshot(table, df, snapshot_dir=None):
+    """Write df as a new part of the table's snapshot. Returns rows written."""
+    if df.empty:
+        return 0
+    directory = _table_dir(table, snapshot_dir)
+    os.makedirs(directory, exist_ok=True)
+    parts = _parts(table, snapshot_dir)
+    index = int(os.path.basename(parts[-1])[5:10]) + 1 if parts else 0
+    path = os.path.join(directory, f"part-{index:05d}.parquet")
+    # Write then rename so readers never see a half-written part
+    pq.write_table(_normalise(table, df), path + ".tmp", row_group_size=ROW_GROUP_SIZE)
+    os.replace(path + ".tmp", path)
+    return len(df)
+
+
+def snapshot_max_ts(table, snapshot_dir=None):
+    """Newest ts in the snapshot, read from Parquet footers only."""
+    latest = None
+    for path in _parts(table, snapshot_dir):
+        metadata = pq.ParquetFile(path).metadata
+        ts_index = metadata.schema.to_arrow_schema().get_field_index("ts")
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(ts_index).statistics
+            if stats is not None and stats.has_min_max:
+                value = pd.Timestamp(stats.max)
+                latest = value if latest is None else max(latest, value)
+    return latest
+
+
+def read_snapshot(table, columns=None, start=None, end=None, room_id=None, snapshot_dir=None):
+    """
+    Read [start, end) of a table's snapshot as a DataFrame. The filters are
+    pushed down, so row groups outside the range are never decoded.
+    """
+    filters = []
+    if start is not None:
+        filters.append(("ts", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("ts", "<", pd.Timestamp(end)))
+    if room_id is not None:
+        filters.append(("room_id", "=", room_id))
+    selected = None if columns is None else ["ts", *[c for c in columns if c != "ts"]]
+    result = pq.read_table(_table_dir(table, snapshot_dir), columns=selected,
+                           filters=filters or None, memory_map=True)
+    return result.to_pandas().sort_values("ts", kind="stable").reset_index(drop=True)
+
+
+def compact_snapshot(table, snapshot_dir=None):
+    """Rewrite all parts as a single ts-sorted part."""
+    parts = _parts(table, snapshot_dir)
+    if len(parts) < 2:
+        return
+    df = read_snapshot(table, snapshot_dir=snapshot_dir)
+    for path in parts:
+        os.remove(path)
+    append_snapshot(table, df, snapshot_dir)
+
+
+def refresh_snapshot(table, snapshot_dir=None, page_size=SNAPSHOT_PAGE_SIZE):
+    """
+    Append the rows of a MySQL table newer than the snapshot, paging by
+    (ts, id). Rows sharing the newest cached ts are re-read and dropped by
+    natural key, so readings that landed after the last refresh with the
+    same timestamp are not lost. Returns the number of rows appended.
+    """
+    columns, key = BULK_TABLES[table]
+    latest = snapshot_max_ts(table, snapshot_dir)
+    cached_keys = set()
+    if latest is not None:
+        boundary = read_snapshot(table, key, start=latest, snapshot_dir=snapshot_dir)
+        cached_keys = set(zip(*(boundary[col].tolist() for col in key)))
+
+    select = f"SELECT id, {', '.join(columns)} FROM {table}"
+    query, params = (f"{select} WHERE ts >= %s", [latest.to_pydatetime()]) if latest is not None else (select, [])
+    appended = 0
+    while True:
+        rows = execute_query(f"{query} ORDER BY ts, id LIMIT %s", (*params, page_size))
+        if not rows:
+            break
+        df = pd.DataFrame(rows, columns=["id", *columns])
+        df["ts"] = pd.to_datetime(df["ts"]).astype("datetime64[ns]")
+        fresh = [k not in cached_keys for k in zip(*(df[col].tolist() for col in key))]
+        appended += append_snapshot(table, df[fresh], snapshot_dir)
+        if len(rows) < page_size:
+            break
+        last = rows[-1]
+        query = f"{select} WHERE (ts, id) > (%s, %s)"
+        params = [last["ts"], last["id"]]
+
+    if len(_parts(table, snapshot_dir)) > SNAPSHOT_MAX_PARTS:
+        compact_snapshot(table, snapshot_dir)
+    return appended
+
+
+if __name__ == "__main__":
+    for name in BULK_TABLES:
+        print(f"{name}: {refresh_snapshot(name):,} rows appended")
@@ -0,0 +1,255 @@
+"""
+Train the LSTM forecast models from the command line.
+
+Replaces the ml/*.ipynb notebooks with one repeatable job per model:
+
+1. Load the hourly feature history with data_loader.load_feature_history
+   (Parquet snapshots when built, else the hourly rollups, refreshed
+   first). The prepared frame is cached under TRAIN_CACHE_DIR, keyed by
+   the query and the state of every source as read, so re-runs on
+   unchanged data skip loading.
+2. Fit a MinMaxScaler on the training split (the first 85% of hours) and
+   cut every 12-hour window with numpy's sliding_window_view. Windows
+   touching a gap are dropped.
+3. Train the notebooks' LSTM(64) -> Dense network on tf.data pipelines
+   with prefetching, seeded for repeatable runs, with early stopping.
+4. Write model.keras, scaler.pkl and meta.json (data range, parameters,
+   per-target RMSE/MAE) to ml/models/versions/<model>/<version>/.
+   MODEL_CONFIG can point there directly, or --promote copies the
+   artifacts over the MODEL_CONFIG paths (re-exporting the .tflite when
+   one exists); running APIs reload them on their next forecast.
+
+Run from the backend directory, e.g.:
+
+    python -m utils.train outdoor
+    python -m utils.train indoor --variant no_ac --room-id 1 --promote
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.preprocessing import MinMaxScaler
+
+from swagger_server.database.connection import execute_query
+from swagger_server.database.rollups import refresh_rollups
+from swagger_server.database.schema import rollup_table
+from utils.data_loader import FEATURE_SOURCES, load_feature_history
+from utils.forecast import scaling_vectors
+from utils.snapshot import refresh_snapshot, snapshot_exists, snapshot_max_ts
+
+TRAIN_CACHE_DIR = os.getenv("TRAIN_CACHE_DIR", "ml/cache")
+ARTIFACT_DIR = "ml/models/versions"
+
+# Notebook defaults
+WINDOW_HOURS = 12
+TRAIN_FRACTION = 0.85
+EPOCHS = 100
+BATCH_SIZE = 32
+PATIENCE = 10
+LSTM_UNITS = 64
+
+
+def _source_tables(mode):
+    (base_table, _), others = FEATURE_SOURCES[mode]
+    return [base_table, *(table for table, _ in others)]
+
+
+def _source_version(table):
+    """
+    What the training data of a source is read from: the snapshot's newest
+    ts, or else the hourly rollup's watermark, newest bucket and reading
+    count. The raw table is not used because it can be ahead of the rollup.
+    """
+    if snapshot_exists(table):
+        return str(snapshot_max_ts(table))
+    row = execute_query(
+        f"SELECT (SELECT last_id FROM rollup_watermarks WHERE source_table = %s AND granularity = 'hourly') "
+        f"AS last_id, MAX(bucket) AS ts, SUM(n) AS n FROM {rollup_table(table, 'hourly')}",
+        (table,),
+    )[0]
+    return f"rollup {row['last_id']} {row['ts']} {row['n']}"
+
+
+def load_training_frame(mode, start=None, end=None, room_id=None, refresh=True, cache_dir=None):
+    """
+    load_feature_history() through the prepared-data cache. Returns the
+    frame and its cache key, which changes whenever any source has newer
+    rows. With refresh, snapshots and rollups take in new MySQL rows first.
+    """
+    tables = _source_tables(mode)
+    if refresh:
+        for table in tables:
+            if snapshot_exists(table):
+                refresh_snapshot(table)
+        if not all(map(snapshot_exists, tables)):
+            refresh_rollups()
+    key = {
+        "mode": mode, "start": start and str(start), "end": end and str(end), "room_id": room_id,
+        "sources": {table: _source_version(table) for table in tables},
+    }
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir or TRAIN_CACHE_DIR, f"{mode}-{digest}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path), digest
+
+    df = load_feature_history(mode, start, end, room_id, refresh=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return df, digest
+
+
+def sliding_windows(values, window, target_idx):
+    """
+    Every `window`-row input of values with the target row that follows it:
+    X of shape (n, window, n_features) and y of shape (n, len(target_idx)).
+    Samples with a NaN anywhere in the window or target are dropped.
+    """
+    X = sliding_window_view(values[:-1], window, axis=0).transpose(0, 2, 1)
+    y = values[window:, target_idx]
+    gaps = sliding_window_view(np.isnan(values[:-1]).any(axis=1), window).any(axis=1)
+    keep = ~(gaps | np.isnan(y).any(axis=1))
+    return X[keep], y[keep]
+
+
+def make_dataset(X, y, batch_size=BATCH_SIZE, shuffle=False, seed=0):
+    import tensorflow as tf
+
+    ds = tf.data.Dataset.from_tensor_slices((X.astype(np.float32), y.astype(np.float32)))
+    if shuffle:
+        ds = ds.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+    return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def build_model(window, n_features, n_targets, units=LSTM_UNITS):
+    from tensorflow.keras import Input, Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+
+    model = Sequential([Input((window, n_features)), LSTM(units), Dense(n_targets)])
+    model.compile(optimizer="adam", loss="mse")
+    return model
+
+
+def train(mode, target_cols, variant=None, start=None, end=None, room_id=None, epochs=EPOCHS,
+          batch_size=BATCH_SIZE, window=WINDOW_HOURS, seed=0, refresh=True, version=None,
+          artifact_dir=None, cache_dir=None, verbose=2):
+    """Train one model and write its versioned artifacts. Returns the artifact directory."""
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    tf.config.experimental.enable_op_determinism()
+
+    df, data_key = load_training_frame(mode, start, end, room_id, refresh, cache_dir)
+    feature_cols = [*target_cols, *(col for col in df.columns if col not in target_cols)]
+    values = df[feature_cols].to_numpy(dtype=np.float64)
+    target_idx = list(range(len(target_cols)))
+
+    # Fit on the training hours only so validation rows don't leak into the scaling
+    split = int(len(values) * TRAIN_FRACTION)
+    scaler = MinMaxScaler().fit(df[feature_cols].iloc[:split].dropna())
+    _, scale, offset = scaling_vectors(scaler)
+    scaled = values * scale + offset
+    X_train, y_train = sliding_windows(scaled[:split], window, target_idx)
+    X_val, y_val = sliding_windows(scaled[split - window:], window, target_idx)
+    if not len(X_train) or not len(X_val):
+        raise ValueError(f"Not enough {mode} history to train on ({len(df)} hours)")
+
+    model = build_model(window, len(feature_cols), len(target_cols))
+    started = time.perf_counter()
+    history = model.fit(
+        make_dataset(X_train, y_train, batch_size, shuffle=True, seed=seed),
+        validation_data=make_dataset(X_val, y_val, batch_size),
+        epochs=epochs,
+        shuffle=False,  # the training dataset shuffles itself
+        callbacks=[tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=PATIENCE,
+                                                    restore_best_weights=True)],
+        verbose=verbose,
+    )
+    train_seconds = time.perf_counter() - started
+
+    pred = model.predict(make_dataset(X_val, y_val, batch_size), verbose=0)
+    pred = (pred - offset[target_idx]) / scale[target_idx]
+    actual = (y_val - offset[target_idx]) / scale[target_idx]
+    metrics = {col: {"rmse": float(np.sqrt(np.mean((pred[:, i] - actual[:, i]) ** 2))),
+                     "mae": float(np.mean(np.abs(pred[:, i] - actual[:, i])))}
+               for i, col in enumerate(target_cols)}
+
+    name = "_".join(filter(None, [mode, variant]))
+    version = version or pd.Timestamp.now("UTC").strftime("%Y%m%dT%H%M%SZ")
+    out_dir = os.path.join(artifact_dir or ARTIFACT_DIR, name, version)
+    os.makedirs(out_dir)
+    model.save(os.path.join(out_dir, "model.keras"))
+    joblib.dump(scaler, os.path.join(out_dir, "scaler.pkl"))
+    meta = {
+        "model": name, "version": version, "data_key": data_key,
+        "data": {"start": str(df.index[0]), "end": str(df.index[-1]), "hours": len(df), "room_id": room_id},
+        "feature_cols": feature_cols, "target_cols": list(target_cols), "window": window,
+        "samples": {"train": len(X_train), "validation": len(X_val)},
+        "params": {"epochs": epochs, "epochs_run": len(history.history["loss"]), "batch_size": batch_size,
+                   "seed": seed, "units": LSTM_UNITS},
+        "val_loss": float(min(history.history["val_loss"])), "train_seconds": train_seconds,
+        "metrics": metrics,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return out_dir
+
+
+def promote(out_dir, config):
+    """Copy a version's artifacts over the paths of a MODEL_CONFIG entry."""
+    for source, target in (("model.keras", config["model"]), ("scaler.pkl", config["scaler"])):
+        shutil.copyfile(os.path.join(out_dir, source), target + ".tmp")
+        os.replace(target + ".tmp", target)
+
+    from utils.model_registry import tflite_path
+
+    if os.path.exists(tflite_path(config["model"])):
+        from utils.model_export import export_tflite
+
+        export_tflite(config["model"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("mode", choices=list(FEATURE_SOURCES))
+    parser.add_argument("--variant", help="indoor model variant in MODEL_CONFIG (no_ac, with_ac)")
+    parser.add_argument("--room-id", type=int, help="indoor: train on one room's readings")
+    parser.add_argument("--start", help="first timestamp of training data")
+    parser.add_argument("--end", help="end (exclusive) of training data")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-refresh", action="store_true", help="don't append new MySQL rows to the snapshots")
+    parser.add_argument("--promote", action="store_true", help="replace the MODEL_CONFIG artifacts")
+    args = parser.parse_args()
+
+    from swagger_server.app import MODEL_CONFIG, TARGET_COLS
+
+    config = MODEL_CONFIG[args.mode]
+    if "model" not in config:
+        if args.variant not in config:
+            parser.error(f"--variant must be one of {list(config)} for {args.mode}")
+        config = config[args.variant]
+
+    out_dir = train(args.mode, TARGET_COLS[args.mode], args.variant, args.start, args.end, args.room_id,
+                    args.epochs, args.batch_size, seed=args.seed, refresh=not args.no_refresh)
+    with open(os.path.join(out_dir, "meta.json")) as f:
+        meta = json.load(f)
+    print(f"{out_dir}: {meta['samples']['train']} train / {meta['samples']['validation']} validation windows, "
+          f"{meta['params']['epochs_run']} epochs in {meta['train_seconds']:.1f}s")
+    for col, scores in meta["metrics"].items():
+        print(f"  {col:<12} RMSE {scores['rmse']:.3f}  MAE {scores['mae']:.3f}")
+    if args.promote:
+        promote(out_dir, config)
+        print(f"Promoted to {config['model']}")
+
+
+if __name__ == "__main__":
+    main()
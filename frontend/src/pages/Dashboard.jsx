@@ -1,13 +1,14 @@
 import React, { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
-import { fetchLatestReports } from "../services/api";
+import { fetchLatestReports, subscribeDashboard } from "../services/api";
 import "../styles/Dashboard.css";
 
 function Dashboard() {
   const [data, setData] = useState({
     aqi: null,
     sensor: null,
-    weather: null
+    weather: null,
+    summary: null
   });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
@@ -27,58 +28,20 @@ function Dashboard() {
     };
   
     loadReports();
-    const intervalId = setInterval(loadReports, 3600000); // refresh hourly
-    return () => clearInterval(intervalId);
+    // New readings are pushed by the API; the hourly refresh is a fallback
+    const unsubscribe = subscribeDashboard((snapshot) => {
+      setData(snapshot);
+      setLoading(false);
+    });
+    const intervalId = setInterval(loadReports, 3600000);
+    return () => {
+      unsubscribe();
+      clearInterval(intervalId);
+    };
   }, []);
 
-  const getIndoorAirQualityReport = () => {
-    const { pm25 } = data.sensor || {};
-    if (pm25 > 35) return "⚠️ Indoor PM2.5 is high. Consider improving ventilation or using an air purifier.";
-    if (pm25 > 12) return "🔸 Indoor PM2.5 is moderate. Keep the room ventilated.";
-    return "✅ Indoor air quality is good.";
-  };
-
-  const getOutdoorAirQualityReport = () => {
-    const { pm25 } = data.aqi || {};
-    if (pm25 > 150) return "☠️ Outdoor PM2.5 is very high. Avoid going out and wear a mask.";
-    if (pm25 > 55) return "🚨 Outdoor PM2.5 is high. Wear a mask if you need to go out.";
-    if (pm25 > 35) return "⚠️ Outdoor PM2.5 is moderate. Sensitive groups should take precautions.";
-    return "✅ Outdoor air quality is good.";
-  };
-
-  const getWeatherReport = () => {
-    const { temperature, wind_speed } = data.weather || {};
-    if (temperature < 18) return "🧥 It's quite cold outside. Dress warmly.";
-    if (temperature > 33) return "🔥 It's hot outside. Stay hydrated and avoid direct sunlight.";
-    if (wind_speed > 10) return "💨 It's windy today. Secure loose items and be cautious outdoors.";
-    return "🌤️ The weather outside is pleasant.";
-  };
-
-  const getAqiStatusColor = () => {
-    const { aqi_score } = data.aqi || {};
-    if (!aqi_score) return "lightblue";
-    if (aqi_score > 150) return "red";
-    if (aqi_score > 100) return "orange";
-    if (aqi_score > 50) return "yellow";
-    return "green";
-  };
-
-  const getSensorStatusColor = () => {
-    const { pm25 } = data.sensor || {};
-    if (!pm25) return "lightblue";
-    if (pm25 > 35) return "red";
-    if (pm25 > 12) return "orange";
-    return "green";
-  };
-
-  const getTemperatureStatusColor = () => {
-    const { temperature } = data.weather || {};
-    if (!temperature) return "lightblue";
-    if (temperature > 33 || temperature < 0) return "red";
-    if (temperature > 30 || temperature < 5) return "orange";
-    if (temperature > 28 || temperature < 10) return "yellow";
-    return "green";
-  };
+  // Status colours and advice are computed by the API (/dashboard/latest)
+  const summary = (name) => data.summary?.[name] || { status: "lightblue", icon: "", message: "" };
 
   if (loading) return (
     <div className="page-wrapper gradient-bg">
@@ -121,7 +84,7 @@ function Dashboard() {
           <div className="card glassy shadow-md">
             <div className="flex justify-between items-center">
               <h3 className="card-title">Outdoor Air Quality</h3>
-              <span className={`status-indicator ${getAqiStatusColor()}`}>•</span>
+              <span className={`status-indicator ${summary("outdoor").status}`}>•</span>
             </div>
             <div className="metric-display">
               <div className="metric-value">{data.aqi?.aqi_score || "—"}</div>
@@ -143,7 +106,7 @@ function Dashboard() {
           <div className="card glassy shadow-md">
             <div className="flex justify-between items-center">
               <h3 className="card-title">Indoor Environment</h3>
-              <span className={`status-indicator ${getSensorStatusColor()}`}>•</span>
+              <span className={`status-indicator ${summary("indoor").status}`}>•</span>
             </div>
             <div className="metric-display">
               <div className="metric-value">{data.sensor?.pm25 || "—"}</div>
@@ -165,7 +128,7 @@ function Dashboard() {
           <div className="card glassy shadow-md">
             <div className="flex justify-between items-center">
               <h3 className="card-title">Weather Conditions</h3>
-              <span className={`status-indicator ${getTemperatureStatusColor()}`}>•</span>
+              <span className={`status-indicator ${summary("weather").status}`}>•</span>
             </div>
             <div className="metric-display">
               <div className="metric-value">{data.weather?.temperature || "—"}°C</div>
@@ -192,24 +155,24 @@ function Dashboard() {
         <h2 className="card-title">Smart Analysis</h2>
         <div className="smart-analysis-grid">
           <div className="analysis-item">
-            <div className="analysis-icon">{getIndoorAirQualityReport().split(" ")[0]}</div>
+            <div className="analysis-icon">{summary("indoor").icon}</div>
             <div className="analysis-text">
               <h4>Indoor Air</h4>
-              <p>{getIndoorAirQualityReport().substring(2)}</p>
+              <p>{summary("indoor").message}</p>
             </div>
           </div>
           <div className="analysis-item">
-            <div className="analysis-icon">{getOutdoorAirQualityReport().split(" ")[0]}</div>
+            <div className="analysis-icon">{summary("outdoor").icon}</div>
             <div className="analysis-text">
               <h4>Outdoor Air</h4>
-              <p>{getOutdoorAirQualityReport().substring(2)}</p>
+              <p>{summary("outdoor").message}</p>
             </div>
           </div>
           <div className="analysis-item">
-            <div className="analysis-icon">{getWeatherReport().split(" ")[0]}</div>
+            <div className="analysis-icon">{summary("weather").icon}</div>
             <div className="analysis-text">
               <h4>Weather</h4>
-              <p>{getWeatherReport().substring(2)}</p>
+              <p>{summary("weather").message}</p>
             </div>
           </div>
         </div>
@@ -11,39 +11,45 @@ const api = axios.create({
 });
 
 
+// Upper bound on points per monthly chart; the API downsamples with LTTB beyond this.
+// Per-date responses are shown as full tables, so they are never downsampled.
+const CHART_POINTS = 500;
+const chartParams = { params: { points: CHART_POINTS } };
+
 export const aqicnApi = {
-    getAllData: () => api.get('/aqicn'),
+    getAllData: (params) => api.get('/aqicn', { params }),
     getDataById: (id) => api.get(`/aqicn/${id}`),
     getDataByDate: (date) => api.get(`/aqicn/date/${date}`),
     getLatestData: () => api.get('/aqicn/latest'),
-    getMonthlyData: () => api.get('/aqicn/monthly'),
+    getMonthlyData: () => api.get('/aqicn/monthly', chartParams),
     getAvailableDates: () => api.get('/aqicn/dates'),
 }
 
 export const sensorApi = {
-    getAllData: () => api.get('/sensor'),
+    getAllData: (params) => api.get('/sensor', { params }),
     getDataById: (id) => api.get(`/sensor/${id}`),
     getDataByDate: (date) => api.get(`/sensor/date/${date}`),
     getLatestData: () => api.get('/sensor/latest'),
-    getMonthlyData: () => api.get('/sensor/monthly'),
+    getMonthlyData: () => api.get('/sensor/monthly', chartParams),
     getAvailableDates: () => api.get('/sensor/dates'),
 }
 
 export const weatherApi = {
-    getAllData: () => api.get('/weather'),
+    getAllData: (params) => api.get('/weather', { params }),
     getDataById: (id) => api.get(`/weather/${id}`),
     getDataByDate: (date) => api.get(`/weather/date/${date}`),
     getLatestData: () => api.get('/weather/latest'),
-    getMonthlyData: () => api.get('/weather/monthly'),
+    getMonthlyData: () => api.get('/weather/monthly', chartParams),
     getAvailableDates: () => api.get('/weather/dates'),
 }
 
 export const forecastApi = {
-  getIndoorForecast: (model, hours) =>
+  getIndoorForecast: (model, hours, roomId = 1) =>
     api.get(`/predict/indoor`, {
       params: {
         model_type: model,  
         hours,
+        room_id: roomId,
       },
     }),
 
@@ -53,38 +59,24 @@ export const forecastApi = {
     }),
 };
 
-function wait(ms) {
-    return new Promise(resolve => setTimeout(resolve, ms));
+export const dashboardApi = {
+  getLatest: () => api.get('/dashboard/latest'),
+};
+
+// Push channel: calls onDashboard with a /dashboard/latest-shaped snapshot
+// whenever a new reading arrives. Returns a function that closes it.
+export function subscribeDashboard(onDashboard) {
+  const source = new EventSource(`${API_URL}/live`);
+  source.addEventListener('dashboard', (event) => onDashboard(JSON.parse(event.data)));
+  return () => source.close();
 }
+
+// One request for every dashboard card; the browser revalidates it with
+// If-None-Match, so an unchanged snapshot comes back as a 304.
 export async function fetchLatestReports() {
-    let aqi = null, sensor = null, weather = null;
-  
-    try {
-      const res = await aqicnApi.getLatestData();
-      aqi = res.data;
-    } catch (e) {
-      console.error("AQI fetch failed", e);
-    }
-    await wait(20);
-  
-    try {
-      const res = await sensorApi.getLatestData();
-      sensor = res.data;
-    } catch (e) {
-      console.error("Sensor fetch failed", e);
-    }
-    await wait(20);
-  
-    try {
-      const res = await weatherApi.getLatestData();
-      weather = res.data;
-    } catch (e) {
-      console.error("Weather fetch failed", e);
-    }
-  
-    return { aqi, sensor, weather };
-  }
-  
+  const res = await dashboardApi.getLatest();
+  return res.data;
+}
 
 
 export default api;
\ No newline at end of file